@@ -11,6 +11,8 @@ from app.schemas.catalog import (
     CollectionCreate,
     CollectionUpdate,
     CollectionRead,
+    CollectionProductPositions,
+    CollectionMembershipUpdate,
 )
 from app.services.catalog_service import CollectionService
 
@@ -89,6 +91,45 @@ def update_collection(
     return CollectionRead.model_validate(updated)
 
 
+# Add products to a collection (existing links untouched)
+@router.post("/{collection_id}/products/add", response_model=CollectionRead)
+def add_collection_products(
+    collection_id: int,
+    data: CollectionMembershipUpdate,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> CollectionRead:
+    require_staff(current_user)
+    collection = CollectionService.add_products(db, collection_id, data.product_ids)
+    return CollectionRead.model_validate(collection)
+
+
+# Remove products from a collection
+@router.post("/{collection_id}/products/remove", response_model=CollectionRead)
+def remove_collection_products(
+    collection_id: int,
+    data: CollectionMembershipUpdate,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> CollectionRead:
+    require_staff(current_user)
+    collection = CollectionService.remove_products(db, collection_id, data.product_ids)
+    return CollectionRead.model_validate(collection)
+
+
+# Set merchandiser order of products in a collection
+@router.put("/{collection_id}/positions", response_model=CollectionRead)
+def set_collection_product_positions(
+    collection_id: int,
+    data: CollectionProductPositions,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> CollectionRead:
+    require_staff(current_user)
+    collection = CollectionService.set_product_positions(db, collection_id, data.product_ids)
+    return CollectionRead.model_validate(collection)
+
+
 # Delete Collection
 @router.delete("/{collection_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_collection(
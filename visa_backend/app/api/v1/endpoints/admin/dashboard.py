@@ -4,7 +4,9 @@ from typing import List
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
+from app.core.cache import cache_stats
 from app.core.deps import get_session, get_current_user, require_staff
+from app.core.singleflight import singleflight_stats
 from app.schemas.case import SupportCaseRead
 from app.schemas.order import OrderRead
 from app.services.dashboard_service import DashboardService
@@ -77,3 +79,14 @@ def get_sales_statistics(
 ):
     require_staff(current_user)
     return DashboardService.get_statistics(session)
+
+
+@router.get("/cache/")
+def get_cache_metrics(
+        current_user: User = Depends(get_current_user),
+):
+    require_staff(current_user)
+    return {
+        "caches": cache_stats(),
+        "singleflight": singleflight_stats(),
+    }
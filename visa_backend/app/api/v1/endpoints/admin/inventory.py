@@ -1,14 +1,29 @@
 # app/api/v1/endpoints/admin/inventory.py
 
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, status, Query, HTTPException
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.deps import get_session, get_current_user, require_staff
 from app.models.user import User
-from app.schemas.inventory import InventoryCreate, InventoryRead
+from app.schemas.inventory import (
+    InventoryCreate,
+    InventoryRead,
+    InventoryLedgerPage,
+    InventoryBulkAdjust,
+    InventoryBulkResult,
+    StockAnalyticsSnapshot,
+    ReorderPointUpdate,
+    LowStockEventRead,
+)
 from app.services.inventory_service import InventoryService
+from app.services.low_stock_service import LowStockAlertService
+from app.services.reconciliation_service import ReconciliationService
+from app.services.stock_service import StockService
+from app.services.stock_analytics_service import StockAnalyticsService
 
 router = APIRouter()
 
@@ -46,6 +61,105 @@ def list_inventory_movements(
     return [InventoryRead.model_validate(m) for m in movements]
 
 
+# ---------------------------------------------------------
+# QUERY LEDGER (FILTERS + KEYSET PAGINATION)
+# ---------------------------------------------------------
+@router.get("/ledger/", response_model=InventoryLedgerPage)
+def query_inventory_ledger(
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        product_id: Optional[int] = Query(None),
+        size: Optional[str] = Query(None),
+        reason: Optional[str] = Query(None),
+        performed_by_id: Optional[int] = Query(None),
+        date_from: Optional[datetime] = Query(None),
+        date_to: Optional[datetime] = Query(None),
+        limit: int = Query(50, ge=1, le=200),
+        cursor: Optional[str] = Query(None),
+):
+    require_staff(current_user)
+
+    return InventoryService.query_ledger(
+        db=db,
+        product_id=product_id,
+        size=size,
+        reason=reason,
+        performed_by_id=performed_by_id,
+        date_from=date_from,
+        date_to=date_to,
+        limit=limit,
+        cursor=cursor,
+    )
+
+
+# ---------------------------------------------------------
+# COMPACT LEDGER (CHECKPOINT + ARCHIVE OLD MOVEMENTS)
+# ---------------------------------------------------------
+@router.post("/compact/")
+def compact_inventory_ledger(
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        older_than_days: int = Query(settings.INVENTORY_HOT_DAYS, ge=1),
+        dry_run: bool = Query(False),
+):
+    require_staff(current_user)
+    return InventoryService.compact_ledger(
+        db,
+        older_than_days=older_than_days,
+        dry_run=dry_run,
+    )
+
+
+# ---------------------------------------------------------
+# STOCK ANALYTICS (SELL-THROUGH / TURNOVER / DAYS OF COVER)
+# ---------------------------------------------------------
+@router.get("/analytics/", response_model=StockAnalyticsSnapshot)
+def get_stock_analytics(
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        product_id: Optional[int] = Query(None),
+        limit: int = Query(100, ge=1, le=500),
+        offset: int = Query(0, ge=0),
+):
+    require_staff(current_user)
+    return StockAnalyticsService.get_snapshot(db, product_id=product_id, limit=limit, offset=offset)
+
+
+@router.post("/analytics/refresh/")
+def refresh_stock_analytics(
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        window_days: int = Query(settings.STOCK_ANALYTICS_WINDOW_DAYS, ge=1, le=settings.INVENTORY_HOT_DAYS),
+):
+    require_staff(current_user)
+    return StockAnalyticsService.compute(db, window_days=window_days)
+
+
+# ---------------------------------------------------------
+# STOCK / LEDGER RECONCILIATION (WORKER PROCESS)
+# ---------------------------------------------------------
+@router.post("/reconcile/", status_code=status.HTTP_202_ACCEPTED)
+def start_inventory_reconciliation(
+        current_user: User = Depends(get_current_user),
+        fix: bool = Query(False),
+        restart: bool = Query(False),
+):
+    require_staff(current_user)
+    return ReconciliationService.start_worker(fix=fix, restart=restart)
+
+
+@router.get("/reconcile/")
+def get_inventory_reconciliation(
+        current_user: User = Depends(get_current_user),
+):
+    require_staff(current_user)
+
+    state = ReconciliationService.get_state()
+    if state is None:
+        raise HTTPException(status_code=404, detail="No reconciliation run yet")
+    return state
+
+
 # ---------------------------------------------------------
 # CREATE INVENTORY MOVEMENT (ADMIN)
 # ---------------------------------------------------------
@@ -65,6 +179,19 @@ def create_inventory_entry(
     return InventoryRead.model_validate(movement)
 
 
+# ---------------------------------------------------------
+# BULK ADJUSTMENT (STOCK COUNTS / RESTOCKS BY SKU + SIZE)
+# ---------------------------------------------------------
+@router.post("/bulk-adjust/", response_model=InventoryBulkResult)
+def bulk_adjust_inventory(
+        payload: InventoryBulkAdjust,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+):
+    require_staff(current_user)
+    return InventoryService.bulk_adjust(db, payload, performed_by_id=current_user.id)
+
+
 # ---------------------------------------------------------
 # LOW STOCK PRODUCTS (PER-SIZE)
 # ---------------------------------------------------------
@@ -72,7 +199,8 @@ def create_inventory_entry(
 def list_low_stock_products(
         db: Session = Depends(get_session),
         current_user: User = Depends(get_current_user),
-        threshold: int = Query(5, ge=1),
+        # Omit to use each size's reorder point (LOW_STOCK_THRESHOLD when unset)
+        threshold: Optional[int] = Query(None, ge=1),
 ):
     require_staff(current_user)
 
@@ -83,3 +211,43 @@ def list_low_stock_products(
 
     # Service already returns dicts → safe to output directly
     return low_stock
+
+
+# ---------------------------------------------------------
+# REORDER POINTS (PER PRODUCT + SIZE)
+# ---------------------------------------------------------
+@router.put("/reorder-points/")
+def set_reorder_points(
+        payload: ReorderPointUpdate,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+):
+    require_staff(current_user)
+
+    updated = StockService.set_reorder_points(db, [item.model_dump() for item in payload.items])
+    db.commit()
+    return {"updated": updated}
+
+
+# ---------------------------------------------------------
+# LOW-STOCK EVENTS + DIGEST
+# ---------------------------------------------------------
+@router.get("/low-stock/events/", response_model=List[LowStockEventRead])
+def list_pending_low_stock_events(
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+        limit: int = Query(100, ge=1, le=500),
+):
+    require_staff(current_user)
+    return LowStockAlertService.list_pending(db, limit=limit)
+
+
+@router.post("/low-stock/digest/")
+def send_low_stock_digest(
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+):
+    require_staff(current_user)
+
+    digest = LowStockAlertService.build_digest(db)
+    return digest or {"events": 0, "items": []}
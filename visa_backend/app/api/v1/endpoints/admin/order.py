@@ -1,14 +1,19 @@
 # backend/app/api/v1/endpoints/admin/order.py
 
 
+import csv
+import io
+import json
+from datetime import datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_session, get_current_user, require_staff
 from app.services.order_service import OrderService
-from app.schemas.order import OrderRead
+from app.schemas.order import OrderRead, PickList, PickListMark
 from app.models.user import User
 from app.models.order import OrderStatus
 
@@ -25,6 +30,69 @@ def get_order_metrics(
     return OrderService.get_order_metrics(db)
 
 
+# ------------------------------
+# FULFILLMENT PICK LIST
+# ------------------------------
+PICK_LIST_COLUMNS = ["product_id", "sku", "name", "size", "quantity", "orders"]
+
+
+def _pick_list_csv(lines: List[dict]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(PICK_LIST_COLUMNS)
+    for line in lines:
+        writer.writerow([line[c] for c in PICK_LIST_COLUMNS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+def _pick_list_ndjson(lines: List[dict]):
+    for line in lines:
+        yield json.dumps(line) + "\n"
+
+
+@router.get("/pick-list/", response_model=PickList)
+def admin_get_pick_list(
+        statuses: List[str] = Query([OrderStatus.PENDING, OrderStatus.PAID], alias="status"),
+        date_from: Optional[datetime] = Query(None),
+        date_to: Optional[datetime] = Query(None),
+        output: str = Query("json", alias="format", pattern="^(json|csv|ndjson)$"),
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+):
+    require_staff(current_user)
+
+    pick_list = OrderService.get_pick_list(db, statuses, date_from, date_to)
+    if output == "json":
+        return pick_list
+
+    headers = {
+        "X-Pick-List-Generated-At": pick_list["generated_at"].isoformat(),
+        "X-Pick-List-Max-Order-Id": str(pick_list["max_order_id"] or ""),
+        "X-Pick-List-Order-Count": str(pick_list["order_count"]),
+    }
+    if output == "csv":
+        headers["Content-Disposition"] = 'attachment; filename="pick-list.csv"'
+        return StreamingResponse(_pick_list_csv(pick_list["lines"]), media_type="text/csv", headers=headers)
+
+    return StreamingResponse(
+        _pick_list_ndjson(pick_list["lines"]), media_type="application/x-ndjson", headers=headers
+    )
+
+
+@router.post("/pick-list/mark-picked/")
+def admin_mark_orders_picked(
+        payload: PickListMark,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+):
+    require_staff(current_user)
+    return {"picked": OrderService.mark_picked(db, payload)}
+
+
 # ------------------------------
 # LIST ALL ORDERS (ADMIN)
 # ------------------------------
@@ -11,6 +11,8 @@ from app.schemas.catalog import (
     ProductCreate,
     ProductUpdate,
     ProductRead,
+    ProductBulkPriceUpdate,
+    ProductBulkPriceResult,
 )
 from app.services.catalog_service import ProductService
 from app.models.catalog import ProductCategory
@@ -62,10 +64,25 @@ def create_product(
         raise HTTPException(status_code=400,
                             detail=f"Unsupported currency '{data.currency}'. Allowed: {sorted(ALLOWED_CURRENCIES)}")
     data.currency = currency_upper
-    product = ProductService.create_product(db, data)
+    product = ProductService.create_product(db, data, performed_by_id=current_user.id)
     return ProductRead.model_validate(product)
 
 
+# Bulk Price Update (dry-run preview by default)
+@router.post("/bulk-price/", response_model=ProductBulkPriceResult)
+def bulk_update_prices(
+        data: ProductBulkPriceUpdate,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+) -> ProductBulkPriceResult:
+    require_staff(current_user)
+    if data.currency is not None and data.currency.upper() not in ALLOWED_CURRENCIES:
+        raise HTTPException(status_code=400,
+                            detail=f"Unsupported currency '{data.currency}'. Allowed: {sorted(ALLOWED_CURRENCIES)}")
+    result = ProductService.bulk_update_prices(db, data)
+    return ProductBulkPriceResult.model_validate(result)
+
+
 # Get Single Product
 @router.get("/{product_id}", response_model=ProductRead)
 def get_product(
@@ -115,7 +132,7 @@ def update_product(
             raise HTTPException(status_code=400,
                                 detail=f"Unsupported currency '{data.currency}'. Allowed: {sorted(ALLOWED_CURRENCIES)}")
         data.currency = currency_upper
-    updated = ProductService.update_product(db, product_id, data)
+    updated = ProductService.update_product(db, product_id, data, performed_by_id=current_user.id)
     return ProductRead.model_validate(updated)
 
 
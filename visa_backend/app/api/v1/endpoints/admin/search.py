@@ -0,0 +1,25 @@
+# app/api/v1/endpoints/admin/search.py
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_session, get_current_user, require_staff
+from app.models.user import User
+from app.schemas.search import SearchAnalyticsRead
+from app.services.search_analytics_service import SearchAnalyticsService
+
+router = APIRouter()
+
+
+# ---------------------------------------------------------
+# STORE SEARCH ANALYTICS (TOP / ZERO-RESULT / SLOWEST)
+# ---------------------------------------------------------
+@router.get("/analytics/", response_model=SearchAnalyticsRead)
+def get_search_analytics(
+        days: int = Query(7, ge=1, le=365),
+        limit: int = Query(20, ge=1, le=100),
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+):
+    require_staff(current_user)
+    return SearchAnalyticsService.get_analytics(db, days=days, limit=limit)
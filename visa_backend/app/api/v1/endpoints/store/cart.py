@@ -1,32 +1,101 @@
 # app/api/v1/endpoints/store/cart.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_session, get_current_user
+from app.core.deps import get_session, get_current_user, get_current_user_id
 from app.models.user import User
 from app.schemas.cart import (
     CartRead,
+    CartBatchUpdate,
+    CartCompact,
+    CartSummary,
     CartItemCreate,
     CartItemUpdate,
 )
 from app.services.cart_service import CartService
+from app.utils.common import etag_matches
 
 router = APIRouter()
 
 
+def _cart_headers(version: int) -> dict:
+    # Clients must revalidate; an unchanged cart version answers 304
+    return {"ETag": f'"cart-{version}"', "Cache-Control": "private, no-cache"}
+
+
+def _not_modified(request: Request, db: Session, user_id: int) -> Optional[Response]:
+    """304 when If-None-Match carries the current version (read from the summary cache)."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+
+    headers = _cart_headers(CartService.get_summary(db, user_id)["version"])
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
+
+
 # ---------------------------------------------------------
 # GET MY CART
 # ---------------------------------------------------------
 @router.get("/", response_model=CartRead)
 def get_my_cart(
+        request: Request,
+        response: Response,
         db: Session = Depends(get_session),
-        current_user: User = Depends(get_current_user),
+        user_id: int = Depends(get_current_user_id),
 ):
-    cart = CartService.get_cart(db, current_user.id)
+    not_modified = _not_modified(request, db, user_id)
+    if not_modified is not None:
+        return not_modified
+
+    cart = CartService.get_cart(db, user_id)
+    response.headers.update(_cart_headers(cart.version))
     return CartRead.model_validate(cart)
 
 
+# ---------------------------------------------------------
+# GET MY CART (COMPACT LINES + SUBTOTALS)
+# ---------------------------------------------------------
+@router.get("/compact", response_model=CartCompact)
+def get_my_compact_cart(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_session),
+        user_id: int = Depends(get_current_user_id),
+):
+    not_modified = _not_modified(request, db, user_id)
+    if not_modified is not None:
+        return not_modified
+
+    cart = CartService.get_compact_cart(db, user_id)
+    response.headers.update(_cart_headers(cart["version"]))
+    return cart
+
+
+# ---------------------------------------------------------
+# CART SUMMARY (BADGE: VERSION, ITEM COUNT, SUBTOTALS)
+# ---------------------------------------------------------
+@router.get("/summary", response_model=CartSummary)
+def get_my_cart_summary(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_session),
+        user_id: int = Depends(get_current_user_id),
+):
+    # Served from the per-user cache while the cart version is unchanged
+    summary = CartService.get_summary(db, user_id)
+    headers = _cart_headers(summary["version"])
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return summary
+
+
 # ---------------------------------------------------------
 # ADD ITEM TO CART
 # ---------------------------------------------------------
@@ -40,6 +109,19 @@ def add_cart_item(
     return CartRead.model_validate(cart)
 
 
+# ---------------------------------------------------------
+# BATCH ADD / UPDATE / REMOVE (ONE TRANSACTION)
+# ---------------------------------------------------------
+@router.patch("/", response_model=CartRead)
+def update_my_cart(
+        payload: CartBatchUpdate,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+):
+    cart = CartService.apply_operations(db, current_user.id, payload)
+    return CartRead.model_validate(cart)
+
+
 # ---------------------------------------------------------
 # UPDATE CART ITEM QUANTITY
 # ---------------------------------------------------------
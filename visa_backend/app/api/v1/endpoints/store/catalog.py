@@ -0,0 +1,89 @@
+# app/api/v1/endpoints/store/catalog.py
+
+import re
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from app.services.catalog_snapshot_service import CatalogSnapshotService
+from app.utils.common import etag_matches
+
+router = APIRouter()
+
+VERSION_RE = re.compile(r"^[0-9a-f]{16}$")
+
+# Preference order when the client accepts several encodings
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def _accepted_encodings(request: Request) -> set[str]:
+    header = request.headers.get("accept-encoding", "")
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        name, _, value = params.strip().partition("=")
+        try:
+            if name.strip() == "q" and float(value) == 0:
+                continue
+        except ValueError:
+            pass
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+def _snapshot_response(request: Request, version: str, cache_control: str) -> Response:
+    accepted = _accepted_encodings(request)
+
+    encoding, path = "identity", None
+    for candidate in ENCODING_PREFERENCE:
+        if candidate in accepted:
+            path = CatalogSnapshotService.resolve_file(version, candidate)
+            if path:
+                encoding = candidate
+                break
+    if path is None:
+        path = CatalogSnapshotService.resolve_file(version, "identity")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Catalog snapshot not found")
+
+    # Strong ETag per representation: the bytes differ per encoding
+    etag = f'"{version}"' if encoding == "identity" else f'"{version}-{encoding}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+        "X-Catalog-Version": version,
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    # FileResponse streams from disk (sendfile / pathsend where the server supports it)
+    return FileResponse(path, media_type="application/json", headers=headers)
+
+
+# ---------------------------------------------------------
+# PUBLIC — CURRENT CATALOG SNAPSHOT
+# ---------------------------------------------------------
+@router.get("/snapshot", summary="Pre-compressed snapshot of the active catalog")
+def get_catalog_snapshot(request: Request):
+    current = CatalogSnapshotService.get_current()
+    if not current:
+        raise HTTPException(status_code=404, detail="Catalog snapshot not generated yet")
+
+    return _snapshot_response(request, current["version"], "public, max-age=0, must-revalidate")
+
+
+# ---------------------------------------------------------
+# PUBLIC — PINNED SNAPSHOT VERSION (IMMUTABLE)
+# ---------------------------------------------------------
+@router.get("/snapshot/{version}", summary="A specific catalog snapshot version")
+def get_catalog_snapshot_version(version: str, request: Request):
+    if not VERSION_RE.match(version):
+        raise HTTPException(status_code=404, detail="Catalog snapshot not found")
+
+    return _snapshot_response(request, version, "public, max-age=31536000, immutable")
@@ -6,7 +6,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_session
-from app.schemas.catalog import CollectionRead, ProductRead
+from app.core.singleflight import catalog_flight
+from app.schemas.catalog import (
+    CollectionRead,
+    ProductRead,
+    CollectionProductPage,
+    CollectionProductSort,
+)
 from app.services.catalog_service import CollectionService
 
 router = APIRouter()
@@ -31,5 +37,36 @@ def get_collection_products(
         slug: str,
         db: Session = Depends(get_session)
 ) -> List[ProductRead]:
-    products = CollectionService.get_store_collection_products(db=db, slug=slug)
-    return products
+    return catalog_flight.do(
+        ("collection_products", slug),
+        lambda: [
+            ProductRead.model_validate(p)
+            for p in CollectionService.get_store_collection_products(db=db, slug=slug)
+        ],
+    )
+
+
+# ---------------------------------------------------------
+# PUBLIC — PAGINATED COLLECTION PRODUCTS (KEYSET CURSOR)
+# ---------------------------------------------------------
+@router.get(
+    "/{slug}/products/page",
+    response_model=CollectionProductPage,
+    summary="Paginated active products in a collection",
+)
+def get_collection_products_page(
+        slug: str,
+        sort: CollectionProductSort = Query(CollectionProductSort.POSITION),
+        limit: int = Query(24, ge=1, le=100),
+        cursor: Optional[str] = Query(None),
+        db: Session = Depends(get_session),
+):
+    return catalog_flight.do(
+        ("collection_products_page", slug, sort, limit, cursor),
+        lambda: CollectionProductPage.model_validate(
+            CollectionService.list_store_collection_products_page(
+                db=db, slug=slug, sort=sort, limit=limit, cursor=cursor
+            ),
+            from_attributes=True,
+        ),
+    )
@@ -0,0 +1,23 @@
+# app/api/v1/endpoints/store/landing.py
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.deps import get_session
+from app.core.singleflight import catalog_flight
+from app.schemas.catalog import LandingPage
+from app.services.landing_service import LandingService
+
+router = APIRouter()
+
+
+# ---------------------------------------------------------
+# PUBLIC — LANDING PAGE (COLLECTIONS + TOP PRODUCTS)
+# ---------------------------------------------------------
+@router.get("/", response_model=LandingPage, summary="Landing collections with their top products")
+def get_landing_page(
+        limit: int = Query(settings.LANDING_PRODUCTS_PER_COLLECTION, ge=1, le=24),
+        db: Session = Depends(get_session),
+):
+    return catalog_flight.do(("landing", limit), lambda: LandingService.get(db, limit))
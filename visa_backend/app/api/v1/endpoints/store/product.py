@@ -1,13 +1,20 @@
 # backend/app/api/v1/endpoints/store/product.py
 
+import time
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_session
+from app.core.singleflight import catalog_flight
 from app.schemas.catalog import ProductRead
 from app.services.catalog_service import ProductService
+from app.services.search_analytics_service import (
+    SearchResultCache,
+    normalize_query,
+    search_recorder,
+)
 
 router = APIRouter()
 
@@ -22,14 +29,43 @@ def list_products(
         category: Optional[str] = Query(None),
         limit: int = Query(20, ge=1, le=100),
         offset: int = Query(0, ge=0),
+        sort: str = Query("newest", pattern="^(newest|rating)$"),
 ):
-    products = ProductService.list_store_products(
-        db=db,
-        search=search,
-        category=category,
-        skip=offset,
-        limit=limit
-    )
+    started = time.perf_counter()
+
+    # The cache is keyed on the normalized text, so the database must search the same text
+    if search:
+        search = normalize_query(search) or None
+
+    products = None
+    if search and sort == "newest":
+        products = SearchResultCache.get(search, category, offset, limit)
+
+    if products is None:
+        # Identical concurrent requests share one query
+        products = catalog_flight.do(
+            ("store_products", search, category, offset, limit, sort),
+            lambda: [
+                ProductRead.model_validate(p)
+                for p in ProductService.list_store_products(
+                    db=db,
+                    search=search,
+                    category=category,
+                    skip=offset,
+                    limit=limit,
+                    sort=sort,
+                )
+            ],
+        )
+
+    if search:
+        search_recorder.record(
+            query=search,
+            filters={"category": category, "offset": offset, "limit": limit, "sort": sort},
+            result_count=len(products),
+            latency_ms=(time.perf_counter() - started) * 1000,
+        )
+
     return products
 
 
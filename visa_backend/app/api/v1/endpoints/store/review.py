@@ -0,0 +1,67 @@
+# app/api/v1/endpoints/store/review.py
+
+from typing import List
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_session, get_current_user
+from app.models.user import User
+from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewRead
+from app.services.review_service import ReviewService
+
+router = APIRouter()
+
+
+# ---------------------------------------------------------
+# PUBLIC — LIST PRODUCT REVIEWS
+# ---------------------------------------------------------
+@router.get("/product/{product_id}", response_model=List[ReviewRead])
+def list_product_reviews(
+        product_id: int,
+        limit: int = Query(20, ge=1, le=100),
+        offset: int = Query(0, ge=0),
+        db: Session = Depends(get_session),
+):
+    reviews = ReviewService.list_product_reviews(db, product_id, skip=offset, limit=limit)
+    return [ReviewRead.model_validate(r) for r in reviews]
+
+
+# ---------------------------------------------------------
+# CREATE REVIEW (DELIVERED ORDER ITEM)
+# ---------------------------------------------------------
+@router.post("/", response_model=ReviewRead, status_code=status.HTTP_201_CREATED)
+def create_review(
+        payload: ReviewCreate,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+):
+    review = ReviewService.create_review(db, current_user.id, payload)
+    return ReviewRead.model_validate(review)
+
+
+# ---------------------------------------------------------
+# UPDATE MY REVIEW
+# ---------------------------------------------------------
+@router.put("/{review_id}", response_model=ReviewRead)
+def update_review(
+        review_id: int,
+        payload: ReviewUpdate,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+):
+    review = ReviewService.update_review(db, current_user.id, review_id, payload)
+    return ReviewRead.model_validate(review)
+
+
+# ---------------------------------------------------------
+# DELETE MY REVIEW
+# ---------------------------------------------------------
+@router.delete("/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_review(
+        review_id: int,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+):
+    ReviewService.delete_review(db, current_user.id, review_id)
+    return None
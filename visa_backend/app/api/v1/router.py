@@ -6,14 +6,17 @@ from app.db import engine
 # Store Routes
 from app.api.v1.endpoints.store import (
     auth as store_auth,
+    catalog as store_catalog,
     collection as store_collection,
+    landing as store_landing,
     product as store_product,
     address as store_address,
     wishlist as store_wishlist,
     cart as store_cart,
     coupon as store_coupon,
     case as store_case,
-    order as store_order
+    order as store_order,
+    review as store_review
 )
 
 # Admin Routes
@@ -29,7 +32,8 @@ from app.api.v1.endpoints.admin import (
     order as admin_order,
     case as admin_case,
     address as admin_address,
-    media as admin_media
+    media as admin_media,
+    search as admin_search
 )
 
 # Initialize Router
@@ -39,11 +43,14 @@ api_router = APIRouter()
 api_router.include_router(store_auth.router, prefix="/store/auth", tags=["Store: Authentication"])
 api_router.include_router(store_product.router, prefix="/store/products", tags=["Store: Products"])
 api_router.include_router(store_collection.router, prefix="/store/collections", tags=["Store: Collections"])
+api_router.include_router(store_catalog.router, prefix="/store/catalog", tags=["Store: Catalog"])
+api_router.include_router(store_landing.router, prefix="/store/landing", tags=["Store: Landing"])
 api_router.include_router(store_address.router, prefix="/store/address", tags=["Store: Addresses"])
 api_router.include_router(store_cart.router, prefix="/store/cart", tags=["Store: Cart"])
 api_router.include_router(store_case.router, prefix="/store/support-case", tags=["Store: Support Cases"])
 api_router.include_router(store_coupon.router, prefix="/store/coupons", tags=["Store: Coupons"])
 api_router.include_router(store_order.router, prefix="/store/orders", tags=["Store: Orders"])
+api_router.include_router(store_review.router, prefix="/store/reviews", tags=["Store: Reviews"])
 
 api_router.include_router(store_wishlist.router, prefix="/store/wishlist", tags=["Store: Wishlist"])
 #
@@ -64,6 +71,7 @@ api_router.include_router(admin_order.router, prefix="/admin/orders", tags=["Adm
 api_router.include_router(admin_coupons.router, prefix="/admin/coupons", tags=["Admin: Coupons"])
 api_router.include_router(admin_address.router, prefix="/admin/addresses", tags=["Admin: Addresses"])
 api_router.include_router(admin_media.router, prefix="/admin/media", tags=["Media"])
+api_router.include_router(admin_search.router, prefix="/admin/search", tags=["Admin: Search"])
 
 
 # Health Check
@@ -14,6 +14,60 @@ class Settings(BaseSettings):
     ALLOWED_CURRENCIES: set[str] = {"USD", "EUR", "CAD"}
     DEFAULT_CURRENCY: str = "CAD"
 
+    # Pre-compressed catalog snapshot served to the storefront
+    CATALOG_SNAPSHOT_DIR: str = os.path.join(BASE_DIR, "static", "catalog")
+    CATALOG_SNAPSHOT_DEBOUNCE_SECONDS: float = 5.0
+    CATALOG_SNAPSHOT_KEEP_VERSIONS: int = 3
+
+    # Store search analytics + popular-query result cache
+    SEARCH_LOG_BATCH_SIZE: int = 200
+    SEARCH_LOG_FLUSH_SECONDS: float = 5.0
+    SEARCH_LOG_MAX_BUFFER: int = 10000
+    SEARCH_CACHE_TOP_K: int = 50
+    SEARCH_CACHE_WINDOW_DAYS: int = 7
+    SEARCH_CACHE_DEPTH: int = 100
+
+    # Store landing page aggregate (invalidated on catalog changes; TTL is a safety net)
+    LANDING_PRODUCTS_PER_COLLECTION: int = 8
+    LANDING_CACHE_TTL_SECONDS: float = 600.0
+
+    # Per-user cart summary (badge) cache, keyed on the cart version; dropped on
+    # every cart write in this process (TTL bounds staleness across processes)
+    CART_SUMMARY_CACHE_SIZE: int = 10000
+    CART_SUMMARY_CACHE_TTL_SECONDS: float = 60.0
+
+    # Sizes / products with fewer units than this (but > 0) count as low stock;
+    # per-size reorder points override it for sizes
+    LOW_STOCK_THRESHOLD: int = 5
+    # Low-stock alert digests (JSON files picked up by the mailer / chat relay)
+    LOW_STOCK_OUTBOX_DIR: str = os.path.join(BASE_DIR, "var", "outbox", "low_stock")
+    LOW_STOCK_DIGEST_SECONDS: float = 3600.0
+    LOW_STOCK_DIGEST_BATCH: int = 1000
+
+    # Inventory ledger compaction: rows older than this move to inventory_archive
+    INVENTORY_HOT_DAYS: int = 90
+    INVENTORY_ARCHIVE_BATCH: int = 1000
+
+    # Stock vs ledger reconciliation (resumable state + NDJSON reports)
+    RECONCILIATION_DIR: str = os.path.join(BASE_DIR, "var", "reconciliation")
+    RECONCILIATION_CHUNK_SIZE: int = 200
+
+    # Back-in-stock notifications for wishlisted products
+    BACK_IN_STOCK_CHUNK_SIZE: int = 500
+    BACK_IN_STOCK_USER_DAILY_CAP: int = 3
+    BACK_IN_STOCK_POLL_SECONDS: float = 60.0
+    # Failed fan-outs are retried on later polls, then given up
+    BACK_IN_STOCK_MAX_ATTEMPTS: int = 5
+
+    # Sell-through / turnover / days-of-cover snapshot
+    STOCK_ANALYTICS_WINDOW_DAYS: int = 30
+    STOCK_ANALYTICS_CHUNK_SIZE: int = 500
+
+    # Cart stock reservations (holds released by the background sweeper)
+    STOCK_RESERVATION_TTL_SECONDS: int = 900
+    STOCK_RESERVATION_SWEEP_SECONDS: float = 60.0
+    STOCK_RESERVATION_SWEEP_BATCH: int = 500
+
     class Config:
         env_file = ENV_PATH
         env_file_encoding = "utf-8"
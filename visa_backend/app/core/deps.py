@@ -37,6 +37,39 @@ def get_current_user(
     return user
 
 
+def get_current_user_id(
+        token: str = Depends(oauth2_scheme),
+        db: Session = Depends(get_session),
+) -> int:
+    """
+    Current user's id without loading the user: read from the token's
+    ``uid`` claim, with an id-only lookup for tokens issued without it.
+
+    The user row is not checked on the ``uid`` path, so this is only for
+    read paths (cart summary, conditional fetches); anything that writes
+    must confirm the user exists or depend on ``get_current_user``.
+    """
+    payload = decode_access_token(token)
+
+    if not payload or "sub" not in payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+        )
+
+    if isinstance(payload.get("uid"), int):
+        return payload["uid"]
+
+    user = db.query(User.id).filter(User.email == payload["sub"]).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+
+    return user.id
+
+
 def get_current_user_optional(
         user: Optional[User] = Depends(get_current_user)
 ):
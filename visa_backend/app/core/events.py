@@ -0,0 +1,110 @@
+# app/core/events.py
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# -----------------------------------------------------
+# EVENT NAMES
+# -----------------------------------------------------
+CATALOG_CHANGED = "catalog_changed"
+# A sold-out product is back in stock (RestockEvent rows are waiting)
+STOCK_RESTOCKED = "stock_restocked"
+# A cart's contents changed (payload: user_id); one cart per transaction
+CART_CHANGED = "cart_changed"
+# Product prices / currencies changed or a product was deleted (cart totals are stale)
+PRICES_CHANGED = "prices_changed"
+
+_subscribers: Dict[str, List[Callable[..., None]]] = defaultdict(list)
+
+
+def subscribe(name: str, handler: Callable[..., None]) -> None:
+    """Register a handler for an in-process event."""
+    if handler not in _subscribers[name]:
+        _subscribers[name].append(handler)
+
+
+def publish(name: str, **payload) -> None:
+    """Call every handler registered for ``name``.
+
+    A failing handler must never break the write that triggered it,
+    so handler errors are swallowed.
+    """
+    for handler in list(_subscribers[name]):
+        try:
+            handler(**payload)
+        except Exception:
+            continue
+
+
+def publish_after_commit(db: Session, name: str, **payload) -> None:
+    """Queue an event on the session; it is published once the transaction commits.
+
+    Several writes inside one transaction collapse into a single event per name.
+    """
+    pending = db.info.setdefault("pending_events", {})
+    pending.setdefault(name, {}).update(payload)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_pending_events(session: Session) -> None:
+    pending = session.info.pop("pending_events", None)
+    for name, payload in (pending or {}).items():
+        publish(name, **payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_events(session: Session) -> None:
+    session.info.pop("pending_events", None)
+
+
+# -----------------------------------------------------
+# DEBOUNCE
+# -----------------------------------------------------
+class Debouncer:
+    """Collapse a burst of calls into a single call ``delay`` seconds after the last one.
+
+    ``max_wait`` bounds how long a steady stream of calls can postpone the run.
+    Usable directly as an event handler: ``subscribe(CATALOG_CHANGED, Debouncer(fn, 5))``.
+    """
+
+    def __init__(self, fn: Callable[[], None], delay: float, max_wait: Optional[float] = None):
+        self.fn = fn
+        self.delay = delay
+        self.max_wait = max_wait if max_wait is not None else delay * 6
+        self._timer: Optional[threading.Timer] = None
+        self._first_call: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, **_payload) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._timer is not None:
+                if now - self._first_call >= self.max_wait:
+                    return
+                self._timer.cancel()
+            else:
+                self._first_call = now
+
+            self._timer = threading.Timer(self.delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _run(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._first_call = None
+        self.fn()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            self._first_call = None
@@ -3,13 +3,32 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import api_router
 from app.db import create_db_and_tables
+from app.services.cart_service import CartService
+from app.services.catalog_snapshot_service import CatalogSnapshotService
+from app.services.landing_service import LandingService
+from app.services.low_stock_service import low_stock_digester
+from app.services.notification_service import back_in_stock_notifier
+from app.services.stock_service import reservation_sweeper
+from app.services.search_analytics_service import SearchResultCache, search_recorder
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application startup and shutdown lifecycle"""
     create_db_and_tables()
+    CatalogSnapshotService.register()
+    SearchResultCache.register()
+    LandingService.register()
+    CartService.register()
+    search_recorder.start()
+    reservation_sweeper.start()
+    low_stock_digester.start()
+    back_in_stock_notifier.start()
     yield
+    back_in_stock_notifier.stop()
+    low_stock_digester.stop()
+    reservation_sweeper.stop()
+    search_recorder.stop()
 
 
 # ✅ Initialize FastAPI app
@@ -9,7 +9,7 @@ from app.models.user import User, Role
 from app.models.address import Address
 
 # Catalog (Product + Collection)
-from app.models.catalog import Product, Collection, product_collection_table
+from app.models.catalog import Product, Collection, ProductSizeStock, product_collection_table
 
 # Cart & Wishlist
 from app.models.cart import Cart, CartItem
@@ -22,11 +22,21 @@ from app.models.order import Order, OrderItem
 from app.models.case import SupportCase, CaseMessage
 
 # Inventory
-from app.models.inventory import Inventory
+from app.models.inventory import Inventory, InventoryCheckpoint, InventoryArchive
+from app.models.stock import StockReservation, ProductStockSummary, StockAnalytics, LowStockEvent
 
 # Coupons
 from app.models.coupon import Coupon
 
+# Reviews
+from app.models.review import ProductReview
+
+# Search analytics
+from app.models.search import SearchQuery
+
+# Notifications
+from app.models.notification import RestockEvent, NotificationOutbox
+
 __all__ = [
     "Base",
 
@@ -40,6 +50,7 @@ __all__ = [
     # Catalog
     "Product",
     "Collection",
+    "ProductSizeStock",
     "product_collection_table",
 
     # Cart & Wishlist
@@ -58,7 +69,23 @@ __all__ = [
 
     # Inventory
     "Inventory",
+    "InventoryCheckpoint",
+    "InventoryArchive",
+    "StockReservation",
+    "ProductStockSummary",
+    "StockAnalytics",
+    "LowStockEvent",
 
     # Coupons
     "Coupon",
+
+    # Reviews
+    "ProductReview",
+
+    # Search analytics
+    "SearchQuery",
+
+    # Notifications
+    "RestockEvent",
+    "NotificationOutbox",
 ]
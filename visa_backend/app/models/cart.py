@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import Integer, ForeignKey, String
+from sqlalchemy import Integer, ForeignKey, String, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, BaseTableMixin
@@ -22,6 +22,9 @@ class Cart(Base, BaseTableMixin):
 
     user_id = mapped_column(ForeignKey("users.id"), unique=True, nullable=False, index=True)
 
+    # Bumped by every CartService write; served as the cart's ETag
+    version = mapped_column(Integer, nullable=False, default=1, server_default="1")
+
     user: Mapped["User"] = relationship("User", back_populates="cart", lazy="selectin")
 
     items: Mapped[List["CartItem"]] = relationship(
@@ -46,3 +49,8 @@ class CartItem(Base, BaseTableMixin):
 
     cart: Mapped["Cart"] = relationship("Cart", back_populates="items", lazy="selectin")
     product: Mapped["Product"] = relationship("Product", lazy="selectin")
+
+    __table_args__ = (
+        # CartService line lookup: (cart, product, size)
+        Index("ix_cart_items_cart_product_size", "cart_id", "product_id", "size"),
+    )
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import List, Optional, TYPE_CHECKING
 
-from sqlalchemy import String, ForeignKey, DateTime
+from sqlalchemy import String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, BaseTableMixin
@@ -94,3 +94,8 @@ class CaseMessage(Base, BaseTableMixin):
         "User",
         lazy="selectin"
     )
+
+    __table_args__ = (
+        # First staff reply per case: case_id = ? AND sender_id != ? ORDER BY created_at
+        Index("ix_case_messages_case_sender_created", "case_id", "sender_id", "created_at"),
+    )
@@ -12,9 +12,14 @@ from sqlalchemy import (
     Table,
     ForeignKey,
     JSON,
+    UniqueConstraint,
     Float,
+    Integer,
+    Index,
+    select,
+    text,
 )
-from sqlalchemy.orm import relationship, Mapped
+from sqlalchemy.orm import relationship, Mapped, mapped_column, object_session
 
 from app.models.base import Base, BaseTableMixin
 
@@ -45,6 +50,9 @@ product_collection_table = Table(
     Base.metadata,
     Column("product_id", ForeignKey("products.id"), primary_key=True),
     Column("collection_id", ForeignKey("collections.id"), primary_key=True),
+    # Merchandiser ordering inside the collection (lower first)
+    Column("position", Integer, nullable=False, default=0, server_default="0"),
+    Index("ix_product_collection_link_collection_position", "collection_id", "position", "product_id"),
 )
 
 
@@ -59,14 +67,42 @@ class Collection(Base, BaseTableMixin):
     slug = Column(String(150), unique=True, nullable=False, index=True)
     show_on_landing = Column(Boolean, default=False, nullable=False)
 
+    # Number of linked active products; maintained by CollectionService
+    product_count = Column(Integer, default=0, nullable=False)
+
+    # Smart collection rules (see CollectionRules); NULL for hand-curated
+    # collections. Matching products are materialized into the link table.
+    rules = Column(JSON(none_as_null=True), nullable=True)
+
+    # Membership is edited through product_collection_link directly
+    # (CollectionService); this relationship only loads when accessed.
     products: Mapped[List["Product"]] = relationship(
         secondary=product_collection_table,
-        lazy="selectin",
+        lazy="select",
+        passive_deletes=True,
     )
 
     @property
     def product_ids(self) -> list[int]:
-        return [p.id for p in self.products]
+        """
+        Linked product ids, read from the association table without loading
+        products. List endpoints pre-fill ``_product_ids`` in one query.
+        """
+        ids = self.__dict__.get("_product_ids")
+        if ids is None:
+            session = object_session(self)
+            if session is None or self.id is None:
+                return []
+            link = product_collection_table
+            ids = list(
+                session.execute(
+                    select(link.c.product_id)
+                    .where(link.c.collection_id == self.id)
+                    .order_by(link.c.position, link.c.product_id)
+                ).scalars()
+            )
+            self._product_ids = ids
+        return ids
 
 
 # -----------------------------------------------------
@@ -78,16 +114,113 @@ class Product(Base, BaseTableMixin):
     sku = Column(String(100), unique=True, nullable=False, index=True)
     name = Column(String(200), nullable=False, index=True)
     description = Column(String(2000))
+
+    # Average rating; maintained together with the aggregates below on review writes
     rating = Column(Float, default=0.0)
+    rating_count = Column(Integer, default=0, nullable=False)
+    rating_sum = Column(Integer, default=0, nullable=False)
+    rating_1_count = Column(Integer, default=0, nullable=False)
+    rating_2_count = Column(Integer, default=0, nullable=False)
+    rating_3_count = Column(Integer, default=0, nullable=False)
+    rating_4_count = Column(Integer, default=0, nullable=False)
+    rating_5_count = Column(Integer, default=0, nullable=False)
 
     price = Column(Float, nullable=False)
     currency = Column(String(5), nullable=False, default="CAD")
 
     category = Column(String(50), nullable=False)
 
-    sizes = Column(JSON, default=dict)
+    # Pre-normalization stock JSON; kept only so scripts/migrate_size_stock.py
+    # can move it into product_size_stock. Use ``sizes`` instead.
+    legacy_sizes = Column("sizes", JSON, default=dict)
     care_instructions = Column(JSON, default=list)
     product_details = Column(JSON, default=dict)
     images = Column(JSON, default=list)
 
     slug = Column(String(150), unique=True, index=True, nullable=False)
+
+    size_stock: Mapped[List["ProductSizeStock"]] = relationship(
+        back_populates="product",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        order_by="ProductSizeStock.id",
+    )
+
+    __table_args__ = (
+        # Store listing (is_active == True) — partial: inactive products never
+        # appear in these queries. Sorted by rating, or newest first with an
+        # optional category filter.
+        Index(
+            "ix_products_active_rating",
+            "rating",
+            "rating_count",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_products_active_category_created",
+            "category",
+            "created_at",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_products_active_created",
+            "created_at",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active"),
+        ),
+    )
+
+    @property
+    def rating_histogram(self) -> dict[int, int]:
+        return {
+            star: getattr(self, f"rating_{star}_count") or 0
+            for star in range(1, 6)
+        }
+
+    @property
+    def sizes(self) -> dict[str, int]:
+        """Size → units in stock (same shape as the old JSON column)."""
+        return {row.size: row.quantity for row in self.size_stock}
+
+    @sizes.setter
+    def sizes(self, value: dict) -> None:
+        """
+        Replace the size list: missing sizes are removed and new ones start
+        at the given quantity. Quantities of existing sizes are left alone;
+        change those through StockService.adjust so the ledger records them.
+        """
+        value = {str(size): int(qty or 0) for size, qty in (value or {}).items()}
+        rows = {row.size: row for row in self.size_stock}
+
+        for size, row in rows.items():
+            if size not in value:
+                self.size_stock.remove(row)
+
+        for size, quantity in value.items():
+            if size not in rows:
+                self.size_stock.append(ProductSizeStock(size=size, quantity=quantity))
+
+
+# -----------------------------------------------------
+# PER-SIZE STOCK
+# -----------------------------------------------------
+class ProductSizeStock(Base, BaseTableMixin):
+    __tablename__ = "product_size_stock"
+
+    product_id = mapped_column(ForeignKey("products.id"), nullable=False)
+    size = mapped_column(String(20), nullable=False)
+    quantity = mapped_column(Integer, nullable=False, default=0)
+    # Below this many units the size is low on stock; NULL → LOW_STOCK_THRESHOLD
+    reorder_point = mapped_column(Integer, nullable=True)
+
+    product: Mapped["Product"] = relationship(back_populates="size_stock")
+
+    __table_args__ = (
+        UniqueConstraint("product_id", "size", name="uq_product_size_stock_product_size"),
+        # "size 7 below 3 units" style stock queries
+        Index("ix_product_size_stock_size_quantity", "size", "quantity"),
+        # Low / out-of-stock reports across every size
+        Index("ix_product_size_stock_quantity", "quantity"),
+    )
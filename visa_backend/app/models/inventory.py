@@ -3,7 +3,7 @@
 from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import String, ForeignKey, Integer
+from sqlalchemy import String, ForeignKey, Integer, DateTime, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, BaseTableMixin
@@ -16,12 +16,17 @@ if TYPE_CHECKING:
 class Inventory(Base, BaseTableMixin):
     __tablename__ = "inventory"
 
-    product_id = mapped_column(ForeignKey("products.id"), nullable=False, index=True)
+    # Listings project the display fields they need (see InventoryService.query_ledger),
+    # so the related rows are only loaded on access
+    product_id = mapped_column(ForeignKey("products.id"), nullable=False)
     product: Mapped["Product"] = relationship(
         "Product",
-        lazy="selectin",
+        lazy="select",
     )
 
+    # Size the movement applies to (product_size_stock); NULL for legacy rows
+    size = mapped_column(String(20), nullable=True)
+
     previous_quantity = mapped_column(Integer, nullable=False, default=0)
     change = mapped_column(Integer, nullable=False, default=0)
     new_quantity = mapped_column(Integer, nullable=False, default=0)
@@ -37,5 +42,63 @@ class Inventory(Base, BaseTableMixin):
     performed_by_id = mapped_column(ForeignKey("users.id"), nullable=True)
     performed_by: Mapped[Optional["User"]] = relationship(
         "User",
-        lazy="selectin",
+        lazy="select",
+    )
+
+    __table_args__ = (
+        # Per-(product, size) ledger replay in id order (reconciliation)
+        Index("ix_inventory_product_size_id", "product_id", "size", "id"),
+        # Latest-first listing of the hot tail, overall and per filter (keyset on created_at, id)
+        Index("ix_inventory_created_at_id", "created_at", "id"),
+        Index("ix_inventory_product_created_id", "product_id", "created_at", "id"),
+        Index("ix_inventory_reason_created_id", "reason", "created_at", "id"),
+        Index("ix_inventory_performer_created_id", "performed_by_id", "created_at", "id"),
+    )
+
+
+# -----------------------------------------------------
+# LEDGER CHECKPOINTS
+# -----------------------------------------------------
+class InventoryCheckpoint(Base, BaseTableMixin):
+    """
+    State of one (product, size) as of the last archived ledger row.
+    Ledger state = this checkpoint + the hot ``inventory`` rows after
+    ``last_inventory_id``.
+    """
+
+    __tablename__ = "inventory_checkpoints"
+
+    product_id = mapped_column(ForeignKey("products.id"), nullable=False)
+    size = mapped_column(String(20), nullable=True)
+
+    quantity = mapped_column(Integer, nullable=False, default=0)
+    # Totals over every archived movement of this (product, size)
+    movement_count = mapped_column(Integer, nullable=False, default=0)
+    net_change = mapped_column(Integer, nullable=False, default=0)
+
+    last_inventory_id = mapped_column(Integer, nullable=False)
+    as_of = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("product_id", "size", name="uq_inventory_checkpoints_product_size"),
     )
+
+
+# -----------------------------------------------------
+# ARCHIVED (COLD) LEDGER ROWS
+# -----------------------------------------------------
+class InventoryArchive(Base, BaseTableMixin):
+    """Ledger rows moved out of ``inventory`` by compaction; ids are preserved."""
+
+    __tablename__ = "inventory_archive"
+
+    product_id = mapped_column(Integer, nullable=False, index=True)
+    size = mapped_column(String(20), nullable=True)
+    previous_quantity = mapped_column(Integer, nullable=False, default=0)
+    change = mapped_column(Integer, nullable=False, default=0)
+    new_quantity = mapped_column(Integer, nullable=False, default=0)
+    reason = mapped_column(String(100), nullable=False)
+    note = mapped_column(String, nullable=True)
+    performed_by_id = mapped_column(Integer, nullable=True)
+
+    archived_at = mapped_column(DateTime(timezone=True), nullable=False)
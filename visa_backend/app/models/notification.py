@@ -0,0 +1,60 @@
+# app/models/notification.py
+
+from __future__ import annotations
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import mapped_column
+
+from app.models.base import Base, BaseTableMixin
+
+
+# -----------------------------------------------------
+# RESTOCK EVENTS (0 → POSITIVE, RECORDED WITH THE STOCK WRITE)
+# -----------------------------------------------------
+class RestockEvent(Base, BaseTableMixin):
+    """
+    A sold-out product came back in stock; fanned out to wishlist subscribers.
+    A fan-out that keeps failing is given up after BACK_IN_STOCK_MAX_ATTEMPTS:
+    ``processed_at`` is set and ``last_error`` says why.
+    """
+
+    __tablename__ = "restock_events"
+
+    product_id = mapped_column(ForeignKey("products.id"), nullable=False)
+    processed_at = mapped_column(DateTime(timezone=True), nullable=True)
+    attempts = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_error = mapped_column(String(500), nullable=True)
+
+    __table_args__ = (
+        # Pending events, oldest first
+        Index("ix_restock_events_processed_id", "processed_at", "id"),
+    )
+
+
+# -----------------------------------------------------
+# NOTIFICATION OUTBOX (DURABLE QUEUE)
+# -----------------------------------------------------
+class NotificationOutbox(Base, BaseTableMixin):
+    """
+    Customer notifications waiting for delivery. ``dedupe_key`` is unique,
+    so enqueuing the same notification twice is a no-op.
+    """
+
+    __tablename__ = "notification_outbox"
+
+    user_id = mapped_column(ForeignKey("users.id"), nullable=False)
+    kind = mapped_column(String(50), nullable=False)  # back_in_stock / ...
+    channel = mapped_column(String(20), nullable=False, default="email")
+    payload = mapped_column(JSON, nullable=False, default=dict)
+    dedupe_key = mapped_column(String(255), nullable=False, unique=True)
+
+    status = mapped_column(String(20), nullable=False, default="pending")  # pending / sent / failed
+    attempts = mapped_column(Integer, nullable=False, default=0)
+    sent_at = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Delivery worker: pending rows, oldest first
+        Index("ix_notification_outbox_status_id", "status", "id"),
+        # Per-user rate cap: recent notifications of a kind
+        Index("ix_notification_outbox_user_kind_created", "user_id", "kind", "created_at"),
+    )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import List, Optional, TYPE_CHECKING
-from sqlalchemy import String, Float, ForeignKey, Integer, JSON
+from sqlalchemy import String, Float, ForeignKey, Integer, JSON, Index, DateTime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, BaseTableMixin
@@ -32,12 +32,15 @@ class Order(Base, BaseTableMixin):
     )
 
     total_amount = mapped_column(Float, default=0.0, nullable=False)
-    status = mapped_column(String(50), default=OrderStatus.PENDING, nullable=False, index=True)
+    status = mapped_column(String(50), default=OrderStatus.PENDING, nullable=False)
 
     # Address snapshots stored as JSON
     shipping_address = mapped_column(JSON, nullable=False)
     billing_address = mapped_column(JSON, nullable=False)
 
+    # Set when the warehouse has picked the items (batch, from the pick list)
+    picked_at = mapped_column(DateTime(timezone=True), nullable=True)
+
     user: Mapped[Optional["User"]] = relationship(
         "User",
         back_populates="orders",
@@ -51,6 +54,13 @@ class Order(Base, BaseTableMixin):
         lazy="selectin",
     )
 
+    __table_args__ = (
+        # list_orders / dashboard: filter by status, newest first
+        # (also serves plain status lookups, replacing the single-column index)
+        Index("ix_orders_status_id", "status", "id"),
+        Index("ix_orders_status_created_at", "status", "created_at"),
+    )
+
 
 # -----------------------------------------------------
 # ORDER ITEM
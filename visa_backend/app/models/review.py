@@ -0,0 +1,29 @@
+# app/models/review.py
+
+from __future__ import annotations
+
+from sqlalchemy import String, ForeignKey, Integer, Index
+from sqlalchemy.orm import mapped_column
+
+from app.models.base import Base, BaseTableMixin
+
+
+# -----------------------------------------------------
+# PRODUCT REVIEW MODEL
+# -----------------------------------------------------
+class ProductReview(Base, BaseTableMixin):
+    __tablename__ = "product_reviews"
+
+    product_id = mapped_column(ForeignKey("products.id"), nullable=False)
+    user_id = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+
+    # One review per purchased (and delivered) line
+    order_item_id = mapped_column(ForeignKey("order_items.id"), nullable=False, unique=True)
+
+    rating = mapped_column(Integer, nullable=False)
+    title = mapped_column(String(200), nullable=True)
+    comment = mapped_column(String(2000), nullable=True)
+
+    __table_args__ = (
+        Index("ix_product_reviews_product_created", "product_id", "created_at"),
+    )
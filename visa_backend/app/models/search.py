@@ -0,0 +1,28 @@
+# app/models/search.py
+
+from __future__ import annotations
+
+from sqlalchemy import String, Integer, Float, JSON, Index
+from sqlalchemy.orm import mapped_column
+
+from app.models.base import Base, BaseTableMixin
+
+
+# -----------------------------------------------------
+# STORE SEARCH QUERY LOG
+# -----------------------------------------------------
+class SearchQuery(Base, BaseTableMixin):
+    __tablename__ = "search_queries"
+
+    # Normalized text (lower-cased, whitespace collapsed)
+    query = mapped_column(String(255), nullable=False)
+    category = mapped_column(String(50), nullable=True)
+    filters = mapped_column(JSON, default=dict, nullable=False)
+
+    result_count = mapped_column(Integer, nullable=False, default=0)
+    latency_ms = mapped_column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        Index("ix_search_queries_created_at_query", "created_at", "query"),
+        Index("ix_search_queries_query_created_at", "query", "created_at"),
+    )
@@ -0,0 +1,122 @@
+# app/models/stock.py
+
+from __future__ import annotations
+
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import mapped_column
+
+from app.models.base import Base, BaseTableMixin
+
+
+# -----------------------------------------------------
+# STOCK RESERVATIONS (CART HOLDS)
+# -----------------------------------------------------
+class StockReservation(Base, BaseTableMixin):
+    """Units of one size held for a cart until ``expires_at``."""
+
+    __tablename__ = "stock_reservations"
+
+    cart_id = mapped_column(ForeignKey("carts.id"), nullable=False)
+    product_id = mapped_column(ForeignKey("products.id"), nullable=False)
+    size = mapped_column(String(20), nullable=False)
+    quantity = mapped_column(Integer, nullable=False)
+    expires_at = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("cart_id", "product_id", "size", name="uq_stock_reservations_cart_product_size"),
+        # Available-to-sell: active holds per (product, size)
+        Index("ix_stock_reservations_product_size_expires", "product_id", "size", "expires_at"),
+        # Expiry sweeper
+        Index("ix_stock_reservations_expires_at", "expires_at"),
+    )
+
+
+# -----------------------------------------------------
+# PER-PRODUCT STOCK SUMMARY (MATERIALIZED)
+# -----------------------------------------------------
+class ProductStockSummary(Base, BaseTableMixin):
+    """
+    Aggregates of product_size_stock for one product, refreshed by
+    StockService on every stock write so stock reports are indexed reads.
+    Low-stock means 0 < quantity < settings.LOW_STOCK_THRESHOLD.
+    """
+
+    __tablename__ = "product_stock_summary"
+
+    product_id = mapped_column(ForeignKey("products.id"), nullable=False, unique=True)
+    total_units = mapped_column(Integer, nullable=False, default=0)
+    size_count = mapped_column(Integer, nullable=False, default=0)
+    min_size_quantity = mapped_column(Integer, nullable=True)
+    low_stock_size_count = mapped_column(Integer, nullable=False, default=0)
+    out_of_stock_size_count = mapped_column(Integer, nullable=False, default=0)
+    # Product-level: total units across sizes is low (but not zero)
+    is_low_stock = mapped_column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        Index("ix_product_stock_summary_low_sizes", "low_stock_size_count"),
+        Index("ix_product_stock_summary_out_sizes", "out_of_stock_size_count"),
+        Index("ix_product_stock_summary_is_low_total", "is_low_stock", "total_units"),
+    )
+
+
+# -----------------------------------------------------
+# LOW-STOCK EVENTS (DETECTED AT WRITE TIME)
+# -----------------------------------------------------
+class LowStockEvent(Base, BaseTableMixin):
+    """
+    A stock write that took a size below its reorder point ("low") or to
+    zero ("out"). Collected into periodic digests; ``digested_at`` marks
+    events already sent.
+    """
+
+    __tablename__ = "low_stock_events"
+
+    product_id = mapped_column(ForeignKey("products.id"), nullable=False)
+    size = mapped_column(String(20), nullable=False)
+    kind = mapped_column(String(10), nullable=False)  # low / out
+    previous_quantity = mapped_column(Integer, nullable=False)
+    new_quantity = mapped_column(Integer, nullable=False)
+    reorder_point = mapped_column(Integer, nullable=False)
+    digested_at = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Pending events, oldest first
+        Index("ix_low_stock_events_digested_id", "digested_at", "id"),
+    )
+
+
+# -----------------------------------------------------
+# STOCK ANALYTICS SNAPSHOT (PER PRODUCT + SIZE)
+# -----------------------------------------------------
+class StockAnalytics(Base, BaseTableMixin):
+    """
+    Sell-through, turnover and days-of-cover over the trailing window,
+    rebuilt in full by StockAnalyticsService.compute.
+    """
+
+    __tablename__ = "stock_analytics"
+
+    product_id = mapped_column(ForeignKey("products.id"), nullable=False)
+    size = mapped_column(String(20), nullable=False)
+    window_days = mapped_column(Integer, nullable=False)
+
+    on_hand = mapped_column(Integer, nullable=False, default=0)
+    opening_units = mapped_column(Integer, nullable=False, default=0)
+    units_sold = mapped_column(Integer, nullable=False, default=0)
+    units_received = mapped_column(Integer, nullable=False, default=0)
+
+    # units sold / (opening units + units received)
+    sell_through_rate = mapped_column(Float, nullable=True)
+    # units sold / average units on hand
+    turnover = mapped_column(Float, nullable=True)
+    daily_sales = mapped_column(Float, nullable=False, default=0.0)
+    # on hand / daily sales; NULL when nothing sold in the window
+    days_of_cover = mapped_column(Float, nullable=True)
+
+    computed_at = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("product_id", "size", name="uq_stock_analytics_product_size"),
+        # "Running out soonest" listing
+        Index("ix_stock_analytics_days_of_cover", "days_of_cover"),
+    )
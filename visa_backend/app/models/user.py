@@ -88,10 +88,11 @@ class User(Base, BaseTableMixin):
         lazy="selectin",
     )
 
+    # Whole ledger history per user: load only on access
     inventory_actions: Mapped[List["Inventory"]] = relationship(
         "Inventory",
         back_populates="performed_by",
-        lazy="selectin",
+        lazy="select",
     )
 
     cases_raised: Mapped[List["SupportCase"]] = relationship(
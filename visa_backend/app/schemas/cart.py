@@ -1,6 +1,6 @@
 # app/schemas/cart.py
 
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.base import BaseRead
@@ -20,6 +20,20 @@ class CartItemUpdate(BaseModel):
     quantity: int = Field(gt=0)
 
 
+# One step of a batched cart PATCH. Lines are addressed by item_id or by
+# (product_id, size); "add" always needs product_id, size and quantity.
+class CartOperation(BaseModel):
+    op: Literal["add", "update", "remove"]
+    item_id: Optional[int] = None
+    product_id: Optional[int] = None
+    size: Optional[str] = None
+    quantity: Optional[int] = Field(default=None, gt=0)
+
+
+class CartBatchUpdate(BaseModel):
+    operations: List[CartOperation] = Field(min_length=1, max_length=50)
+
+
 class CartItemRead(BaseRead):
     id: int
     cart_id: int
@@ -37,6 +51,52 @@ class CartItemRead(BaseRead):
 class CartRead(BaseRead):
     id: int
     user_id: int
+    version: int = 1
     items: List[CartItemRead] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# ---------------------------
+# Compact Cart (no nested ProductRead)
+# ---------------------------
+class CartLineProduct(BaseModel):
+    id: int
+    sku: str
+    name: str
+    slug: str
+    image: Optional[str] = None
+
+
+class CartLine(BaseModel):
+    id: int
+    product_id: int
+    size: str
+    quantity: int
+    unit_price: float
+    line_total: float
+    currency: str
+    # Product still sold and the line's quantity is available to this cart
+    in_stock: bool
+    product: CartLineProduct
+
+
+class CartSubtotal(BaseModel):
+    currency: str
+    subtotal: float
+    item_count: int
+
+
+class CartCompact(BaseModel):
+    id: Optional[int] = None
+    version: int = 0
+    item_count: int = 0
+    lines: List[CartLine] = []
+    subtotals: List[CartSubtotal] = []
+
+
+class CartSummary(BaseModel):
+    # 0 when the user has no cart yet
+    version: int = 0
+    item_count: int = 0
+    subtotals: List[CartSubtotal] = []
@@ -1,7 +1,8 @@
 # app/schemas/catalog.py
 
+from enum import Enum
 from typing import List, Optional, Dict
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from app.models.base import BaseRead
 from app.models.catalog import ProductCategory
 from app.core.config import settings
@@ -12,11 +13,25 @@ DEFAULT_CURRENCY = settings.DEFAULT_CURRENCY
 # -----------------------------------------------------
 # COLLECTION SCHEMAS
 # -----------------------------------------------------
+class CollectionRules(BaseModel):
+    # Smart collection criteria — every given rule must match (AND)
+    category: Optional[ProductCategory] = None
+    currency: Optional[str] = None
+    min_price: Optional[float] = Field(default=None, ge=0)
+    max_price: Optional[float] = Field(default=None, ge=0)
+    # product_details key → required value (case-insensitive), e.g. {"Metal": "Platinum"}
+    attributes: Dict[str, str] = {}
+    # Only products with at least one size in stock
+    in_stock: bool = False
+
+
 class CollectionCreate(BaseModel):
     name: str
     description: Optional[str] = None
     show_on_landing: bool = False
     product_ids: List[int] = []
+    # When set, membership is maintained from the rules (product_ids not allowed)
+    rules: Optional[CollectionRules] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -27,6 +42,8 @@ class CollectionUpdate(BaseModel):
     is_active: Optional[bool] = None
     show_on_landing: Optional[bool] = None
     product_ids: Optional[List[int]] = None
+    # null turns a smart collection back into a hand-curated one
+    rules: Optional[CollectionRules] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -38,11 +55,23 @@ class CollectionRead(BaseRead):
     slug: str
     is_active: bool
     show_on_landing: bool
+    product_count: int = 0
     product_ids: List[int] = []
+    rules: Optional[CollectionRules] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class CollectionMembershipUpdate(BaseModel):
+    # Products to add to / remove from a collection; other links are untouched
+    product_ids: List[int]
+
+
+class CollectionProductPositions(BaseModel):
+    # Product ids in display order; positions are assigned 0..n-1
+    product_ids: List[int]
+
+
 # -----------------------------------------------------
 # PRODUCT SCHEMAS
 # -----------------------------------------------------
@@ -50,7 +79,6 @@ class ProductCreate(BaseModel):
     sku: str
     name: str
     description: Optional[str] = None
-    rating: float = 0.0
     price: float
     currency: str = DEFAULT_CURRENCY
     category: ProductCategory
@@ -67,7 +95,6 @@ class ProductUpdate(BaseModel):
     sku: Optional[str] = None
     name: Optional[str] = None
     description: Optional[str] = None
-    rating: Optional[float] = None
     price: Optional[float] = None
     currency: Optional[str] = None
     category: Optional[ProductCategory] = None
@@ -88,6 +115,8 @@ class ProductRead(BaseRead):
     name: str
     description: Optional[str]
     rating: float
+    rating_count: int = 0
+    rating_histogram: Dict[int, int] = {}
     price: float
     currency: str
 
@@ -102,3 +131,94 @@ class ProductRead(BaseRead):
     is_active: bool
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# -----------------------------------------------------
+# BULK PRICE UPDATE SCHEMAS
+# -----------------------------------------------------
+class PriceAdjustmentType(str, Enum):
+    PERCENTAGE = "percentage"
+    ABSOLUTE = "absolute"
+
+
+class ProductBulkPriceUpdate(BaseModel):
+    # Scope — at least one is required; combined filters are ANDed
+    category: Optional[ProductCategory] = None
+    collection_id: Optional[int] = None
+    product_ids: Optional[List[int]] = None
+    currency: Optional[str] = None
+    active_only: bool = False
+
+    # Rule
+    adjustment_type: PriceAdjustmentType = PriceAdjustmentType.PERCENTAGE
+    # percentage: +10 → 10% increase, -15 → 15% off; absolute: amount added to price
+    value: float = 0.0
+    # Round the adjusted price to the nearest multiple (e.g. 1, 5, 10)
+    round_to: Optional[float] = Field(default=None, gt=0)
+    # Force a price ending after rounding (e.g. 0.99 → 1299.99)
+    price_ending: Optional[float] = Field(default=None, ge=0, lt=1)
+
+    dry_run: bool = True
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductPricePreview(BaseModel):
+    id: int
+    sku: str
+    name: str
+    currency: str
+    old_price: float
+    new_price: float
+
+
+class ProductBulkPriceResult(BaseModel):
+    dry_run: bool
+    matched: int
+    updated: int
+    preview: List[ProductPricePreview] = []
+
+
+# -----------------------------------------------------
+# COLLECTION PRODUCT PAGE (KEYSET PAGINATION)
+# -----------------------------------------------------
+class CollectionProductSort(str, Enum):
+    POSITION = "position"
+    NEWEST = "newest"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+
+
+class CollectionProductPage(BaseModel):
+    items: List[ProductRead] = []
+    total: int
+    sort: CollectionProductSort
+    next_cursor: Optional[str] = None
+
+
+# -----------------------------------------------------
+# STORE LANDING PAGE
+# -----------------------------------------------------
+class ProductSummary(BaseModel):
+    id: int
+    name: str
+    slug: str
+    price: float
+    currency: str
+    category: ProductCategory
+    rating: float
+    rating_count: int = 0
+    image: Optional[str] = None
+
+
+class LandingCollection(BaseModel):
+    id: int
+    name: str
+    slug: str
+    description: Optional[str]
+    product_count: int = 0
+    products: List[ProductSummary] = []
+
+
+class LandingPage(BaseModel):
+    collections: List[LandingCollection] = []
@@ -1,25 +1,53 @@
 # app/schemas/inventory.py
 
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.base import BaseRead
 
 
 class InventoryCreate(BaseModel):
     product_id: int
+    # When given, ``change`` is applied to this size's stock and the recorded
+    # previous / new quantities come from the stock table
+    size: Optional[str] = None
+    previous_quantity: int = 0
+    change: int
+    new_quantity: int = 0
+    reason: str
+    note: Optional[str] = None
+    performed_by_id: Optional[int] = None
+
+
+class InventoryLedgerEntry(BaseModel):
+    """Ledger row with only the product / performer display fields."""
+    id: int
+    created_at: datetime
+    product_id: int
+    product_name: Optional[str] = None
+    product_sku: Optional[str] = None
+    size: Optional[str] = None
     previous_quantity: int
     change: int
     new_quantity: int
     reason: str
     note: Optional[str] = None
     performed_by_id: Optional[int] = None
+    performed_by_name: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class InventoryLedgerPage(BaseModel):
+    items: List[InventoryLedgerEntry] = []
+    next_cursor: Optional[str] = None
 
 
 class InventoryRead(BaseRead):
     id: int
     product_id: int
+    size: Optional[str] = None
     previous_quantity: int
     change: int
     new_quantity: int
@@ -28,3 +56,91 @@ class InventoryRead(BaseRead):
     performed_by_id: Optional[int]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# -----------------------------------------------------
+# BULK ADJUSTMENT (STOCK COUNTS / RESTOCKS)
+# -----------------------------------------------------
+class InventoryBulkLine(BaseModel):
+    sku: str
+    size: str
+    # Exactly one of: relative change (restock +12, damage -1) or counted units
+    change: Optional[int] = None
+    quantity: Optional[int] = Field(default=None, ge=0)
+
+
+class InventoryBulkAdjust(BaseModel):
+    lines: List[InventoryBulkLine] = Field(min_length=1, max_length=5000)
+    reason: str = "audit"
+    note: Optional[str] = None
+
+
+class InventoryBulkLineResult(BaseModel):
+    line: int
+    sku: str
+    size: str
+    status: str  # applied / unchanged / error
+    previous_quantity: Optional[int] = None
+    change: int = 0
+    new_quantity: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class InventoryBulkResult(BaseModel):
+    applied: int
+    unchanged: int
+    errors: int
+    results: List[InventoryBulkLineResult] = []
+
+
+# -----------------------------------------------------
+# REORDER POINTS / LOW-STOCK EVENTS
+# -----------------------------------------------------
+class ReorderPoint(BaseModel):
+    product_id: int
+    size: str
+    # None → back to LOW_STOCK_THRESHOLD
+    reorder_point: Optional[int] = Field(default=None, ge=0)
+
+
+class ReorderPointUpdate(BaseModel):
+    items: List[ReorderPoint] = Field(min_length=1, max_length=5000)
+
+
+class LowStockEventRead(BaseRead):
+    id: int
+    product_id: int
+    size: str
+    kind: str
+    previous_quantity: int
+    new_quantity: int
+    reorder_point: int
+    digested_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# -----------------------------------------------------
+# STOCK ANALYTICS SNAPSHOT
+# -----------------------------------------------------
+class StockAnalyticsRow(BaseModel):
+    product_id: int
+    product_name: str
+    product_sku: str
+    size: str
+    on_hand: int
+    opening_units: int
+    units_sold: int
+    units_received: int
+    sell_through_rate: Optional[float] = None
+    turnover: Optional[float] = None
+    daily_sales: float
+    days_of_cover: Optional[float] = None
+
+
+class StockAnalyticsSnapshot(BaseModel):
+    # None until the first snapshot is computed
+    computed_at: Optional[datetime] = None
+    age_seconds: Optional[int] = None
+    window_days: Optional[int] = None
+    items: List[StockAnalyticsRow] = []
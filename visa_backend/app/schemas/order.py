@@ -1,5 +1,6 @@
 # app/schemas/order.py
 
+from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, ConfigDict
 
@@ -55,6 +56,7 @@ class OrderRead(BaseRead):
     user_id: Optional[int]
     total_amount: float
     status: str
+    picked_at: Optional[datetime] = None
 
     shipping_address: AddressSnapshot
     billing_address: AddressSnapshot
@@ -62,3 +64,33 @@ class OrderRead(BaseRead):
     items: List[OrderItemRead] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# -----------------------------
+# FULFILLMENT PICK LIST
+# -----------------------------
+class PickListLine(BaseModel):
+    product_id: int
+    sku: str
+    name: str
+    size: str
+    quantity: int
+    orders: int
+
+
+class PickList(BaseModel):
+    generated_at: datetime
+    # Highest order id included; pass it back to mark-picked so orders placed
+    # after the list was printed are not marked
+    max_order_id: Optional[int] = None
+    order_count: int
+    lines: List[PickListLine] = []
+
+
+class PickListMark(BaseModel):
+    statuses: List[str] = ["pending", "paid"]
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    max_order_id: Optional[int] = None
+    # When given, only these orders (still subject to the filters above)
+    order_ids: Optional[List[int]] = None
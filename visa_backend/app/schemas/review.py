@@ -0,0 +1,31 @@
+# app/schemas/review.py
+
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.base import BaseRead
+
+
+class ReviewCreate(BaseModel):
+    order_item_id: int
+    rating: int = Field(ge=1, le=5)
+    title: Optional[str] = Field(default=None, max_length=200)
+    comment: Optional[str] = Field(default=None, max_length=2000)
+
+
+class ReviewUpdate(BaseModel):
+    rating: Optional[int] = Field(default=None, ge=1, le=5)
+    title: Optional[str] = Field(default=None, max_length=200)
+    comment: Optional[str] = Field(default=None, max_length=2000)
+
+
+class ReviewRead(BaseRead):
+    id: int
+    product_id: int
+    user_id: int
+    order_item_id: int
+    rating: int
+    title: Optional[str]
+    comment: Optional[str]
+
+    model_config = ConfigDict(from_attributes=True)
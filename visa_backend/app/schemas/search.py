@@ -0,0 +1,21 @@
+# app/schemas/search.py
+
+from typing import List
+from pydantic import BaseModel
+
+
+class SearchQueryStat(BaseModel):
+    query: str
+    searches: int
+    avg_results: float
+    avg_latency_ms: float
+    max_latency_ms: float
+
+
+class SearchAnalyticsRead(BaseModel):
+    days: int
+    total_searches: int
+    top_queries: List[SearchQueryStat] = []
+    zero_result_queries: List[SearchQueryStat] = []
+    slowest_queries: List[SearchQueryStat] = []
+    cached_queries: List[str] = []
@@ -95,7 +95,7 @@ class AuthService:
     # ------------------------------
     @staticmethod
     def build_login_response(user: User) -> dict:
-        token = create_access_token({"sub": user.email})
+        token = create_access_token({"sub": user.email, "uid": user.id})
         return {
             "access_token": token,
             "token_type": "Bearer",
@@ -110,7 +110,7 @@ class AuthService:
 
     @staticmethod
     def build_client_login_response(user: User) -> dict:
-        token = create_access_token({"sub": user.email})
+        token = create_access_token({"sub": user.email, "uid": user.id})
 
         # ---------------------------------------------------
         # Split full_name into firstName / lastName
@@ -1,18 +1,103 @@
 # app/services/cart_service.py
 
 from __future__ import annotations
-from typing import List
+from typing import List, Optional
 
 from fastapi import HTTPException
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import Session
 
+from app.core.cache import MemoryCache
+from app.core.config import settings
+from app.core.events import CART_CHANGED, PRICES_CHANGED, publish_after_commit, subscribe
 from app.models.cart import Cart, CartItem
-from app.models.catalog import Product
-from app.schemas.cart import CartItemCreate, CartItemUpdate  # (we'll define below)
+from app.models.catalog import Product, ProductSizeStock
+from app.models.user import User
+from app.schemas.cart import CartBatchUpdate, CartItemCreate, CartItemUpdate
+from app.services.stock_service import StockService
 
 
 class CartService:
 
+    # user_id → {version, item_count, subtotals}
+    summary_cache = MemoryCache(
+        "cart_summary",
+        max_entries=settings.CART_SUMMARY_CACHE_SIZE,
+        ttl=settings.CART_SUMMARY_CACHE_TTL_SECONDS,
+    )
+    _registered = False
+    # Bumped on every invalidation so a summary built during a write is not cached
+    _generation = 0
+
+    # -----------------------------------------------------
+    # Versioning + summary cache
+    # -----------------------------------------------------
+    @staticmethod
+    def bump_version(db: Session, cart_id: int, user_id: int) -> None:
+        """
+        Increment the cart version in the caller's transaction; the cached
+        summary is dropped once it commits. Every cart write goes through here.
+        """
+        db.execute(
+            update(Cart)
+            .where(Cart.id == cart_id)
+            .values(version=Cart.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        publish_after_commit(db, CART_CHANGED, user_id=user_id)
+
+    @staticmethod
+    def invalidate_summary(user_id: Optional[int] = None, **_payload) -> None:
+        CartService._generation += 1
+        if user_id is None:
+            CartService.summary_cache.clear()
+        else:
+            CartService.summary_cache.delete(user_id)
+
+    @staticmethod
+    def register() -> None:
+        """Drop cached summaries on cart writes, and all of them on price changes (not stock writes)."""
+        if not CartService._registered:
+            subscribe(CART_CHANGED, CartService.invalidate_summary)
+            subscribe(PRICES_CHANGED, CartService.invalidate_summary)
+            CartService._registered = True
+
+    @staticmethod
+    def get_summary(db: Session, user_id: int) -> dict:
+        """Version, item count and subtotals per currency; cached until the cart changes."""
+        summary = CartService.summary_cache.get(user_id)
+        if summary is not None:
+            return summary
+
+        generation = CartService._generation
+        rows = db.execute(
+            select(
+                Cart.version,
+                Product.currency,
+                func.sum(CartItem.quantity).label("item_count"),
+                func.sum(CartItem.quantity * Product.price).label("subtotal"),
+            )
+            .outerjoin(CartItem, CartItem.cart_id == Cart.id)
+            .outerjoin(Product, Product.id == CartItem.product_id)
+            .where(Cart.user_id == user_id)
+            .group_by(Cart.version, Product.currency)
+            .order_by(Product.currency)
+        ).all()
+
+        subtotals = [
+            {"currency": r.currency, "subtotal": round(r.subtotal, 2), "item_count": r.item_count}
+            for r in rows
+            if r.currency is not None
+        ]
+        summary = {
+            "version": rows[0].version if rows else 0,
+            "item_count": sum(s["item_count"] for s in subtotals),
+            "subtotals": subtotals,
+        }
+        if generation == CartService._generation:
+            CartService.summary_cache.set(user_id, summary)
+        return summary
+
     # -----------------------------------------------------
     # Ensure cart exists for user
     # -----------------------------------------------------
@@ -21,8 +106,14 @@ class CartService:
         cart = db.query(Cart).filter(Cart.user_id == user_id).first()
 
         if not cart:
+            # user_id may come straight from a token (get_current_user_id);
+            # never create a cart for a user that no longer exists
+            if not db.query(User.id).filter(User.id == user_id).first():
+                raise HTTPException(status_code=404, detail="User not found")
+
             cart = Cart(user_id=user_id)
             db.add(cart)
+            publish_after_commit(db, CART_CHANGED, user_id=user_id)
             db.commit()
             db.refresh(cart)
 
@@ -38,6 +129,87 @@ class CartService:
             cart = CartService._get_or_create_cart(db, user_id)
         return cart
 
+    # -----------------------------------------------------
+    # Compact cart (one joined query, no ORM entities)
+    # -----------------------------------------------------
+    @staticmethod
+    def get_compact_cart(db: Session, user_id: int) -> dict:
+        """
+        Cart lines with summary product columns, current prices, an
+        availability flag and subtotals per currency. Carts → items →
+        products → size stock in one outer-joined query; a missing cart is
+        reported as empty rather than created.
+        """
+        available = func.coalesce(ProductSizeStock.quantity, 0) - StockService._held_by_others(
+            CartItem.product_id, CartItem.size, Cart.id
+        )
+        rows = db.execute(
+            select(
+                Cart.id.label("cart_id"),
+                Cart.version,
+                CartItem.id,
+                CartItem.product_id,
+                CartItem.size,
+                CartItem.quantity,
+                Product.sku,
+                Product.name,
+                Product.slug,
+                Product.images,
+                Product.price,
+                Product.currency,
+                Product.is_active,
+                available.label("available"),
+            )
+            .outerjoin(CartItem, CartItem.cart_id == Cart.id)
+            .outerjoin(Product, Product.id == CartItem.product_id)
+            .outerjoin(
+                ProductSizeStock,
+                (ProductSizeStock.product_id == CartItem.product_id)
+                & (ProductSizeStock.size == CartItem.size),
+            )
+            .where(Cart.user_id == user_id)
+            .order_by(CartItem.id)
+        ).all()
+
+        lines = []
+        subtotals = {}
+        for r in rows:
+            if r.id is None:
+                continue  # empty cart: the single row carries only the cart id
+
+            line_total = round(r.price * r.quantity, 2)
+            lines.append({
+                "id": r.id,
+                "product_id": r.product_id,
+                "size": r.size,
+                "quantity": r.quantity,
+                "unit_price": r.price,
+                "line_total": line_total,
+                "currency": r.currency,
+                "in_stock": bool(r.is_active) and r.available >= r.quantity,
+                "product": {
+                    "id": r.product_id,
+                    "sku": r.sku,
+                    "name": r.name,
+                    "slug": r.slug,
+                    "image": r.images[0] if r.images else None,
+                },
+            })
+
+            subtotal = subtotals.setdefault(
+                r.currency, {"currency": r.currency, "subtotal": 0.0, "item_count": 0}
+            )
+            subtotal["subtotal"] = round(subtotal["subtotal"] + line_total, 2)
+            subtotal["item_count"] += r.quantity
+
+        return {
+            "id": rows[0].cart_id if rows else None,
+            "version": rows[0].version if rows else 0,
+            "item_count": sum(line["quantity"] for line in lines),
+            "lines": lines,
+            "subtotals": sorted(subtotals.values(), key=lambda s: s["currency"]),
+        }
+
     # -----------------------------------------------------
     # Add item to cart
     # -----------------------------------------------------
@@ -46,19 +218,20 @@ class CartService:
         cart = CartService._get_or_create_cart(db, user_id)
 
         # Validate product
-        product = db.query(Product).filter(Product.id == data.product_id).first()
+        product = db.query(Product.id).filter(Product.id == data.product_id).first()
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
 
-        # Validate size
-        if data.size not in product.sizes:
+        # Validate size + check stock available to sell (stock minus other carts' holds)
+        stock = StockService.available_to_sell(
+            db, [(data.product_id, data.size)], exclude_cart_id=cart.id
+        ).get((data.product_id, data.size))
+        if stock is None:
             raise HTTPException(
                 status_code=400,
                 detail=f"Size '{data.size}' not available for this product",
             )
 
-        # Check stock
-        stock = product.sizes.get(data.size, 0)
         if stock < 1:
             raise HTTPException(status_code=400, detail="Selected size is out of stock")
 
@@ -87,14 +260,18 @@ class CartService:
             quantity=data.quantity,
         )
 
-        # Stock validation for quantity
-        if item.quantity > stock:
+        # Stock validation for quantity + hold the units for this cart
+        if item.quantity > stock or not StockService.reserve(
+            db, cart.id, data.product_id, data.size, item.quantity
+        ):
+            db.rollback()
             raise HTTPException(
                 status_code=400,
                 detail=f"Only {stock} units available for size {data.size}",
             )
 
         db.add(item)
+        CartService.bump_version(db, cart.id, user_id)
         db.commit()
         db.refresh(cart)
         return cart
@@ -119,12 +296,15 @@ class CartService:
         if not item:
             raise HTTPException(status_code=404, detail="Cart item not found")
 
-        product = db.query(Product).filter(Product.id == item.product_id).first()
+        stock = StockService.available_to_sell(
+            db, [(item.product_id, item.size)], exclude_cart_id=cart.id
+        ).get((item.product_id, item.size), 0)
 
-        stock = product.sizes.get(item.size, 0)
-
-        # Validate new quantity
-        if data.quantity > stock:
+        # Validate new quantity + refresh the hold (new quantity, new expiry)
+        if data.quantity > stock or not StockService.reserve(
+            db, cart.id, item.product_id, item.size, data.quantity
+        ):
+            db.rollback()
             raise HTTPException(
                 status_code=400,
                 detail=f"Insufficient stock for size {item.size}. Available: {stock}",
@@ -133,6 +313,7 @@ class CartService:
         item.quantity = data.quantity
 
         db.add(item)
+        CartService.bump_version(db, cart.id, user_id)
         db.commit()
         db.refresh(cart)
         return cart
@@ -153,11 +334,137 @@ class CartService:
         if not item:
             raise HTTPException(status_code=404, detail="Item not found in cart")
 
+        StockService.release(db, cart.id, item.product_id, item.size)
         db.delete(item)
+        CartService.bump_version(db, cart.id, user_id)
         db.commit()
         db.refresh(cart)
         return cart
 
+    # -----------------------------------------------------
+    # Apply a batch of add / update / remove operations
+    # -----------------------------------------------------
+    @staticmethod
+    def _resolve_operations(lines: dict, data: CartBatchUpdate) -> tuple:
+        """
+        Replay the operations on the cart's current lines ({(product_id, size):
+        (item_id, quantity)}). Returns the resulting {key: quantity} and the
+        keys whose hold must be (re)taken.
+        """
+        by_id = {item_id: key for key, (item_id, _) in lines.items()}
+        target = {key: quantity for key, (_, quantity) in lines.items()}
+        touched = set()
+
+        for index, op in enumerate(data.operations):
+            if op.item_id is not None:
+                key = by_id.get(op.item_id)
+                if key is None:
+                    raise HTTPException(status_code=404, detail=f"Operation {index}: Cart item not found")
+            elif op.product_id is not None and op.size is not None:
+                key = (op.product_id, op.size)
+            else:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Operation {index}: provide item_id or product_id and size",
+                )
+
+            if op.op != "remove" and op.quantity is None:
+                raise HTTPException(status_code=400, detail=f"Operation {index}: quantity is required")
+
+            if op.op == "add":
+                if op.item_id is not None:
+                    raise HTTPException(status_code=400, detail=f"Operation {index}: add takes product_id and size")
+                if key in target:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Operation {index}: Item already exists in cart. Update quantity instead.",
+                    )
+                target[key] = op.quantity
+                touched.add(key)
+            elif key not in target:
+                raise HTTPException(status_code=404, detail=f"Operation {index}: Cart item not found")
+            elif op.op == "update":
+                target[key] = op.quantity
+                touched.add(key)
+            else:
+                del target[key]
+                touched.discard(key)
+
+        return target, touched
+
+    @staticmethod
+    def apply_operations(db: Session, user_id: int, data: CartBatchUpdate) -> Cart:
+        """
+        Apply every operation in one transaction: stock for all touched sizes
+        is checked with one query, holds are taken as in ``add_item`` /
+        ``update_item``, and nothing is written if any operation fails.
+        """
+        # Only the id until the end: the Cart entity loads items and products
+        cart_id = db.scalar(select(Cart.id).where(Cart.user_id == user_id))
+        if cart_id is None:
+            cart_id = CartService._get_or_create_cart(db, user_id).id
+
+        lines = {
+            (r.product_id, r.size): (r.id, r.quantity)
+            for r in db.execute(
+                select(CartItem.id, CartItem.product_id, CartItem.size, CartItem.quantity)
+                .where(CartItem.cart_id == cart_id)
+            )
+        }
+        target, touched = CartService._resolve_operations(lines, data)
+
+        available = StockService.available_to_sell(db, touched, exclude_cart_id=cart_id)
+        for product_id, size in sorted(touched):
+            stock = available.get((product_id, size))
+            if stock is None:
+                if not db.query(Product.id).filter(Product.id == product_id).first():
+                    raise HTTPException(status_code=404, detail="Product not found")
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Size '{size}' not available for this product",
+                )
+            if target[(product_id, size)] > stock:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Insufficient stock for size {size}. Available: {stock}",
+                )
+
+        removed = {key: item_id for key, (item_id, _) in lines.items() if key not in target}
+        if removed:
+            for product_id, size in removed:
+                StockService.release(db, cart_id, product_id, size)
+            db.execute(
+                delete(CartItem)
+                .where(CartItem.id.in_(removed.values()))
+            )
+
+        for product_id, size in sorted(touched):
+            if not StockService.reserve(db, cart_id, product_id, size, target[(product_id, size)]):
+                # Another cart took the units between the check and the hold
+                db.rollback()
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Insufficient stock for size {size}",
+                )
+
+        changed = [
+            {"id": lines[key][0], "quantity": quantity}
+            for key, quantity in target.items()
+            if key in lines and quantity != lines[key][1]
+        ]
+        if changed:
+            db.execute(update(CartItem), changed)
+
+        db.add_all([
+            CartItem(cart_id=cart_id, product_id=product_id, size=size, quantity=quantity)
+            for (product_id, size), quantity in target.items()
+            if (product_id, size) not in lines
+        ])
+        CartService.bump_version(db, cart_id, user_id)
+
+        db.commit()
+        return db.get(Cart, cart_id)
+
     # -----------------------------------------------------
     # Clear entire cart
     # -----------------------------------------------------
@@ -167,6 +474,8 @@ class CartService:
 
         for item in list(cart.items):
             db.delete(item)
+        StockService.release(db, cart.id)
+        CartService.bump_version(db, cart.id, user_id)
 
         db.commit()
         db.refresh(cart)
@@ -2,24 +2,45 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import List, Optional
 
 from fastapi import HTTPException
-from sqlalchemy import or_
+from sqlalchemy import (
+    Integer,
+    bindparam,
+    case,
+    cast,
+    delete,
+    exists,
+    func,
+    or_,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.orm import Session
 from starlette import status
 
+from app.core.events import CATALOG_CHANGED, PRICES_CHANGED, publish_after_commit
 from app.models.catalog import (
     Product,
     Collection,
+    ProductSizeStock,
+    product_collection_table,
 )
+from app.models.stock import ProductStockSummary
 from app.schemas.catalog import (
     ProductCreate,
     ProductUpdate,
     CollectionCreate,
     CollectionUpdate,
+    PriceAdjustmentType,
+    ProductBulkPriceUpdate,
+    CollectionProductSort,
 )
-from app.utils.common import generate_unique_slug
+from app.services.stock_service import StockService
+from app.utils.common import generate_unique_slug, utcnow, encode_cursor, decode_cursor
 
 
 # =====================================================================
@@ -29,6 +50,309 @@ from app.utils.common import generate_unique_slug
 
 class CollectionService:
 
+    # Sort key, id tie-breaker (same direction) and descending flag for store
+    # collection listings. Position order ties on the link table's product_id
+    # so the whole ORDER BY is served by the link index.
+    _PRODUCT_SORTS = {
+        CollectionProductSort.POSITION: (
+            product_collection_table.c.position, product_collection_table.c.product_id, False
+        ),
+        CollectionProductSort.NEWEST: (Product.created_at, Product.id, True),
+        CollectionProductSort.PRICE_ASC: (Product.price, Product.id, False),
+        CollectionProductSort.PRICE_DESC: (Product.price, Product.id, True),
+    }
+
+    # ---------------------------------------------------
+    # ACTIVE PRODUCT COUNTS
+    # ---------------------------------------------------
+    @staticmethod
+    def refresh_product_counts(db: Session, collection_ids: Optional[List[int]] = None) -> None:
+        """Recompute Collection.product_count (linked active products) in one UPDATE."""
+        if collection_ids is not None and not collection_ids:
+            return
+
+        link = product_collection_table
+        active_count = (
+            select(func.count())
+            .select_from(link.join(Product, Product.id == link.c.product_id))
+            .where(link.c.collection_id == Collection.id, Product.is_active == True)
+            .scalar_subquery()
+        )
+
+        stmt = update(Collection).values(product_count=active_count)
+        if collection_ids is not None:
+            stmt = stmt.where(Collection.id.in_(collection_ids))
+
+        db.execute(stmt.execution_options(synchronize_session=False))
+
+    @staticmethod
+    def collection_ids_for_product(db: Session, product_id: int) -> List[int]:
+        return list(
+            db.execute(
+                select(product_collection_table.c.collection_id).where(
+                    product_collection_table.c.product_id == product_id
+                )
+            ).scalars()
+        )
+
+    # ---------------------------------------------------
+    # MEMBERSHIP (ID-ONLY, DIFF-BASED)
+    # ---------------------------------------------------
+    @staticmethod
+    def attach_product_ids(db: Session, collections: List[Collection]) -> List[Collection]:
+        """Fill ``product_ids`` for many collections with one association-table query."""
+        if not collections:
+            return collections
+
+        link = product_collection_table
+        ids_by_collection = {c.id: [] for c in collections}
+        rows = db.execute(
+            select(link.c.collection_id, link.c.product_id)
+            .where(link.c.collection_id.in_(ids_by_collection))
+            .order_by(link.c.collection_id, link.c.position, link.c.product_id)
+        ).all()
+        for collection_id, product_id in rows:
+            ids_by_collection[collection_id].append(product_id)
+
+        for collection in collections:
+            collection._product_ids = ids_by_collection[collection.id]
+        return collections
+
+    @staticmethod
+    def _linked_product_ids(db: Session, collection_id: int) -> set:
+        link = product_collection_table
+        return set(
+            db.execute(
+                select(link.c.product_id).where(link.c.collection_id == collection_id)
+            ).scalars()
+        )
+
+    @staticmethod
+    def _add_links(db: Session, collection_id: int, product_ids: List[int]) -> int:
+        """Insert links for products not yet in the collection, appended after the current last position."""
+        link = product_collection_table
+        wanted = list(dict.fromkeys(product_ids))
+        if not wanted:
+            return 0
+
+        existing = CollectionService._linked_product_ids(db, collection_id)
+        known = set(
+            db.execute(select(Product.id).where(Product.id.in_(wanted))).scalars()
+        )
+        new_ids = [pid for pid in wanted if pid in known and pid not in existing]
+        if not new_ids:
+            return 0
+
+        next_position = (
+            db.execute(
+                select(func.coalesce(func.max(link.c.position) + 1, 0)).where(
+                    link.c.collection_id == collection_id
+                )
+            ).scalar()
+        )
+        db.execute(
+            link.insert(),
+            [
+                {"collection_id": collection_id, "product_id": pid, "position": next_position + i}
+                for i, pid in enumerate(new_ids)
+            ],
+        )
+        return len(new_ids)
+
+    @staticmethod
+    def _remove_links(db: Session, collection_id: int, product_ids) -> int:
+        link = product_collection_table
+        if not product_ids:
+            return 0
+        result = db.execute(
+            delete(link).where(
+                link.c.collection_id == collection_id,
+                link.c.product_id.in_(list(product_ids)),
+            )
+        )
+        return result.rowcount or 0
+
+    @staticmethod
+    def _apply_membership_change(db: Session, collection: Collection, changed: int) -> Collection:
+        if changed:
+            CollectionService.refresh_product_counts(db, [collection.id])
+            publish_after_commit(db, CATALOG_CHANGED)
+        db.commit()
+        db.refresh(collection)
+        collection._product_ids = None
+        return collection
+
+    @staticmethod
+    def add_products(db: Session, collection_id: int, product_ids: List[int]) -> Collection:
+        collection = CollectionService.get_collection(db, collection_id)
+        CollectionService._require_manual(collection)
+        changed = CollectionService._add_links(db, collection.id, product_ids)
+        return CollectionService._apply_membership_change(db, collection, changed)
+
+    @staticmethod
+    def remove_products(db: Session, collection_id: int, product_ids: List[int]) -> Collection:
+        collection = CollectionService.get_collection(db, collection_id)
+        CollectionService._require_manual(collection)
+        changed = CollectionService._remove_links(db, collection.id, product_ids)
+        return CollectionService._apply_membership_change(db, collection, changed)
+
+    @staticmethod
+    def _replace_links(db: Session, collection_id: int, product_ids: List[int]) -> int:
+        """Make membership equal ``product_ids`` touching only rows that differ."""
+        existing = CollectionService._linked_product_ids(db, collection_id)
+        removed = CollectionService._remove_links(db, collection_id, existing - set(product_ids))
+        added = CollectionService._add_links(db, collection_id, product_ids)
+        return removed + added
+
+    # ---------------------------------------------------
+    # SMART COLLECTIONS (RULE-BASED, MATERIALIZED)
+    # ---------------------------------------------------
+    # Columns a rule can look at; loaded instead of full Product rows
+    _RULE_COLUMNS = (
+        Product.id,
+        Product.category,
+        Product.currency,
+        Product.price,
+        Product.product_details,
+        exists()
+        .where(ProductSizeStock.product_id == Product.id, ProductSizeStock.quantity > 0)
+        .label("in_stock"),
+    )
+
+    @staticmethod
+    def _rule_prefilter(rules: dict) -> list:
+        """SQL-side part of a rule set (category / currency / price range)."""
+        filters = []
+        if rules.get("category"):
+            filters.append(Product.category == rules["category"])
+        if rules.get("currency"):
+            filters.append(Product.currency == rules["currency"].upper())
+        if rules.get("min_price") is not None:
+            filters.append(Product.price >= rules["min_price"])
+        if rules.get("max_price") is not None:
+            filters.append(Product.price <= rules["max_price"])
+        return filters
+
+    @staticmethod
+    def product_matches_rules(rules: dict, product) -> bool:
+        if rules.get("category") and product.category != rules["category"]:
+            return False
+        if rules.get("currency") and (product.currency or "").upper() != rules["currency"].upper():
+            return False
+        if rules.get("min_price") is not None and product.price < rules["min_price"]:
+            return False
+        if rules.get("max_price") is not None and product.price > rules["max_price"]:
+            return False
+
+        details = {
+            str(k).casefold(): str(v).casefold()
+            for k, v in (product.product_details or {}).items()
+        }
+        for key, value in (rules.get("attributes") or {}).items():
+            if details.get(key.casefold()) != value.casefold():
+                return False
+
+        if rules.get("in_stock") and not product.in_stock:
+            return False
+
+        return True
+
+    @staticmethod
+    def _require_manual(collection: Collection) -> None:
+        if collection.rules is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Membership of a rule-based collection is managed by its rules.",
+            )
+
+    @staticmethod
+    def rebuild_smart_collection(db: Session, collection: Collection) -> int:
+        """Evaluate one collection's rules over the catalog (rule create / change only)."""
+        rules = collection.rules or {}
+        matching = [
+            row.id
+            for row in db.execute(
+                select(*CollectionService._RULE_COLUMNS)
+                .where(*CollectionService._rule_prefilter(rules))
+                .order_by(Product.id)
+                .execution_options(yield_per=500)
+            )
+            if CollectionService.product_matches_rules(rules, row)
+        ]
+        changed = CollectionService._replace_links(db, collection.id, matching)
+        CollectionService.refresh_product_counts(db, [collection.id])
+        return changed
+
+    @staticmethod
+    def sync_products(db: Session, product_ids: List[int]) -> None:
+        """
+        Incrementally update smart-collection membership for changed products:
+        only these products are evaluated, against every rule set.
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        if not product_ids:
+            return
+
+        smart = db.execute(
+            select(Collection.id, Collection.rules).where(Collection.rules.is_not(None))
+        ).all()
+        if not smart:
+            return
+
+        link = product_collection_table
+        smart_ids = [c.id for c in smart]
+        touched = set()
+
+        for start in range(0, len(product_ids), 500):
+            chunk = product_ids[start:start + 500]
+            products = db.execute(
+                select(*CollectionService._RULE_COLUMNS).where(Product.id.in_(chunk))
+            ).all()
+
+            desired = {
+                (c.id, p.id)
+                for c in smart
+                for p in products
+                if CollectionService.product_matches_rules(c.rules, p)
+            }
+            current = set(
+                db.execute(
+                    select(link.c.collection_id, link.c.product_id).where(
+                        link.c.product_id.in_(chunk), link.c.collection_id.in_(smart_ids)
+                    )
+                ).all()
+            )
+
+            stale = current - desired
+            if stale:
+                db.execute(
+                    delete(link).where(
+                        tuple_(link.c.collection_id, link.c.product_id).in_(list(stale))
+                    )
+                )
+
+            added = sorted(desired - current)
+            if added:
+                next_positions = dict(
+                    db.execute(
+                        select(link.c.collection_id, func.max(link.c.position) + 1)
+                        .where(link.c.collection_id.in_({cid for cid, _ in added}))
+                        .group_by(link.c.collection_id)
+                    ).all()
+                )
+                rows = []
+                for collection_id, product_id in added:
+                    position = next_positions.get(collection_id, 0)
+                    next_positions[collection_id] = position + 1
+                    rows.append(
+                        {"collection_id": collection_id, "product_id": product_id, "position": position}
+                    )
+                db.execute(link.insert(), rows)
+
+            touched.update(cid for cid, _ in desired ^ current)
+
+        CollectionService.refresh_product_counts(db, sorted(touched))
+
     @staticmethod
     def get_metrics(db: Session):
         from app.models.catalog import Collection, product_collection_table
@@ -66,23 +390,33 @@ class CollectionService:
 
     @staticmethod
     def create_collection(db: Session, data: CollectionCreate) -> Collection:
+        if data.rules is not None and data.product_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A rule-based collection cannot take product_ids.",
+            )
+
         slug = generate_unique_slug(db, Collection, data.name)
         collection = Collection(
             name=data.name,
             description=data.description,
             slug=slug,
             show_on_landing=data.show_on_landing,
+            rules=data.rules.model_dump(mode="json", exclude_none=True) if data.rules else None,
         )
         db.add(collection)
-        db.commit()
-        db.refresh(collection)
+        db.flush()
+
+        if collection.rules is not None:
+            CollectionService.rebuild_smart_collection(db, collection)
 
         # Assign products if provided
-        if data.product_ids:
-            products = db.query(Product).filter(Product.id.in_(data.product_ids)).all()
-            collection.products = products
-            db.commit()
-            db.refresh(collection)
+        elif CollectionService._add_links(db, collection.id, data.product_ids):
+            CollectionService.refresh_product_counts(db, [collection.id])
+
+        publish_after_commit(db, CATALOG_CHANGED)
+        db.commit()
+        db.refresh(collection)
 
         return collection
 
@@ -124,7 +458,7 @@ class CollectionService:
         # Pagination
         query = query.offset(skip).limit(limit)
 
-        return query.all()
+        return CollectionService.attach_product_ids(db, query.all())
 
     @staticmethod
     def update_collection(
@@ -142,6 +476,13 @@ class CollectionService:
 
         # handle product linking
         product_ids = payload.pop("product_ids", None)
+        rules_changed = "rules" in payload
+        rules = payload.pop("rules", None)
+
+        if rules_changed:
+            collection.rules = data.rules.model_dump(mode="json", exclude_none=True) if rules else None
+        if product_ids is not None:
+            CollectionService._require_manual(collection)
 
         # handle slug if name changes
         if "name" in payload and payload["name"] != collection.name:
@@ -152,11 +493,19 @@ class CollectionService:
         for field, value in payload.items():
             setattr(collection, field, value)
 
-        # update products relationship
-        if product_ids is not None:
-            products = db.query(Product).filter(Product.id.in_(product_ids)).all()
-            collection.products = products
+        # re-materialize a smart collection whose rules changed
+        if rules_changed and collection.rules is not None:
+            db.flush()
+            CollectionService.rebuild_smart_collection(db, collection)
+            collection._product_ids = None
 
+        # update product links (only rows that actually change)
+        elif product_ids is not None:
+            if CollectionService._replace_links(db, collection.id, product_ids):
+                CollectionService.refresh_product_counts(db, [collection.id])
+            collection._product_ids = None
+
+        publish_after_commit(db, CATALOG_CHANGED)
         db.commit()
         db.refresh(collection)
 
@@ -171,24 +520,30 @@ class CollectionService:
 
             raise HTTPException(status_code=404, detail="Collection not found")
 
+        db.execute(
+            delete(product_collection_table).where(
+                product_collection_table.c.collection_id == collection.id
+            )
+        )
         db.delete(collection)
+        publish_after_commit(db, CATALOG_CHANGED)
         db.commit()
 
     # LIST ACTIVE COLLECTIONS
     @staticmethod
     def list_store_collections(db: Session):
 
-        return (
+        collections = (
             db.query(Collection)
             .filter(Collection.is_active == True)
             .order_by(Collection.created_at.desc())
             .all()
         )
+        return CollectionService.attach_product_ids(db, collections)
 
     # STORE — COLLECTION
     @staticmethod
-    def get_store_collection_products(db: Session, slug: str):
-
+    def _get_store_collection(db: Session, slug: str) -> Collection:
         collection = (
             db.query(Collection)
             .filter(Collection.slug == slug, Collection.is_active.is_(True))
@@ -196,10 +551,100 @@ class CollectionService:
         )
         if not collection:
             raise HTTPException(status_code=404, detail="Collection not found")
+        return collection
+
+    @staticmethod
+    def _store_collection_products_query(collection_id: int):
+        link = product_collection_table
+        return (
+            select(Product)
+            .join(link, link.c.product_id == Product.id)
+            .where(link.c.collection_id == collection_id, Product.is_active == True)
+        )
 
-        active_products = [p for p in collection.products if p.is_active]
+    @staticmethod
+    def get_store_collection_products(db: Session, slug: str):
+        collection = CollectionService._get_store_collection(db, slug)
 
-        return active_products
+        # Active filter + merchandiser order applied in SQL
+        query = CollectionService._store_collection_products_query(collection.id).order_by(
+            product_collection_table.c.position.asc(), product_collection_table.c.product_id.asc()
+        )
+        return db.execute(query).scalars().all()
+
+    @staticmethod
+    def list_store_collection_products_page(
+        db: Session,
+        slug: str,
+        sort: CollectionProductSort = CollectionProductSort.POSITION,
+        limit: int = 24,
+        cursor: Optional[str] = None,
+    ) -> dict:
+        collection = CollectionService._get_store_collection(db, slug)
+        column, tiebreak, descending = CollectionService._PRODUCT_SORTS[sort]
+
+        query = CollectionService._store_collection_products_query(collection.id).add_columns(
+            column.label("sort_value")
+        )
+
+        # Keyset: continue strictly after the (sort value, id) of the previous page
+        if cursor:
+            try:
+                value, last_id = decode_cursor(cursor)
+                if sort == CollectionProductSort.NEWEST:
+                    value = datetime.fromisoformat(value)
+                last_id = int(last_id)
+            except (ValueError, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+            key = tuple_(column, tiebreak)
+            query = query.where(key < (value, last_id) if descending else key > (value, last_id))
+
+        if descending:
+            query = query.order_by(column.desc(), tiebreak.desc())
+        else:
+            query = query.order_by(column.asc(), tiebreak.asc())
+
+        rows = db.execute(query.limit(limit + 1)).all()
+        page = rows[:limit]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor(last.sort_value, last[0].id)
+
+        return {
+            "items": [row[0] for row in page],
+            "total": collection.product_count or 0,
+            "sort": sort,
+            "next_cursor": next_cursor,
+        }
+
+    # ADMIN — MERCHANDISER ORDER
+    @staticmethod
+    def set_product_positions(db: Session, collection_id: int, product_ids: List[int]) -> Collection:
+        collection = CollectionService.get_collection(db, collection_id)
+        link = product_collection_table
+
+        if product_ids:
+            db.execute(
+                update(link)
+                .where(
+                    link.c.collection_id == bindparam("b_collection_id"),
+                    link.c.product_id == bindparam("b_product_id"),
+                )
+                .values(position=bindparam("b_position")),
+                [
+                    {"b_collection_id": collection.id, "b_product_id": pid, "b_position": index}
+                    for index, pid in enumerate(product_ids)
+                ],
+            )
+
+        publish_after_commit(db, CATALOG_CHANGED)
+        db.commit()
+        db.refresh(collection)
+        collection._product_ids = None
+        return collection
 
 
 # =====================================================================
@@ -215,27 +660,14 @@ class ProductService:
         active_products = db.query(Product).filter(Product.is_active == True).count()
         inactive_products = total_products - active_products
 
-        low_stock_count = 0
-        active_products_list = db.query(Product).filter(Product.is_active == True).all()
-
-        for product in active_products_list:
-            sizes_data = product.sizes or {}
-
-            # ensure it's a dict; if somehow it's not, skip it safely
-            if not isinstance(sizes_data, dict):
-                continue
-
-            # Sum all size quantities, treating missing/invalid as 0
-            total_stock = 0
-            for qty in sizes_data.values():
-                try:
-                    total_stock += int(qty or 0)
-                except (TypeError, ValueError):
-                    # if some garbage value sneaks in, treat as 0
-                    continue
-
-            if 0 < total_stock < 5:
-                low_stock_count += 1
+        # Active products whose total stock is low (materialized summary flag)
+        low_stock_count = (
+            db.query(func.count(ProductStockSummary.id))
+            .join(Product, Product.id == ProductStockSummary.product_id)
+            .filter(ProductStockSummary.is_low_stock == True, Product.is_active == True)
+            .scalar()
+            or 0
+        )
 
         return {
             "total_products": total_products,
@@ -244,11 +676,53 @@ class ProductService:
             "low_stock_products": low_stock_count,
         }
 
+    # ---------------------------------------------------
+    # SIZE EDITS → LEDGERED ADJUSTMENTS
+    # ---------------------------------------------------
+    @staticmethod
+    def _apply_sizes(
+            db: Session,
+            product: Product,
+            sizes: dict,
+            performed_by_id: Optional[int] = None,
+    ) -> None:
+        """
+        Add / remove size rows, then move every size to its requested quantity
+        with a relative ``admin_update`` adjustment, so the edit is in the
+        ledger and never overwrites units sold since the form was loaded.
+        """
+        sizes = {str(size): int(qty or 0) for size, qty in (sizes or {}).items()}
+        current = product.sizes
+
+        # New sizes start empty; their stock arrives through the ledger below
+        product.sizes = {size: 0 for size in sizes}
+        db.flush()
+
+        for size, quantity in sizes.items():
+            change = quantity - current.get(size, 0)
+            if change:
+                StockService.adjust(
+                    db,
+                    product_id=product.id,
+                    size=size,
+                    change=change,
+                    reason="admin_update",
+                    performed_by_id=performed_by_id,
+                    note="Product size edit",
+                )
+
+        # Created sizes count as healthy before the edit (adjust compared against 0)
+        StockService.record_crossings(db, [
+            (product.id, size, None, quantity, None)
+            for size, quantity in sizes.items()
+            if size not in current
+        ])
+
     # ---------------------------------------------------
     # CREATE PRODUCT
     # ---------------------------------------------------
     @staticmethod
-    def create_product(db: Session, data: ProductCreate) -> Product:
+    def create_product(db: Session, data: ProductCreate, performed_by_id: Optional[int] = None) -> Product:
 
         # 🔍 Check for existing SKU
         existing = db.query(Product).filter(Product.sku == data.sku).first()
@@ -265,11 +739,9 @@ class ProductService:
             sku=data.sku,
             name=data.name,
             description=data.description,
-            rating=data.rating,
             price=data.price,
             currency=data.currency,
             category=data.category.value,
-            sizes=data.sizes,
             care_instructions=data.care_instructions,
             product_details=data.product_details,
             images=data.images,
@@ -277,6 +749,11 @@ class ProductService:
         )
 
         db.add(product)
+        db.flush()
+        ProductService._apply_sizes(db, product, data.sizes, performed_by_id)
+        StockService.after_change(db, [product.id])
+
+        publish_after_commit(db, CATALOG_CHANGED)
         db.commit()
         db.refresh(product)
 
@@ -336,7 +813,12 @@ class ProductService:
     # UPDATE PRODUCT
     # ---------------------------------------------------
     @staticmethod
-    def update_product(db: Session, product_id: int, data: ProductUpdate) -> Product:
+    def update_product(
+            db: Session,
+            product_id: int,
+            data: ProductUpdate,
+            performed_by_id: Optional[int] = None,
+    ) -> Product:
 
         product = ProductService.get_product(db, product_id)
 
@@ -352,10 +834,29 @@ class ProductService:
             product.category = payload["category"].value
             del payload["category"]
 
+        # Stock edits go through the ledger, not the setter
+        sizes = payload.pop("sizes", None)
+
         # Simple fields
         for field, value in payload.items():
             setattr(product, field, value)
 
+        db.flush()
+        if sizes is not None:
+            ProductService._apply_sizes(db, product, sizes, performed_by_id)
+            StockService.after_change(db, [product.id])
+        else:
+            CollectionService.sync_products(db, [product.id])
+
+        # Activation changes the active counts of every collection it belongs to
+        if "is_active" in payload:
+            CollectionService.refresh_product_counts(
+                db, CollectionService.collection_ids_for_product(db, product.id)
+            )
+
+        if "price" in payload or "currency" in payload:
+            publish_after_commit(db, PRICES_CHANGED)
+        publish_after_commit(db, CATALOG_CHANGED)
         db.commit()
         db.refresh(product)
 
@@ -367,9 +868,136 @@ class ProductService:
     @staticmethod
     def delete_product(db: Session, product_id: int) -> None:
         product = ProductService.get_product(db, product_id)
+        collection_ids = CollectionService.collection_ids_for_product(db, product.id)
+
+        db.execute(
+            delete(product_collection_table).where(
+                product_collection_table.c.product_id == product.id
+            )
+        )
+        db.execute(delete(ProductStockSummary).where(ProductStockSummary.product_id == product.id))
         db.delete(product)
+        db.flush()
+        CollectionService.refresh_product_counts(db, collection_ids)
+
+        publish_after_commit(db, PRICES_CHANGED)
+        publish_after_commit(db, CATALOG_CHANGED)
         db.commit()
 
+    # ---------------------------------------------------
+    # BULK PRICE UPDATE (SET-BASED)
+    # ---------------------------------------------------
+    @staticmethod
+    def _bulk_price_filters(db: Session, data: ProductBulkPriceUpdate) -> list:
+        if data.category is None and data.collection_id is None and not data.product_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Provide at least one of category, collection_id or product_ids.",
+            )
+
+        filters = []
+
+        if data.category is not None:
+            filters.append(Product.category == data.category.value)
+
+        if data.collection_id is not None:
+            exists = db.query(Collection.id).filter(Collection.id == data.collection_id).first()
+            if not exists:
+                raise HTTPException(status_code=404, detail="Collection not found")
+
+            filters.append(
+                Product.id.in_(
+                    select(product_collection_table.c.product_id).where(
+                        product_collection_table.c.collection_id == data.collection_id
+                    )
+                )
+            )
+
+        if data.product_ids:
+            filters.append(Product.id.in_(data.product_ids))
+
+        if data.currency:
+            filters.append(Product.currency == data.currency.upper())
+
+        if data.active_only:
+            filters.append(Product.is_active == True)
+
+        return filters
+
+    @staticmethod
+    def _bulk_price_expression(data: ProductBulkPriceUpdate):
+        """Build the new-price SQL expression so the whole rule runs inside the database."""
+        if data.adjustment_type == PriceAdjustmentType.PERCENTAGE:
+            new_price = Product.price * (1 + data.value / 100.0)
+        else:
+            new_price = Product.price + data.value
+
+        if data.round_to:
+            new_price = func.round(new_price / data.round_to) * data.round_to
+
+        if data.price_ending is not None:
+            # Largest price <= new_price that ends in price_ending (e.g. 1300 → 1299.99)
+            new_price = cast(new_price - data.price_ending, Integer) + data.price_ending
+
+        new_price = case((new_price < 0, 0.0), else_=new_price)
+        return func.round(new_price, 2)
+
+    @staticmethod
+    def bulk_update_prices(
+        db: Session,
+        data: ProductBulkPriceUpdate,
+        preview_limit: int = 50,
+    ) -> dict:
+        filters = ProductService._bulk_price_filters(db, data)
+        new_price = ProductService._bulk_price_expression(data)
+
+        matched = db.query(func.count(Product.id)).filter(*filters).scalar() or 0
+
+        if data.dry_run:
+            rows = db.execute(
+                select(
+                    Product.id,
+                    Product.sku,
+                    Product.name,
+                    Product.currency,
+                    Product.price.label("old_price"),
+                    new_price.label("new_price"),
+                )
+                .where(*filters)
+                .order_by(Product.id)
+                .limit(preview_limit)
+            ).mappings().all()
+
+            return {
+                "dry_run": True,
+                "matched": matched,
+                "updated": 0,
+                "preview": [dict(r) for r in rows],
+            }
+
+        # Ids are only needed to re-check smart collection price rules
+        affected_ids = list(db.execute(select(Product.id).where(*filters)).scalars())
+
+        result = db.execute(
+            update(Product)
+            .where(*filters)
+            .values(price=new_price, updated_at=utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        CollectionService.sync_products(db, affected_ids)
+
+        # One invalidation for the whole batch, published after commit
+        publish_after_commit(db, PRICES_CHANGED)
+        publish_after_commit(db, CATALOG_CHANGED)
+        db.commit()
+
+        return {
+            "dry_run": False,
+            "matched": matched,
+            "updated": result.rowcount or 0,
+            "preview": [],
+        }
+
     @staticmethod
     def list_store_products(
         db: Session,
@@ -377,6 +1005,7 @@ class ProductService:
         category: Optional[str] = None,
         skip: int = 0,
         limit: int = 20,
+        sort: str = "newest",
     ):
 
         query = db.query(Product).filter(Product.is_active == True)
@@ -394,7 +1023,13 @@ class ProductService:
                 )
             )
 
-        query = query.order_by(Product.created_at.desc())
+        # Rating sort reads the maintained aggregates (ix_products_active_rating)
+        if sort == "rating":
+            query = query.order_by(
+                Product.rating.desc(), Product.rating_count.desc(), Product.id.desc()
+            )
+        else:
+            query = query.order_by(Product.created_at.desc())
         query = query.offset(skip).limit(limit)
 
         return query.all()
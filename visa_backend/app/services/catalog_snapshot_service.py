@@ -0,0 +1,220 @@
+# app/services/catalog_snapshot_service.py
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import CATALOG_CHANGED, Debouncer, subscribe
+from app.models.catalog import Product, Collection, product_collection_table
+from app.schemas.catalog import ProductRead
+from app.utils.common import utcnow
+
+try:
+    import brotli
+except ImportError:  # optional — the .br variant is skipped without it
+    brotli = None
+
+MANIFEST_NAME = "current.json"
+
+
+class CatalogSnapshotService:
+    """
+    Writes the active catalog as versioned, pre-compressed JSON files so the
+    storefront can bootstrap from a static file instead of the live API.
+    """
+
+    _lock = threading.Lock()
+    _current: Optional[dict] = None
+    _debouncer: Optional[Debouncer] = None
+
+    # -----------------------------------------------------
+    # BUILD
+    # -----------------------------------------------------
+    @staticmethod
+    def build_payload(db: Session) -> dict:
+        products = (
+            db.query(Product)
+            .filter(Product.is_active == True)
+            .order_by(Product.id)
+            .all()
+        )
+        active_ids = {p.id for p in products}
+
+        collections = (
+            db.query(Collection)
+            .filter(Collection.is_active == True)
+            .order_by(Collection.id)
+            .all()
+        )
+
+        # Membership straight from the association table
+        links = defaultdict(list)
+        for collection_id, product_id in db.execute(
+            select(
+                product_collection_table.c.collection_id,
+                product_collection_table.c.product_id,
+            ).order_by(product_collection_table.c.product_id)
+        ):
+            if product_id in active_ids:
+                links[collection_id].append(product_id)
+
+        categories = defaultdict(list)
+        for p in products:
+            categories[p.category].append(p.id)
+
+        return {
+            "products": [
+                ProductRead.model_validate(p).model_dump(mode="json") for p in products
+            ],
+            "collections": [
+                {
+                    "id": c.id,
+                    "name": c.name,
+                    "slug": c.slug,
+                    "description": c.description,
+                    "show_on_landing": c.show_on_landing,
+                    "product_ids": links.get(c.id, []),
+                }
+                for c in collections
+            ],
+            "categories": dict(sorted(categories.items())),
+        }
+
+    # -----------------------------------------------------
+    # WRITE
+    # -----------------------------------------------------
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def generate(db: Session) -> dict:
+        """Write a new snapshot version if the catalog content changed."""
+        payload = CatalogSnapshotService.build_payload(db)
+        content = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+        version = hashlib.sha256(content).hexdigest()[:16]
+
+        with CatalogSnapshotService._lock:
+            current = CatalogSnapshotService.get_current()
+            if current and current["version"] == version:
+                return current
+
+            directory = settings.CATALOG_SNAPSHOT_DIR
+            os.makedirs(directory, exist_ok=True)
+
+            generated_at = utcnow().isoformat()
+            body = json.dumps(
+                {"version": version, "generated_at": generated_at, **payload},
+                separators=(",", ":"),
+            ).encode()
+
+            files = {"identity": f"catalog-{version}.json"}
+            CatalogSnapshotService._write_atomic(os.path.join(directory, files["identity"]), body)
+
+            files["gzip"] = f"catalog-{version}.json.gz"
+            CatalogSnapshotService._write_atomic(
+                os.path.join(directory, files["gzip"]),
+                gzip.compress(body, compresslevel=9, mtime=0),
+            )
+
+            if brotli is not None:
+                files["br"] = f"catalog-{version}.json.br"
+                CatalogSnapshotService._write_atomic(
+                    os.path.join(directory, files["br"]),
+                    brotli.compress(body, quality=11),
+                )
+
+            manifest = {"version": version, "generated_at": generated_at, "files": files}
+            CatalogSnapshotService._write_atomic(
+                os.path.join(directory, MANIFEST_NAME), json.dumps(manifest).encode()
+            )
+
+            CatalogSnapshotService._current = manifest
+            CatalogSnapshotService._prune(directory)
+
+            return manifest
+
+    @staticmethod
+    def _prune(directory: str) -> None:
+        """Keep the newest few versions so clients holding an older ETag can still fetch it."""
+        mtimes = {}
+        for name in os.listdir(directory):
+            if name.startswith("catalog-") and name.endswith(".json"):
+                mtimes[name[len("catalog-"):-len(".json")]] = os.path.getmtime(
+                    os.path.join(directory, name)
+                )
+        newest = sorted(mtimes, key=mtimes.get, reverse=True)
+        keep = set(newest[: settings.CATALOG_SNAPSHOT_KEEP_VERSIONS])
+        keep.add(CatalogSnapshotService._current["version"])
+
+        for name in os.listdir(directory):
+            if not name.startswith("catalog-"):
+                continue
+            version = name[len("catalog-"):].split(".", 1)[0]
+            if version not in keep:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    continue
+
+    # -----------------------------------------------------
+    # READ
+    # -----------------------------------------------------
+    @staticmethod
+    def get_current() -> Optional[dict]:
+        if CatalogSnapshotService._current is None:
+            path = os.path.join(settings.CATALOG_SNAPSHOT_DIR, MANIFEST_NAME)
+            try:
+                with open(path, "rb") as fh:
+                    CatalogSnapshotService._current = json.loads(fh.read())
+            except (OSError, ValueError):
+                return None
+        return CatalogSnapshotService._current
+
+    @staticmethod
+    def resolve_file(version: str, encoding: str) -> Optional[str]:
+        """Absolute path of a snapshot file, or None if it is not on disk."""
+        suffix = {"identity": ".json", "gzip": ".json.gz", "br": ".json.br"}[encoding]
+        path = os.path.join(settings.CATALOG_SNAPSHOT_DIR, f"catalog-{version}{suffix}")
+        return path if os.path.isfile(path) else None
+
+    # -----------------------------------------------------
+    # LIFECYCLE
+    # -----------------------------------------------------
+    @staticmethod
+    def regenerate() -> None:
+        from app.db.session import SessionLocal
+
+        db = SessionLocal()
+        try:
+            CatalogSnapshotService.generate(db)
+        finally:
+            db.close()
+
+    @staticmethod
+    def register() -> None:
+        """Regenerate (debounced) whenever catalog writes are committed."""
+        if CatalogSnapshotService._debouncer is None:
+            CatalogSnapshotService._debouncer = Debouncer(
+                CatalogSnapshotService.regenerate,
+                settings.CATALOG_SNAPSHOT_DEBOUNCE_SECONDS,
+            )
+            subscribe(CATALOG_CHANGED, CatalogSnapshotService._debouncer)
+
+        if CatalogSnapshotService.get_current() is None:
+            CatalogSnapshotService.regenerate()
+        else:
+            CatalogSnapshotService._debouncer()
@@ -1,15 +1,21 @@
 # app/services/inventory_service.py
 
 from __future__ import annotations
+from datetime import datetime, timedelta
 from typing import List, Optional
 
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import DateTime, delete, func, insert, literal, select, tuple_, update
 
-from app.models.catalog import Product
-from app.models.inventory import Inventory
-from app.schemas.inventory import InventoryCreate
+from app.core.config import settings
+from app.models.catalog import Product, ProductSizeStock
+from app.models.inventory import Inventory, InventoryArchive, InventoryCheckpoint
+from app.models.stock import ProductStockSummary
+from app.models.user import User
+from app.schemas.inventory import InventoryCreate, InventoryBulkAdjust
+from app.services.stock_service import StockService
+from app.utils.common import utcnow, encode_cursor, decode_cursor
 
 
 class InventoryService:
@@ -19,33 +25,186 @@ class InventoryService:
     # ---------------------------------------------------------
     @staticmethod
     def create_movement(db: Session, data: InventoryCreate) -> Inventory:
-        product = db.query(Product).filter(Product.id == data.product_id).first()
-        if not product:
+        exists = db.query(Product.id).filter(Product.id == data.product_id).first()
+        if not exists:
             raise HTTPException(status_code=404, detail="Product not found")
 
-        # Log movement
-        movement = Inventory(
-            product_id=data.product_id,
-            previous_quantity=data.previous_quantity,
-            change=data.change,
-            new_quantity=data.new_quantity,
-            reason=data.reason,
-            note=data.note,
-            performed_by_id=data.performed_by_id,
-        )
-
-        # Update product stock
-        product.sizes = product.sizes  # untouched unless needed
-        product.stock = data.new_quantity
+        if data.size is not None:
+            # Apply the change to the size's stock and log the actual quantities
+            movement = StockService.adjust(
+                db,
+                product_id=data.product_id,
+                size=data.size,
+                change=data.change,
+                reason=data.reason,
+                performed_by_id=data.performed_by_id,
+                note=data.note,
+            )
+            StockService.after_change(db, [data.product_id])
+        else:
+            # Log-only movement (no size → stock untouched)
+            movement = Inventory(
+                product_id=data.product_id,
+                previous_quantity=data.previous_quantity,
+                change=data.change,
+                new_quantity=data.new_quantity,
+                reason=data.reason,
+                note=data.note,
+                performed_by_id=data.performed_by_id,
+            )
+            db.add(movement)
 
-        db.add(movement)
-        db.add(product)
         db.commit()
         db.refresh(movement)
         return movement
 
     # ---------------------------------------------------------
-    # GET INVENTORY MOVEMENTS — LATEST FIRST
+    # BULK ADJUSTMENT (ONE TRANSACTION, BATCHED WRITES)
+    # ---------------------------------------------------------
+    @staticmethod
+    def bulk_adjust(db: Session, data: InventoryBulkAdjust, performed_by_id: Optional[int] = None) -> dict:
+        """
+        Apply deltas / counted quantities per (sku, size).
+
+        Products and current stock are read with one query each and lines are
+        resolved in order (repeated keys stack). Each size is then updated
+        once with its summed delta, guarded on the live quantity as in
+        ``StockService.adjust``, and the ledger rows are built from the
+        quantity the UPDATE returned. A size that a concurrent write left
+        too low fails all of its lines. Invalid lines are reported and
+        skipped; the rest commit together.
+        """
+        skus = {line.sku for line in data.lines}
+        product_ids = dict(
+            db.execute(select(Product.sku, Product.id).where(Product.sku.in_(skus))).all()
+        )
+
+        rows = db.execute(
+            select(
+                ProductSizeStock.id,
+                ProductSizeStock.product_id,
+                ProductSizeStock.size,
+                ProductSizeStock.quantity,
+                ProductSizeStock.reorder_point,
+            ).where(ProductSizeStock.product_id.in_(set(product_ids.values())))
+        )
+        stock = {(r.product_id, r.size): (r.id, r.quantity, r.reorder_point) for r in rows}
+
+        running = {}  # (product_id, size) → quantity after the lines so far
+        pending = {}  # (product_id, size) → [(result, change)] to apply
+        results = []
+        now = utcnow()
+
+        for index, line in enumerate(data.lines):
+            result = {"line": index, "sku": line.sku, "size": line.size}
+            results.append(result)
+
+            if (line.change is None) == (line.quantity is None):
+                result.update(status="error", detail="Provide exactly one of change or quantity")
+                continue
+
+            product_id = product_ids.get(line.sku)
+            if product_id is None:
+                result.update(status="error", detail="Product not found")
+                continue
+
+            key = (product_id, line.size)
+            if key not in stock:
+                result.update(status="error", detail=f"Size '{line.size}' not found")
+                continue
+
+            previous = running.get(key, stock[key][1])
+            change = line.change if line.change is not None else line.quantity - previous
+            new_quantity = previous + change
+
+            if new_quantity < 0:
+                result.update(
+                    status="error",
+                    previous_quantity=previous,
+                    detail=f"Resulting quantity would be negative ({new_quantity})",
+                )
+                continue
+
+            if change == 0:
+                result.update(
+                    status="unchanged", previous_quantity=previous, change=0, new_quantity=previous
+                )
+                continue
+
+            running[key] = new_quantity
+            pending.setdefault(key, []).append((result, change))
+
+        # Relative deltas, so concurrent checkouts are never overwritten. The
+        # guard uses the lowest running total, so no ledger row goes negative.
+        table = ProductSizeStock.__table__
+        movements, crossings, conflicts = [], [], []
+        for key, lines in pending.items():
+            delta = lowest = 0
+            for _, change in lines:
+                delta += change
+                lowest = min(lowest, delta)
+
+            row = db.execute(
+                update(table)
+                .where(table.c.id == stock[key][0], table.c.quantity + lowest >= 0)
+                .values(quantity=table.c.quantity + delta)
+                .returning(table.c.quantity, table.c.reorder_point)
+            ).first()
+            if row is None:
+                conflicts.append(key)
+                continue
+
+            quantity = row.quantity - delta
+            for result, change in lines:
+                result.update(
+                    status="applied",
+                    previous_quantity=quantity,
+                    change=change,
+                    new_quantity=quantity + change,
+                )
+                movements.append({
+                    "product_id": key[0],
+                    "size": key[1],
+                    "previous_quantity": quantity,
+                    "change": change,
+                    "new_quantity": quantity + change,
+                    "reason": data.reason,
+                    "note": data.note,
+                    "performed_by_id": performed_by_id,
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+                crossings.append((key[0], key[1], quantity, quantity + change, row.reorder_point))
+                quantity += change
+
+        if conflicts:
+            current = StockService.get_quantities(db, conflicts)
+            for key in conflicts:
+                for result, _ in pending[key]:
+                    result.update(
+                        status="error",
+                        previous_quantity=current.get(key),
+                        detail="Stock changed during the adjustment; resulting quantity would be negative",
+                    )
+
+        if movements:
+            db.execute(insert(Inventory), movements)
+            StockService.record_crossings(db, crossings)
+            StockService.after_change(db, sorted({m["product_id"] for m in movements}))
+
+        db.commit()
+
+        statuses = [r["status"] for r in results]
+        return {
+            "applied": statuses.count("applied"),
+            "unchanged": statuses.count("unchanged"),
+            "errors": statuses.count("error"),
+            "results": results,
+        }
+
+    # ---------------------------------------------------------
+    # GET INVENTORY MOVEMENTS — LATEST FIRST (HOT TAIL ONLY)
     # ---------------------------------------------------------
     @staticmethod
     def list_movements(
@@ -53,12 +212,218 @@ class InventoryService:
     ) -> List[Inventory]:
         return (
             db.query(Inventory)
-            .order_by(Inventory.created_at.desc())
+            .order_by(Inventory.created_at.desc(), Inventory.id.desc())
             .offset(offset)
             .limit(limit)
             .all()
         )
 
+    # ---------------------------------------------------------
+    # LEDGER QUERY — FILTERED, KEYSET-PAGINATED, LATEST FIRST
+    # ---------------------------------------------------------
+    @staticmethod
+    def query_ledger(
+            db: Session,
+            product_id: Optional[int] = None,
+            size: Optional[str] = None,
+            reason: Optional[str] = None,
+            performed_by_id: Optional[int] = None,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+            limit: int = 50,
+            cursor: Optional[str] = None,
+    ) -> dict:
+        """
+        Hot ledger rows (archived rows live in ``inventory_archive``) with the
+        product name / sku and performer name joined in as plain columns.
+        Each filter has a matching (column, created_at, id) index.
+        """
+        query = (
+            select(
+                Inventory.id,
+                Inventory.created_at,
+                Inventory.product_id,
+                Product.name.label("product_name"),
+                Product.sku.label("product_sku"),
+                Inventory.size,
+                Inventory.previous_quantity,
+                Inventory.change,
+                Inventory.new_quantity,
+                Inventory.reason,
+                Inventory.note,
+                Inventory.performed_by_id,
+                User.full_name.label("performed_by_name"),
+            )
+            .outerjoin(Product, Product.id == Inventory.product_id)
+            .outerjoin(User, User.id == Inventory.performed_by_id)
+        )
+
+        if product_id is not None:
+            query = query.where(Inventory.product_id == product_id)
+        if size is not None:
+            query = query.where(Inventory.size == size)
+        if reason is not None:
+            query = query.where(Inventory.reason == reason)
+        if performed_by_id is not None:
+            query = query.where(Inventory.performed_by_id == performed_by_id)
+        if date_from is not None:
+            query = query.where(Inventory.created_at >= date_from)
+        if date_to is not None:
+            query = query.where(Inventory.created_at < date_to)
+
+        # Keyset: continue strictly before the (created_at, id) of the previous page
+        if cursor:
+            try:
+                created_at, last_id = decode_cursor(cursor)
+                created_at = datetime.fromisoformat(created_at)
+                last_id = int(last_id)
+            except (ValueError, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+            query = query.where(tuple_(Inventory.created_at, Inventory.id) < (created_at, last_id))
+
+        rows = db.execute(
+            query.order_by(Inventory.created_at.desc(), Inventory.id.desc()).limit(limit + 1)
+        ).all()
+        page = rows[:limit]
+
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+
+        return {
+            "items": [row._asdict() for row in page],
+            "next_cursor": next_cursor,
+        }
+
+    # ---------------------------------------------------------
+    # LEDGER COMPACTION (CHECKPOINT + ARCHIVE OLD ROWS)
+    # ---------------------------------------------------------
+    @staticmethod
+    def _checkpoint_batch(db: Session, checkpoints: dict, lower: int, upper: int) -> set:
+        """
+        Fold ledger rows with lower < id <= upper into the per-(product, size)
+        checkpoints; returns the keys that were updated.
+        """
+        window = (Inventory.id > lower, Inventory.id <= upper)
+
+        grouped = (
+            select(
+                func.max(Inventory.id).label("last_id"),
+                func.count().label("movements"),
+                func.sum(Inventory.change).label("net_change"),
+            )
+            .where(*window)
+            .group_by(Inventory.product_id, Inventory.size)
+            .subquery()
+        )
+        rows = db.execute(
+            select(
+                Inventory.product_id,
+                Inventory.size,
+                Inventory.new_quantity,
+                Inventory.created_at,
+                grouped.c.last_id,
+                grouped.c.movements,
+                grouped.c.net_change,
+            ).join(grouped, grouped.c.last_id == Inventory.id)
+        ).all()
+
+        for r in rows:
+            checkpoint = checkpoints.get((r.product_id, r.size))
+            if checkpoint is None:
+                checkpoint = InventoryCheckpoint(
+                    product_id=r.product_id,
+                    size=r.size,
+                    movement_count=0,
+                    net_change=0,
+                )
+                checkpoints[(r.product_id, r.size)] = checkpoint
+                db.add(checkpoint)
+
+            checkpoint.quantity = r.new_quantity
+            checkpoint.movement_count += r.movements
+            checkpoint.net_change += int(r.net_change or 0)
+            checkpoint.last_inventory_id = r.last_id
+            checkpoint.as_of = r.created_at
+
+        return {(r.product_id, r.size) for r in rows}
+
+    @staticmethod
+    def compact_ledger(
+            db: Session,
+            older_than_days: int = settings.INVENTORY_HOT_DAYS,
+            batch_size: int = settings.INVENTORY_ARCHIVE_BATCH,
+            dry_run: bool = False,
+    ) -> dict:
+        """
+        Move every ledger row up to the newest one older than the cutoff into
+        ``inventory_archive``, folding it into the checkpoints first.
+
+        Each batch (checkpoint update + copy + delete) commits on its own, so
+        an interrupted run loses nothing and can simply be started again.
+        """
+        cutoff = utcnow() - timedelta(days=older_than_days)
+        result = {"cutoff": cutoff, "archived": 0, "checkpoints": 0, "dry_run": dry_run}
+
+        boundary = (
+            db.query(func.max(Inventory.id))
+            .filter(Inventory.created_at < cutoff)
+            .scalar()
+        )
+        if boundary is None:
+            return result
+
+        if dry_run:
+            keys = (
+                select(func.count().label("movements"))
+                .where(Inventory.id <= boundary)
+                .group_by(Inventory.product_id, Inventory.size)
+                .subquery()
+            )
+            row = db.execute(select(func.sum(keys.c.movements), func.count())).one()
+            result["archived"], result["checkpoints"] = int(row[0] or 0), row[1]
+            return result
+
+        checkpoints = {
+            (c.product_id, c.size): c for c in db.query(InventoryCheckpoint).all()
+        }
+        updated = set()
+
+        ledger_columns = [c.name for c in Inventory.__table__.columns]
+        archived_at = literal(utcnow(), DateTime(timezone=True))
+
+        lower = 0
+        while True:
+            ids = db.scalars(
+                select(Inventory.id)
+                .where(Inventory.id > lower, Inventory.id <= boundary)
+                .order_by(Inventory.id)
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                break
+
+            upper = ids[-1]
+            updated |= InventoryService._checkpoint_batch(db, checkpoints, lower, upper)
+            db.flush()
+
+            window = (Inventory.id > lower, Inventory.id <= upper)
+            db.execute(
+                insert(InventoryArchive).from_select(
+                    ledger_columns + ["archived_at"],
+                    select(*Inventory.__table__.columns, archived_at).where(*window),
+                )
+            )
+            db.execute(delete(Inventory).where(*window))
+            db.commit()
+
+            result["archived"] += len(ids)
+            lower = upper
+
+        result["checkpoints"] = len(updated)
+        return result
+
     # ---------------------------------------------------------
     # METRICS
     # ---------------------------------------------------------
@@ -67,22 +432,26 @@ class InventoryService:
         # Total products
         total_products = db.query(func.count(Product.id)).scalar() or 0
 
-        # Total stock across all inventory entries
-        total_stock = db.query(func.sum(Inventory.new_quantity)).scalar() or 0
+        # Units currently in stock (one summary row per product)
+        total_stock = db.query(func.sum(ProductStockSummary.total_units)).scalar() or 0
 
-        # Group by product → sum(stock)
-        product_stock = (
-            db.query(
-                Inventory.product_id,
-                func.sum(Inventory.new_quantity).label("total_stock")
+        # Both counts are served by the (is_low_stock, total_units) index
+        low_stock_items = (
+            db.query(func.count(ProductStockSummary.id))
+            .filter(ProductStockSummary.is_low_stock == True)
+            .scalar()
+            or 0
+        )
+        out_of_stock_items = (
+            db.query(func.count(ProductStockSummary.id))
+            .filter(
+                ProductStockSummary.is_low_stock == False,
+                ProductStockSummary.total_units <= 0,
             )
-            .group_by(Inventory.product_id)
-            .all()
+            .scalar()
+            or 0
         )
 
-        low_stock_items = sum(1 for p in product_stock if 0 < p.total_stock < 5)
-        out_of_stock_items = sum(1 for p in product_stock if p.total_stock <= 0)
-
         return {
             "total_products": total_products,
             "total_stock": int(total_stock),
@@ -94,55 +463,91 @@ class InventoryService:
     # GET LOW STOCK PRODUCTS
     # ---------------------------------------------------------
     @staticmethod
-    def get_low_stock_products(
-            db: Session, threshold: int = 5
-    ) -> List[dict]:
-        products = db.query(Product).all()
+    def _size_rows_by_product(db: Session, *conditions) -> dict:
+        """Matching size rows grouped per product, with product columns and total stock."""
+        rows = db.execute(
+            select(
+                Product.id,
+                Product.name,
+                Product.sku,
+                Product.category,
+                ProductSizeStock.size,
+                ProductSizeStock.quantity,
+                ProductStockSummary.total_units,
+            )
+            .join(Product, Product.id == ProductSizeStock.product_id)
+            .outerjoin(ProductStockSummary, ProductStockSummary.product_id == Product.id)
+            .where(*conditions)
+            .order_by(Product.id, ProductSizeStock.id)
+        ).all()
 
-        low_stock_list = []
+        grouped = {}
+        for r in rows:
+            entry = grouped.setdefault(
+                r.id,
+                {
+                    "id": r.id,
+                    "name": r.name,
+                    "sku": r.sku,
+                    "category": r.category,
+                    "sizes": {},
+                    "total_stock": int(r.total_units or 0),
+                },
+            )
+            entry["sizes"][r.size] = r.quantity
+        return grouped
 
-        for p in products:
-            if not isinstance(p.sizes, dict):
-                continue
+    @staticmethod
+    def _flagged_product_ids(flag_column):
+        """Products whose summary flags at least one matching size (indexed)."""
+        return select(ProductStockSummary.product_id).where(flag_column > 0)
 
-            # Find sizes below threshold (but > 0)
-            low_sizes = {
-                size: qty
-                for size, qty in p.sizes.items()
-                if isinstance(qty, int) and 0 < qty < threshold
-            }
+    @staticmethod
+    def get_low_stock_products(db: Session, threshold: Optional[int] = None) -> List[dict]:
+        # Sizes below threshold (but > 0)
+        conditions = [ProductSizeStock.quantity > 0]
+        if threshold is None:
+            # Per-size reorder points are materialized: only flagged products are read
+            conditions += [
+                ProductSizeStock.quantity < StockService.reorder_level(),
+                ProductSizeStock.product_id.in_(
+                    InventoryService._flagged_product_ids(ProductStockSummary.low_stock_size_count)
+                ),
+            ]
+        else:
+            conditions.append(ProductSizeStock.quantity < threshold)
 
-            if low_sizes:
-                low_stock_list.append({
-                    "id": p.id,
-                    "name": p.name,
-                    "sku": p.sku,
-                    "category": p.category,
-                    "low_sizes": low_sizes,  # 👈 sizes that are running low
-                    "total_stock": sum(p.sizes.values())
-                })
+        grouped = InventoryService._size_rows_by_product(db, *conditions)
 
-        return low_stock_list
+        return [
+            {
+                "id": p["id"],
+                "name": p["name"],
+                "sku": p["sku"],
+                "category": p["category"],
+                "low_sizes": p["sizes"],  # 👈 sizes that are running low
+                "total_stock": p["total_stock"],
+            }
+            for p in grouped.values()
+        ]
 
     @staticmethod
     def get_out_of_stock_products(db: Session) -> List[dict]:
-        products = db.query(Product).all()
-        out = []
-
-        for p in products:
-            zero_sizes = {
-                size: qty
-                for size, qty in p.sizes.items()
-                if isinstance(qty, int) and qty == 0
-            }
-
-            if zero_sizes:
-                out.append({
-                    "id": p.id,
-                    "name": p.name,
-                    "sku": p.sku,
-                    "category": p.category,
-                    "out_of_stock_sizes": zero_sizes,
-                })
+        grouped = InventoryService._size_rows_by_product(
+            db,
+            ProductSizeStock.quantity <= 0,
+            ProductSizeStock.product_id.in_(
+                InventoryService._flagged_product_ids(ProductStockSummary.out_of_stock_size_count)
+            ),
+        )
 
-        return out
+        return [
+            {
+                "id": p["id"],
+                "name": p["name"],
+                "sku": p["sku"],
+                "category": p["category"],
+                "out_of_stock_sizes": p["sizes"],
+            }
+            for p in grouped.values()
+        ]
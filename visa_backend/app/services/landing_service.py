@@ -0,0 +1,131 @@
+# app/services/landing_service.py
+
+from __future__ import annotations
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import MemoryCache
+from app.core.config import settings
+from app.core.events import CATALOG_CHANGED, subscribe
+from app.models.catalog import Collection, Product, product_collection_table
+from app.schemas.catalog import LandingPage
+
+
+class LandingService:
+    """
+    Store landing page: every ``show_on_landing`` collection with its first
+    N products (merchandiser order), built with two queries and cached until
+    the catalog changes.
+    """
+
+    cache = MemoryCache("store_landing", max_entries=16, ttl=settings.LANDING_CACHE_TTL_SECONDS)
+    _registered = False
+    # Bumped on every invalidation so a build that raced a catalog write is not cached
+    _generation = 0
+
+    @staticmethod
+    def build(db: Session, per_collection: int) -> LandingPage:
+        collections = db.execute(
+            select(
+                Collection.id,
+                Collection.name,
+                Collection.slug,
+                Collection.description,
+                Collection.product_count,
+            )
+            .where(Collection.is_active == True, Collection.show_on_landing == True)
+            .order_by(Collection.created_at.desc())
+        ).all()
+
+        if not collections:
+            return LandingPage()
+
+        # Top-N per collection in one query: rank links inside each collection
+        link = product_collection_table
+        ranked = (
+            select(
+                link.c.collection_id,
+                Product.id,
+                Product.name,
+                Product.slug,
+                Product.price,
+                Product.currency,
+                Product.category,
+                Product.rating,
+                Product.rating_count,
+                Product.images,
+                func.row_number()
+                .over(
+                    partition_by=link.c.collection_id,
+                    order_by=(link.c.position, link.c.product_id),
+                )
+                .label("rank"),
+            )
+            .join(Product, Product.id == link.c.product_id)
+            .where(
+                link.c.collection_id.in_([c.id for c in collections]),
+                Product.is_active == True,
+            )
+            .subquery()
+        )
+        rows = db.execute(
+            select(ranked)
+            .where(ranked.c.rank <= per_collection)
+            .order_by(ranked.c.collection_id, ranked.c.rank)
+        ).mappings().all()
+
+        products_by_collection = {c.id: [] for c in collections}
+        for row in rows:
+            images = row["images"] or []
+            products_by_collection[row["collection_id"]].append(
+                {
+                    "id": row["id"],
+                    "name": row["name"],
+                    "slug": row["slug"],
+                    "price": row["price"],
+                    "currency": row["currency"],
+                    "category": row["category"],
+                    "rating": row["rating"] or 0.0,
+                    "rating_count": row["rating_count"] or 0,
+                    "image": images[0] if images else None,
+                }
+            )
+
+        return LandingPage.model_validate(
+            {
+                "collections": [
+                    {
+                        "id": c.id,
+                        "name": c.name,
+                        "slug": c.slug,
+                        "description": c.description,
+                        "product_count": c.product_count or 0,
+                        "products": products_by_collection[c.id],
+                    }
+                    for c in collections
+                ]
+            }
+        )
+
+    @staticmethod
+    def get(db: Session, per_collection: int = settings.LANDING_PRODUCTS_PER_COLLECTION) -> LandingPage:
+        page = LandingService.cache.get(per_collection)
+        if page is None:
+            generation = LandingService._generation
+            page = LandingService.build(db, per_collection)
+            if generation == LandingService._generation:
+                LandingService.cache.set(per_collection, page)
+        return page
+
+    @staticmethod
+    def invalidate(**_payload) -> None:
+        LandingService._generation += 1
+        LandingService.cache.clear()
+
+    @staticmethod
+    def register() -> None:
+        """Drop the cached landing page whenever a collection or product write commits."""
+        if not LandingService._registered:
+            subscribe(CATALOG_CHANGED, LandingService.invalidate)
+            LandingService._registered = True
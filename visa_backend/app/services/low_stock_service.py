@@ -0,0 +1,177 @@
+# app/services/low_stock_service.py
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.catalog import Product, ProductSizeStock
+from app.models.stock import LowStockEvent
+from app.utils.common import utcnow
+
+
+class LowStockAlertService:
+    """
+    Turns pending LowStockEvents (recorded by StockService at write time)
+    into digest files in LOW_STOCK_OUTBOX_DIR, one entry per product size.
+    """
+
+    # -----------------------------------------------------
+    # PENDING EVENTS
+    # -----------------------------------------------------
+    @staticmethod
+    def list_pending(db: Session, limit: int = 100) -> List[LowStockEvent]:
+        return (
+            db.query(LowStockEvent)
+            .filter(LowStockEvent.digested_at.is_(None))
+            .order_by(LowStockEvent.id)
+            .limit(limit)
+            .all()
+        )
+
+    # -----------------------------------------------------
+    # DIGEST
+    # -----------------------------------------------------
+    @staticmethod
+    def build_digest(db: Session, batch_size: int = settings.LOW_STOCK_DIGEST_BATCH) -> Optional[dict]:
+        """
+        Collect every pending event into one digest file, then mark the
+        events digested. Returns the digest, or None when nothing is pending.
+
+        The file is written before the events are marked, so a crash in
+        between re-sends them next time rather than losing them.
+        """
+        entries = {}
+        last_id = 0
+        events = 0
+
+        while True:
+            rows = db.execute(
+                select(
+                    LowStockEvent.id,
+                    LowStockEvent.product_id,
+                    LowStockEvent.size,
+                    LowStockEvent.kind,
+                    LowStockEvent.reorder_point,
+                    LowStockEvent.created_at,
+                )
+                .where(LowStockEvent.digested_at.is_(None), LowStockEvent.id > last_id)
+                .order_by(LowStockEvent.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            for event in rows:
+                key = (event.product_id, event.size)
+                entry = entries.get(key)
+                if entry is None:
+                    entry = entries[key] = {
+                        "product_id": event.product_id,
+                        "size": event.size,
+                        "occurrences": 0,
+                        "first_detected_at": event.created_at.isoformat(),
+                    }
+                entry.update(
+                    kind=event.kind,
+                    reorder_point=event.reorder_point,
+                    last_detected_at=event.created_at.isoformat(),
+                )
+                entry["occurrences"] += 1
+
+            events += len(rows)
+            last_id = rows[-1].id
+
+        if not entries:
+            return None
+
+        # Current stock and display fields, one query for the whole digest
+        product_ids = {product_id for product_id, _ in entries}
+        current = db.execute(
+            select(Product.id, Product.sku, Product.name, ProductSizeStock.size, ProductSizeStock.quantity)
+            .join(ProductSizeStock, ProductSizeStock.product_id == Product.id)
+            .where(Product.id.in_(product_ids))
+        ).all()
+        for r in current:
+            entry = entries.get((r.id, r.size))
+            if entry is not None:
+                entry.update(sku=r.sku, name=r.name, quantity=r.quantity)
+
+        now = utcnow()
+        digest = {
+            "generated_at": now.isoformat(),
+            "events": events,
+            "out_of_stock": sum(1 for e in entries.values() if e["kind"] == "out"),
+            "low_stock": sum(1 for e in entries.values() if e["kind"] == "low"),
+            "items": sorted(entries.values(), key=lambda e: (e["kind"] != "out", e["product_id"], e["size"])),
+        }
+
+        directory = settings.LOW_STOCK_OUTBOX_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"low-stock-{now:%Y%m%dT%H%M%S}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(digest, fh, indent=2)
+        os.replace(tmp_path, path)
+
+        db.execute(
+            update(LowStockEvent)
+            .where(LowStockEvent.digested_at.is_(None), LowStockEvent.id <= last_id)
+            .values(digested_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+        digest["file"] = path
+        return digest
+
+
+# =====================================================================
+#                      PERIODIC DIGEST WRITER
+# =====================================================================
+
+
+class LowStockDigester:
+    """Background thread that writes a low-stock digest every interval."""
+
+    def __init__(self, interval: float = settings.LOW_STOCK_DIGEST_SECONDS):
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> Optional[dict]:
+        from app.db.session import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return LowStockAlertService.build_digest(db)
+        except Exception:
+            db.rollback()
+            return None
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.run_once()
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="low-stock-digester", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+low_stock_digester = LowStockDigester()
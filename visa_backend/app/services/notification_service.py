@@ -0,0 +1,260 @@
+# app/services/notification_service.py
+
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+from typing import List, Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import STOCK_RESTOCKED, subscribe
+from app.models.catalog import Product
+from app.models.notification import NotificationOutbox, RestockEvent
+from app.models.wishlist import Wishlist, WishlistItem
+from app.utils.common import utcnow
+
+BACK_IN_STOCK = "back_in_stock"
+
+
+class NotificationService:
+    """Writes customer notifications to the notification_outbox table."""
+
+    @staticmethod
+    def _insert_ignoring_duplicates(db: Session, rows: List[dict]) -> None:
+        """Multi-row insert that skips rows whose dedupe_key already exists."""
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            db.execute(insert(NotificationOutbox), rows)
+            return
+
+        db.execute(
+            dialect_insert(NotificationOutbox).on_conflict_do_nothing(index_elements=["dedupe_key"]),
+            rows,
+        )
+
+    @staticmethod
+    def enqueue(
+            db: Session,
+            kind: str,
+            user_ids: List[int],
+            payload: dict,
+            dedupe_scope: str,
+            daily_cap: int,
+    ) -> int:
+        """
+        Queue one ``kind`` notification per user, skipping users who already
+        have this notification (same dedupe scope) or already received
+        ``daily_cap`` notifications of this kind in the last 24 hours.
+        Returns how many rows were queued.
+        """
+        if not user_ids:
+            return 0
+
+        keys = {user_id: f"{kind}:{dedupe_scope}:{user_id}" for user_id in user_ids}
+        existing = set(
+            db.scalars(
+                select(NotificationOutbox.dedupe_key).where(
+                    NotificationOutbox.dedupe_key.in_(keys.values())
+                )
+            )
+        )
+
+        # Per-user rate cap over the last 24 hours
+        recent = dict(
+            db.execute(
+                select(NotificationOutbox.user_id, func.count())
+                .where(
+                    NotificationOutbox.user_id.in_(user_ids),
+                    NotificationOutbox.kind == kind,
+                    NotificationOutbox.created_at >= utcnow() - timedelta(days=1),
+                )
+                .group_by(NotificationOutbox.user_id)
+            ).all()
+        )
+
+        now = utcnow()
+        rows = [
+            {
+                "user_id": user_id,
+                "kind": kind,
+                "channel": "email",
+                "payload": payload,
+                "dedupe_key": key,
+                "status": "pending",
+                "attempts": 0,
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for user_id, key in keys.items()
+            if key not in existing and recent.get(user_id, 0) < daily_cap
+        ]
+        if rows:
+            NotificationService._insert_ignoring_duplicates(db, rows)
+        return len(rows)
+
+
+class BackInStockService:
+
+    # -----------------------------------------------------
+    # FAN-OUT: RESTOCK EVENT → WISHLIST SUBSCRIBERS
+    # -----------------------------------------------------
+    @staticmethod
+    def fan_out(db: Session, event: RestockEvent, chunk_size: int = settings.BACK_IN_STOCK_CHUNK_SIZE) -> int:
+        """
+        Queue a back-in-stock notification for every user who wishlisted the
+        product. Subscribers are read through the wishlist_items.product_id
+        index in keyset chunks; each chunk is committed on its own, and the
+        dedupe keys make a retried event a no-op for users already queued.
+        """
+        product = db.execute(
+            select(Product.id, Product.sku, Product.name, Product.slug, Product.is_active)
+            .where(Product.id == event.product_id)
+        ).first()
+
+        queued = 0
+        if product is not None and product.is_active:
+            payload = {"product_id": product.id, "sku": product.sku, "name": product.name, "slug": product.slug}
+            # One notification per user per product per day, however often it flaps
+            scope = f"{product.id}:{utcnow():%Y-%m-%d}"
+
+            last_item_id = 0
+            while True:
+                rows = db.execute(
+                    select(WishlistItem.id, Wishlist.user_id)
+                    .join(Wishlist, Wishlist.id == WishlistItem.wishlist_id)
+                    .where(WishlistItem.product_id == product.id, WishlistItem.id > last_item_id)
+                    .order_by(WishlistItem.id)
+                    .limit(chunk_size)
+                ).all()
+                if not rows:
+                    break
+                last_item_id = rows[-1].id
+
+                queued += NotificationService.enqueue(
+                    db,
+                    BACK_IN_STOCK,
+                    [r.user_id for r in rows],
+                    payload,
+                    dedupe_scope=scope,
+                    daily_cap=settings.BACK_IN_STOCK_USER_DAILY_CAP,
+                )
+                db.commit()
+
+        db.execute(
+            update(RestockEvent)
+            .where(RestockEvent.id == event.id)
+            .values(processed_at=utcnow(), last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return queued
+
+    @staticmethod
+    def _record_failure(db: Session, event_id: int, attempts: int, error: Exception) -> None:
+        """Count a failed fan-out; the last allowed attempt closes the event."""
+        values = {"attempts": attempts + 1, "last_error": f"{type(error).__name__}: {error}"[:500]}
+        if attempts + 1 >= settings.BACK_IN_STOCK_MAX_ATTEMPTS:
+            values["processed_at"] = utcnow()
+
+        db.execute(
+            update(RestockEvent)
+            .where(RestockEvent.id == event_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    @staticmethod
+    def process_pending(db: Session, limit: int = 100) -> int:
+        """
+        Fan out every unprocessed restock event once; returns notifications
+        queued. A failing event is recorded and skipped, so it cannot hold
+        up the events behind it; it is retried on the next pass.
+        """
+        queued = 0
+        last_id = 0
+        while True:
+            events = db.execute(
+                select(RestockEvent.id, RestockEvent.product_id, RestockEvent.attempts)
+                .where(RestockEvent.processed_at.is_(None), RestockEvent.id > last_id)
+                .order_by(RestockEvent.id)
+                .limit(limit)
+            ).all()
+            if not events:
+                return queued
+            last_id = events[-1].id
+
+            for event in events:
+                try:
+                    queued += BackInStockService.fan_out(db, event)
+                except Exception as exc:
+                    db.rollback()
+                    BackInStockService._record_failure(db, event.id, event.attempts, exc)
+
+
+# =====================================================================
+#                      BACKGROUND FAN-OUT WORKER
+# =====================================================================
+
+
+class BackInStockNotifier:
+    """
+    Processes restock events off the request path: woken right after a
+    restock commits, and polls periodically for events left by other
+    processes or an interrupted run.
+    """
+
+    def __init__(self, interval: float = settings.BACK_IN_STOCK_POLL_SECONDS):
+        self.interval = interval
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def notify(self, **_payload) -> None:
+        self._wakeup.set()
+
+    def run_once(self) -> int:
+        from app.db.session import SessionLocal
+
+        with self._lock:
+            db = SessionLocal()
+            try:
+                return BackInStockService.process_pending(db)
+            except Exception:
+                db.rollback()
+                return 0
+            finally:
+                db.close()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if not self._stopped.is_set():
+                self.run_once()
+
+    def start(self) -> None:
+        subscribe(STOCK_RESTOCKED, self.notify)
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="back-in-stock-notifier", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+back_in_stock_notifier = BackInStockNotifier()
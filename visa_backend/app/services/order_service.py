@@ -4,14 +4,15 @@ from datetime import timedelta
 from typing import List, Optional
 
 from fastapi import HTTPException
-from sqlalchemy import func
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from app.models.order import Order, OrderItem, OrderStatus
 from app.models.cart import Cart
 from app.models.catalog import Product
-from app.models.inventory import Inventory
-from app.schemas.order import OrderCreate
+from app.schemas.order import OrderCreate, PickListMark
+from app.services.cart_service import CartService
+from app.services.stock_service import StockService
 from app.utils.common import utcnow
 
 
@@ -49,23 +50,14 @@ class OrderService:
         order_items: List[OrderItem] = []
 
         # ---------------------------------------
-        # VERIFY STOCK FOR EACH CART ITEM
+        # PRICE EACH CART ITEM
         # ---------------------------------------
+        skus = {}
         for item in cart.items:
             product = db.query(Product).filter(Product.id == item.product_id).first()
             if not product:
                 raise HTTPException(status_code=400, detail=f"Invalid product: {item.product_id}")
-
-            if not isinstance(product.sizes, dict):
-                raise HTTPException(status_code=500, detail="Invalid product sizes format")
-
-            available = product.sizes.get(item.size, 0)
-
-            if available < item.quantity:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Insufficient stock for {product.sku} size {item.size}. Available: {available}",
-                )
+            skus[item.product_id] = product.sku
 
             price = product.price
             total_amount += price * item.quantity
@@ -79,6 +71,38 @@ class OrderService:
                 )
             )
 
+        # ---------------------------------------
+        # DEDUCT INVENTORY (ATOMIC, ALL OR NOTHING)
+        # ---------------------------------------
+        # Each line is one conditional UPDATE, so the stock check and the
+        # decrement cannot be interleaved by a concurrent checkout. Units held
+        # by other carts are not sellable; this cart's own holds are. Lines are
+        # taken in a fixed (product, size) order so checkouts cannot deadlock.
+        for item in sorted(cart.items, key=lambda i: (i.product_id, i.size)):
+            movement = StockService.decrement_if_available(
+                db,
+                product_id=item.product_id,
+                size=item.size,
+                quantity=item.quantity,
+                reason="order_purchase",
+                performed_by_id=user_id,
+                note=f"size={item.size}",
+                cart_id=cart.id,
+            )
+            if movement is None:
+                key, cart_id = (item.product_id, item.size), cart.id
+                db.rollback()
+                available = StockService.available_to_sell(
+                    db, [key], exclude_cart_id=cart_id
+                ).get(key, 0)
+                product_id, size = key
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Insufficient stock for {skus[product_id]} size {size}. Available: {available}",
+                )
+
+        StockService.after_change(db, list(skus))
+
         # ---------------------------------------
         # CREATE ORDER WITH ADDRESS SNAPSHOTS
         # ---------------------------------------
@@ -100,35 +124,11 @@ class OrderService:
             db.add(oi)
 
         # ---------------------------------------
-        # DEDUCT INVENTORY
-        # ---------------------------------------
-        for item in cart.items:
-            product = db.query(Product).filter(Product.id == item.product_id).first()
-            if not product:
-                continue
-
-            sizes = product.sizes or {}
-            previous_qty = sizes.get(item.size, 0)
-            new_qty = previous_qty - item.quantity
-
-            sizes[item.size] = new_qty
-            product.sizes = sizes
-
-            inventory_log = Inventory(
-                product_id=product.id,
-                previous_quantity=previous_qty,
-                change=-item.quantity,
-                new_quantity=new_qty,
-                reason="order_purchase",
-                performed_by_id=user_id,
-                note=f"size={item.size}",
-            )
-            db.add(inventory_log)
-
-        # ---------------------------------------
-        # CLEAR CART
+        # CLEAR CART (HOLDS BECAME DEDUCTIONS)
         # ---------------------------------------
+        StockService.release(db, cart.id)
         cart.items.clear()
+        CartService.bump_version(db, cart.id, cart.user_id)
 
         db.commit()
         db.refresh(order)
@@ -165,6 +165,81 @@ class OrderService:
 
         return query.order_by(Order.id.desc()).all()
 
+    # -----------------------------------------------------
+    # FULFILLMENT PICK LIST (ADMIN)
+    # -----------------------------------------------------
+    @staticmethod
+    def _pick_list_filters(
+            statuses: List[str],
+            date_from=None,
+            date_to=None,
+            max_order_id: Optional[int] = None,
+    ) -> list:
+        # Served by the (status, created_at) index
+        filters = [Order.status.in_(statuses), Order.picked_at.is_(None)]
+        if date_from is not None:
+            filters.append(Order.created_at >= date_from)
+        if date_to is not None:
+            filters.append(Order.created_at < date_to)
+        if max_order_id is not None:
+            filters.append(Order.id <= max_order_id)
+        return filters
+
+    @staticmethod
+    def get_pick_list(
+            db: Session,
+            statuses: List[str],
+            date_from=None,
+            date_to=None,
+    ) -> dict:
+        """Units to pick per (product, size) across unpicked orders, one grouped query."""
+        filters = OrderService._pick_list_filters(statuses, date_from, date_to)
+
+        totals = db.execute(
+            select(func.count(Order.id), func.max(Order.id)).where(*filters)
+        ).one()
+
+        rows = db.execute(
+            select(
+                OrderItem.product_id,
+                Product.sku,
+                Product.name,
+                OrderItem.size,
+                func.sum(OrderItem.quantity).label("quantity"),
+                func.count(func.distinct(OrderItem.order_id)).label("orders"),
+            )
+            .join(Order, Order.id == OrderItem.order_id)
+            .join(Product, Product.id == OrderItem.product_id)
+            .where(*filters, Order.id <= (totals[1] or 0))
+            .group_by(OrderItem.product_id, Product.sku, Product.name, OrderItem.size)
+            .order_by(Product.sku, OrderItem.size)
+        ).all()
+
+        return {
+            "generated_at": utcnow(),
+            "max_order_id": totals[1],
+            "order_count": totals[0],
+            "lines": [row._asdict() for row in rows],
+        }
+
+    @staticmethod
+    def mark_picked(db: Session, data: PickListMark) -> int:
+        """Stamp picked_at on every matching unpicked order in one UPDATE."""
+        filters = OrderService._pick_list_filters(
+            data.statuses, data.date_from, data.date_to, data.max_order_id
+        )
+        if data.order_ids is not None:
+            filters.append(Order.id.in_(data.order_ids))
+
+        result = db.execute(
+            update(Order)
+            .where(*filters)
+            .values(picked_at=utcnow(), updated_at=utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount or 0
+
     # -----------------------------------------------------
     # UPDATE ORDER STATUS (ADMIN)
     # -----------------------------------------------------
@@ -188,29 +263,24 @@ class OrderService:
 
         # Restore stock if order is cancelled now but wasn’t cancelled before
         if status == OrderStatus.CANCELLED and order.status != OrderStatus.CANCELLED:
+            # Sizes removed from the product since the order are not restocked
+            existing = StockService.get_quantities(
+                db, [(item.product_id, item.size) for item in order.items]
+            )
             for item in order.items:
-                product = db.query(Product).filter(Product.id == item.product_id).first()
-                if not product:
+                if (item.product_id, item.size) not in existing:
                     continue
-
-                sizes = product.sizes or {}
-                previous_qty = sizes.get(item.size, 0)
-                new_qty = previous_qty + item.quantity
-
-                sizes[item.size] = new_qty
-                product.sizes = sizes
-
-                db.add(
-                    Inventory(
-                        product_id=product.id,
-                        previous_quantity=previous_qty,
-                        change=item.quantity,
-                        new_quantity=new_qty,
-                        reason="order_cancel",
-                        note=f"size={item.size}",
-                    )
+                StockService.adjust(
+                    db,
+                    product_id=item.product_id,
+                    size=item.size,
+                    change=item.quantity,
+                    reason="order_cancel",
+                    note=f"size={item.size}",
                 )
 
+            StockService.after_change(db, [item.product_id for item in order.items])
+
         order.status = status
         db.commit()
         db.refresh(order)
@@ -0,0 +1,248 @@
+# app/services/reconciliation_service.py
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import BASE_DIR, settings
+from app.models.catalog import Product, ProductSizeStock
+from app.models.inventory import Inventory, InventoryCheckpoint
+from app.utils.common import utcnow
+
+STATE_NAME = "state.json"
+
+
+class ReconciliationService:
+    """
+    Compares per-size stock with the inventory ledger.
+
+    Products are processed in id order, one chunk at a time: the ledger rows
+    of a chunk are streamed (ordered by product, size, id) and replayed on
+    top of the size's checkpoint, or the first movement's previous quantity
+    when nothing was archived yet. Progress is written to a state file after
+    every chunk so an interrupted run resumes where it stopped.
+
+    Sizes without any ledger history are not compared.
+    """
+
+    # -----------------------------------------------------
+    # ONE CHUNK
+    # -----------------------------------------------------
+    @staticmethod
+    def reconcile_chunk(db: Session, product_ids: List[int], fix: bool = False) -> List[dict]:
+        """
+        Discrepancies for the given products. With ``fix`` the ledger is
+        corrected to match stock (stock is the source of truth) by appending
+        one ``system_adjust`` movement per mismatching size.
+        """
+        stock = {
+            (r.product_id, r.size): r.quantity
+            for r in db.execute(
+                select(ProductSizeStock.product_id, ProductSizeStock.size, ProductSizeStock.quantity)
+                .where(ProductSizeStock.product_id.in_(product_ids))
+            )
+        }
+
+        replayed = {
+            (r.product_id, r.size): {"quantity": r.quantity, "breaks": 0}
+            for r in db.execute(
+                select(InventoryCheckpoint.product_id, InventoryCheckpoint.size, InventoryCheckpoint.quantity)
+                .where(
+                    InventoryCheckpoint.product_id.in_(product_ids),
+                    InventoryCheckpoint.size.is_not(None),
+                )
+            )
+        }
+
+        movements = db.execute(
+            select(
+                Inventory.product_id,
+                Inventory.size,
+                Inventory.previous_quantity,
+                Inventory.change,
+            )
+            .where(Inventory.product_id.in_(product_ids), Inventory.size.is_not(None))
+            .order_by(Inventory.product_id, Inventory.size, Inventory.id)
+            .execution_options(yield_per=1000)
+        )
+        for r in movements:
+            key = (r.product_id, r.size)
+            state = replayed.get(key)
+            if state is None:
+                state = replayed[key] = {"quantity": r.previous_quantity, "breaks": 0}
+            elif r.previous_quantity != state["quantity"]:
+                # The row was written against a quantity the ledger never reached
+                state["breaks"] += 1
+            state["quantity"] += r.change
+
+        discrepancies = []
+        for (product_id, size), state in sorted(replayed.items()):
+            quantity = stock.get((product_id, size))
+            if quantity is None or quantity == state["quantity"]:
+                continue
+
+            discrepancies.append({
+                "product_id": product_id,
+                "size": size,
+                "stock_quantity": quantity,
+                "ledger_quantity": state["quantity"],
+                "difference": quantity - state["quantity"],
+                "chain_breaks": state["breaks"],
+            })
+
+        if fix and discrepancies:
+            now = utcnow()
+            db.execute(insert(Inventory), [
+                {
+                    "product_id": d["product_id"],
+                    "size": d["size"],
+                    "previous_quantity": d["ledger_quantity"],
+                    "change": d["difference"],
+                    "new_quantity": d["stock_quantity"],
+                    "reason": "system_adjust",
+                    "note": "Reconciliation: ledger aligned with stock",
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for d in discrepancies
+            ])
+            db.commit()
+
+        return discrepancies
+
+    # -----------------------------------------------------
+    # FULL RUN (RESUMABLE)
+    # -----------------------------------------------------
+    @staticmethod
+    def _state_path() -> str:
+        return os.path.join(settings.RECONCILIATION_DIR, STATE_NAME)
+
+    @staticmethod
+    def _write_state(state: dict) -> None:
+        os.makedirs(settings.RECONCILIATION_DIR, exist_ok=True)
+        path = ReconciliationService._state_path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(state, fh)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def get_state() -> Optional[dict]:
+        try:
+            with open(ReconciliationService._state_path()) as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def run(
+            db: Session,
+            fix: bool = False,
+            chunk_size: int = settings.RECONCILIATION_CHUNK_SIZE,
+            restart: bool = False,
+    ) -> dict:
+        """
+        Reconcile the whole catalog, resuming an unfinished run unless
+        ``restart``. Discrepancies are appended to an NDJSON report next to
+        the state file; only one chunk is held in memory at a time.
+        """
+        state = ReconciliationService.get_state()
+        if restart or not state or state.get("status") == "completed":
+            started_at = utcnow()
+            state = {
+                "status": "running",
+                "fix": fix,
+                "started_at": started_at.isoformat(),
+                "finished_at": None,
+                "last_product_id": 0,
+                "products_checked": 0,
+                "discrepancies": 0,
+                "corrected": 0,
+                "report": f"report-{started_at:%Y%m%dT%H%M%S}.ndjson",
+                "error": None,
+            }
+        state.update(status="running", pid=os.getpid(), fix=fix, error=None)
+        ReconciliationService._write_state(state)
+
+        report_path = os.path.join(settings.RECONCILIATION_DIR, state["report"])
+        try:
+            while True:
+                product_ids = db.scalars(
+                    select(Product.id)
+                    .where(Product.id > state["last_product_id"])
+                    .order_by(Product.id)
+                    .limit(chunk_size)
+                ).all()
+                if not product_ids:
+                    break
+
+                discrepancies = ReconciliationService.reconcile_chunk(db, product_ids, fix=fix)
+                db.rollback()  # end the read transaction; nothing is kept between chunks
+
+                if discrepancies:
+                    with open(report_path, "a") as fh:
+                        for d in discrepancies:
+                            fh.write(json.dumps({**d, "corrected": fix}) + "\n")
+
+                state["last_product_id"] = product_ids[-1]
+                state["products_checked"] += len(product_ids)
+                state["discrepancies"] += len(discrepancies)
+                state["corrected"] += len(discrepancies) if fix else 0
+                state["updated_at"] = utcnow().isoformat()
+                ReconciliationService._write_state(state)
+        except Exception as exc:
+            state.update(status="failed", error=str(exc))
+            ReconciliationService._write_state(state)
+            raise
+
+        state.update(status="completed", finished_at=utcnow().isoformat())
+        ReconciliationService._write_state(state)
+        return state
+
+    # -----------------------------------------------------
+    # WORKER PROCESS
+    # -----------------------------------------------------
+    @staticmethod
+    def _is_running(state: Optional[dict]) -> bool:
+        if not state or state.get("status") != "running" or not state.get("pid"):
+            return False
+        try:
+            os.kill(state["pid"], 0)
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def start_worker(fix: bool = False, restart: bool = False) -> dict:
+        """
+        Launch scripts/reconcile_inventory.py as a detached process (own
+        connection pool, own memory); progress is read back from the state file.
+        """
+        if ReconciliationService._is_running(ReconciliationService.get_state()):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A reconciliation run is already in progress",
+            )
+
+        command = [sys.executable, os.path.join(BASE_DIR, "scripts", "reconcile_inventory.py")]
+        if fix:
+            command.append("--fix")
+        if restart:
+            command.append("--restart")
+
+        process = subprocess.Popen(
+            command,
+            cwd=BASE_DIR,
+            stdout=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        return {"pid": process.pid, "fix": fix, "restart": restart}
@@ -0,0 +1,166 @@
+# app/services/review_service.py
+
+from __future__ import annotations
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+
+from app.core.events import CATALOG_CHANGED, publish_after_commit
+from app.models.catalog import Product
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.review import ProductReview
+from app.schemas.review import ReviewCreate, ReviewUpdate
+
+
+class ReviewService:
+
+    # -----------------------------------------------------
+    # RATING AGGREGATES (INCREMENTAL)
+    # -----------------------------------------------------
+    @staticmethod
+    def _apply_rating_change(
+            db: Session,
+            product_id: int,
+            removed: Optional[int] = None,
+            added: Optional[int] = None,
+    ) -> None:
+        """
+        Adjust count / sum / histogram / average in one UPDATE so concurrent
+        reviews on the same product never lose an increment.
+        """
+        count_delta = (1 if added else 0) - (1 if removed else 0)
+        sum_delta = (added or 0) - (removed or 0)
+
+        new_count = Product.rating_count + count_delta
+        new_sum = Product.rating_sum + sum_delta
+
+        values = {
+            Product.rating_count: new_count,
+            Product.rating_sum: new_sum,
+            Product.rating: case(
+                (new_count > 0, func.round(new_sum * 1.0 / new_count, 2)),
+                else_=0.0,
+            ),
+        }
+
+        for star in {s for s in (removed, added) if s}:
+            column = getattr(Product, f"rating_{star}_count")
+            values[column] = column + (int(star == added) - int(star == removed))
+
+        db.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        publish_after_commit(db, CATALOG_CHANGED)
+
+    # -----------------------------------------------------
+    # CREATE REVIEW (DELIVERED ORDER ITEMS ONLY)
+    # -----------------------------------------------------
+    @staticmethod
+    def create_review(db: Session, user_id: int, data: ReviewCreate) -> ProductReview:
+        row = (
+            db.query(OrderItem.product_id, Order.status)
+            .join(Order, Order.id == OrderItem.order_id)
+            .filter(OrderItem.id == data.order_item_id, Order.user_id == user_id)
+            .first()
+        )
+        if not row:
+            raise HTTPException(status_code=404, detail="Order item not found")
+
+        if row.status != OrderStatus.DELIVERED:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Only delivered items can be reviewed",
+            )
+
+        existing = (
+            db.query(ProductReview.id)
+            .filter(ProductReview.order_item_id == data.order_item_id)
+            .first()
+        )
+        if existing:
+            raise HTTPException(status_code=400, detail="This item has already been reviewed")
+
+        review = ProductReview(
+            product_id=row.product_id,
+            user_id=user_id,
+            order_item_id=data.order_item_id,
+            rating=data.rating,
+            title=data.title,
+            comment=data.comment,
+        )
+        db.add(review)
+        ReviewService._apply_rating_change(db, row.product_id, added=data.rating)
+
+        db.commit()
+        db.refresh(review)
+        return review
+
+    # -----------------------------------------------------
+    # GET OWN REVIEW
+    # -----------------------------------------------------
+    @staticmethod
+    def _get_user_review(db: Session, user_id: int, review_id: int) -> ProductReview:
+        review = (
+            db.query(ProductReview)
+            .filter(ProductReview.id == review_id, ProductReview.user_id == user_id)
+            .first()
+        )
+        if not review:
+            raise HTTPException(status_code=404, detail="Review not found")
+        return review
+
+    # -----------------------------------------------------
+    # UPDATE REVIEW
+    # -----------------------------------------------------
+    @staticmethod
+    def update_review(
+            db: Session, user_id: int, review_id: int, data: ReviewUpdate
+    ) -> ProductReview:
+        review = ReviewService._get_user_review(db, user_id, review_id)
+        payload = data.model_dump(exclude_unset=True)
+
+        new_rating = payload.pop("rating", None)
+        if new_rating is not None and new_rating != review.rating:
+            ReviewService._apply_rating_change(
+                db, review.product_id, removed=review.rating, added=new_rating
+            )
+            review.rating = new_rating
+
+        for field, value in payload.items():
+            setattr(review, field, value)
+
+        db.commit()
+        db.refresh(review)
+        return review
+
+    # -----------------------------------------------------
+    # DELETE REVIEW
+    # -----------------------------------------------------
+    @staticmethod
+    def delete_review(db: Session, user_id: int, review_id: int) -> None:
+        review = ReviewService._get_user_review(db, user_id, review_id)
+
+        ReviewService._apply_rating_change(db, review.product_id, removed=review.rating)
+        db.delete(review)
+        db.commit()
+
+    # -----------------------------------------------------
+    # LIST PRODUCT REVIEWS (PUBLIC)
+    # -----------------------------------------------------
+    @staticmethod
+    def list_product_reviews(
+            db: Session, product_id: int, skip: int = 0, limit: int = 20
+    ) -> List[ProductReview]:
+        return (
+            db.query(ProductReview)
+            .filter(ProductReview.product_id == product_id, ProductReview.is_active == True)
+            .order_by(ProductReview.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
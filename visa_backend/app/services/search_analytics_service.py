@@ -0,0 +1,288 @@
+# app/services/search_analytics_service.py
+
+from __future__ import annotations
+
+import threading
+import unicodedata
+from datetime import timedelta
+from typing import List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import MemoryCache
+from app.core.config import settings
+from app.core.events import CATALOG_CHANGED, Debouncer, subscribe
+from app.models.search import SearchQuery
+from app.schemas.catalog import ProductRead
+from app.utils.common import utcnow
+
+
+def normalize_query(text: str) -> str:
+    """Case-fold, NFKC-normalize and collapse whitespace so equivalent searches group together."""
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.casefold().split())[:255]
+
+
+# =====================================================================
+#                    BUFFERED SEARCH QUERY WRITER
+# =====================================================================
+
+
+class SearchQueryRecorder:
+    """
+    Collects search events in memory and writes them with one multi-row
+    INSERT per batch, from a background thread, so request handlers never
+    wait on the analytics write.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.SEARCH_LOG_BATCH_SIZE,
+        flush_interval: float = settings.SEARCH_LOG_FLUSH_SECONDS,
+        max_buffer: int = settings.SEARCH_LOG_MAX_BUFFER,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: List[dict] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def record(
+        self,
+        query: str,
+        filters: dict,
+        result_count: int,
+        latency_ms: float,
+    ) -> None:
+        normalized = normalize_query(query)
+        if not normalized:
+            return
+
+        row = {
+            "query": normalized,
+            "category": filters.get("category"),
+            "filters": {k: v for k, v in filters.items() if v is not None},
+            "result_count": result_count,
+            "latency_ms": round(latency_ms, 3),
+            "created_at": utcnow(),
+            "updated_at": utcnow(),
+        }
+
+        with self._lock:
+            # Analytics are best-effort: shed load instead of growing unbounded
+            if len(self._buffer) >= self.max_buffer:
+                self.dropped += 1
+                return
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+
+        if not rows:
+            return 0
+
+        from app.db.session import SessionLocal
+
+        db = SessionLocal()
+        try:
+            for start in range(0, len(rows), self.batch_size):
+                db.execute(insert(SearchQuery), rows[start:start + self.batch_size])
+            db.commit()
+        except Exception:
+            db.rollback()
+            self.dropped += len(rows)
+            return 0
+        finally:
+            db.close()
+
+        return len(rows)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="search-log-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval)
+            self._thread = None
+        self.flush()
+
+
+search_recorder = SearchQueryRecorder()
+
+
+# =====================================================================
+#                      POPULAR-QUERY RESULT CACHE
+# =====================================================================
+
+
+class SearchResultCache:
+    """
+    Holds the first ``SEARCH_CACHE_DEPTH`` results of the most popular store
+    searches. Only pre-warmed queries are cached; any page that fits inside
+    the warmed depth is served as a slice without touching the database.
+    """
+
+    cache = MemoryCache("store_search_results", max_entries=settings.SEARCH_CACHE_TOP_K * 4)
+    _debouncer: Optional[Debouncer] = None
+
+    @staticmethod
+    def _key(query: str, category: Optional[str]) -> tuple:
+        return normalize_query(query), category or None
+
+    @staticmethod
+    def get(
+        query: str,
+        category: Optional[str],
+        skip: int,
+        limit: int,
+    ) -> Optional[List[ProductRead]]:
+        if skip + limit > settings.SEARCH_CACHE_DEPTH:
+            return None
+
+        results = SearchResultCache.cache.get(SearchResultCache._key(query, category))
+        if results is None:
+            return None
+        return results[skip:skip + limit]
+
+    @staticmethod
+    def warm(db: Session) -> int:
+        """(Re)load results for the current top-K queries."""
+        from app.services.catalog_service import ProductService
+
+        popular = SearchAnalyticsService.popular_queries(
+            db,
+            days=settings.SEARCH_CACHE_WINDOW_DAYS,
+            limit=settings.SEARCH_CACHE_TOP_K,
+        )
+
+        fresh = {}
+        for query, category in popular:
+            products = ProductService.list_store_products(
+                db=db,
+                search=query,
+                category=category,
+                skip=0,
+                limit=settings.SEARCH_CACHE_DEPTH,
+            )
+            fresh[SearchResultCache._key(query, category)] = [
+                ProductRead.model_validate(p) for p in products
+            ]
+
+        SearchResultCache.cache.clear()
+        for key, results in fresh.items():
+            SearchResultCache.cache.set(key, results)
+
+        return len(fresh)
+
+    @staticmethod
+    def rewarm() -> None:
+        from app.db.session import SessionLocal
+
+        db = SessionLocal()
+        try:
+            SearchResultCache.warm(db)
+        finally:
+            db.close()
+
+    @staticmethod
+    def register() -> None:
+        """Drop cached results as soon as the catalog changes, then re-warm (debounced)."""
+        if SearchResultCache._debouncer is None:
+            SearchResultCache._debouncer = Debouncer(SearchResultCache.rewarm, 2.0)
+            subscribe(CATALOG_CHANGED, SearchResultCache.cache.clear)
+            subscribe(CATALOG_CHANGED, SearchResultCache._debouncer)
+        SearchResultCache.rewarm()
+
+
+# =====================================================================
+#                       SEARCH ANALYTICS (ADMIN)
+# =====================================================================
+
+
+class SearchAnalyticsService:
+
+    @staticmethod
+    def popular_queries(db: Session, days: int, limit: int) -> List[tuple]:
+        since = utcnow() - timedelta(days=days)
+        rows = db.execute(
+            select(SearchQuery.query, SearchQuery.category)
+            .where(SearchQuery.created_at >= since)
+            .group_by(SearchQuery.query, SearchQuery.category)
+            .order_by(func.count().desc())
+            .limit(limit)
+        ).all()
+        return [(r.query, r.category) for r in rows]
+
+    @staticmethod
+    def _grouped_stats(db: Session, since, limit: int, order_by, *filters) -> List[dict]:
+        rows = db.execute(
+            select(
+                SearchQuery.query,
+                func.count().label("searches"),
+                func.avg(SearchQuery.result_count).label("avg_results"),
+                func.avg(SearchQuery.latency_ms).label("avg_latency_ms"),
+                func.max(SearchQuery.latency_ms).label("max_latency_ms"),
+            )
+            .where(SearchQuery.created_at >= since, *filters)
+            .group_by(SearchQuery.query)
+            .order_by(order_by)
+            .limit(limit)
+        ).all()
+
+        return [
+            {
+                "query": r.query,
+                "searches": r.searches,
+                "avg_results": round(r.avg_results or 0, 2),
+                "avg_latency_ms": round(r.avg_latency_ms or 0, 2),
+                "max_latency_ms": round(r.max_latency_ms or 0, 2),
+            }
+            for r in rows
+        ]
+
+    @staticmethod
+    def get_analytics(db: Session, days: int = 7, limit: int = 20) -> dict:
+        since = utcnow() - timedelta(days=days)
+
+        total = (
+            db.query(func.count(SearchQuery.id))
+            .filter(SearchQuery.created_at >= since)
+            .scalar()
+            or 0
+        )
+
+        return {
+            "days": days,
+            "total_searches": total,
+            "top_queries": SearchAnalyticsService._grouped_stats(
+                db, since, limit, func.count().desc()
+            ),
+            "zero_result_queries": SearchAnalyticsService._grouped_stats(
+                db, since, limit, func.count().desc(), SearchQuery.result_count == 0
+            ),
+            "slowest_queries": SearchAnalyticsService._grouped_stats(
+                db, since, limit, func.avg(SearchQuery.latency_ms).desc()
+            ),
+            "cached_queries": sorted({q for q, _ in SearchResultCache.cache.keys()}),
+        }
@@ -0,0 +1,258 @@
+# app/services/stock_analytics_service.py
+
+from __future__ import annotations
+
+from datetime import timedelta, timezone
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.catalog import Product, ProductSizeStock
+from app.models.inventory import Inventory
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.stock import StockAnalytics
+from app.utils.common import utcnow
+
+# Orders that no longer count as sold
+NOT_SOLD_STATUSES = (OrderStatus.CANCELLED, OrderStatus.RETURNED)
+
+
+class StockAnalyticsService:
+    """
+    Per (product, size) sell-through, turnover and days-of-cover over the
+    trailing window, stored as a snapshot in ``stock_analytics``.
+
+    Products are processed in chunks: stock, sales and ledger totals for a
+    chunk are loaded as columns (one grouped query each), aligned into NumPy
+    arrays and every metric is computed with array arithmetic.
+    """
+
+    # -----------------------------------------------------
+    # LOAD ONE CHUNK (COLUMNAR)
+    # -----------------------------------------------------
+    @staticmethod
+    def _scatter(positions: dict, rows, size: int) -> np.ndarray:
+        """Grouped (product_id, size, value) rows → array aligned with ``positions``."""
+        values = np.zeros(size, dtype=np.float64)
+        index, data = [], []
+        for product_id, size_label, value in rows:
+            position = positions.get((product_id, size_label))
+            if position is not None:
+                index.append(position)
+                data.append(value or 0)
+        if index:
+            values[np.asarray(index, dtype=np.int64)] = np.asarray(data, dtype=np.float64)
+        return values
+
+    @staticmethod
+    def _load_chunk(db: Session, product_ids: List[int], since) -> Optional[dict]:
+        stock = db.execute(
+            select(ProductSizeStock.product_id, ProductSizeStock.size, ProductSizeStock.quantity)
+            .where(ProductSizeStock.product_id.in_(product_ids))
+            .order_by(ProductSizeStock.product_id, ProductSizeStock.id)
+        ).all()
+        if not stock:
+            return None
+
+        positions = {(r.product_id, r.size): i for i, r in enumerate(stock)}
+        count = len(stock)
+
+        sales = db.execute(
+            select(OrderItem.product_id, OrderItem.size, func.sum(OrderItem.quantity))
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(
+                OrderItem.product_id.in_(product_ids),
+                Order.created_at >= since,
+                Order.status.not_in(NOT_SOLD_STATUSES),
+            )
+            .group_by(OrderItem.product_id, OrderItem.size)
+        ).all()
+
+        # Window ledger totals: net change (to back out opening stock) and receipts
+        ledger = db.execute(
+            select(
+                Inventory.product_id,
+                Inventory.size,
+                func.sum(Inventory.change),
+                func.sum(
+                    case(
+                        ((Inventory.change > 0) & (Inventory.reason != "order_cancel"), Inventory.change),
+                        else_=0,
+                    )
+                ),
+            )
+            .where(
+                Inventory.product_id.in_(product_ids),
+                Inventory.size.is_not(None),
+                Inventory.created_at >= since,
+            )
+            .group_by(Inventory.product_id, Inventory.size)
+        ).all()
+
+        return {
+            "keys": [(r.product_id, r.size) for r in stock],
+            "on_hand": np.asarray([r.quantity for r in stock], dtype=np.float64),
+            "sold": StockAnalyticsService._scatter(positions, sales, count),
+            "net_change": StockAnalyticsService._scatter(
+                positions, [(r[0], r[1], r[2]) for r in ledger], count
+            ),
+            "received": StockAnalyticsService._scatter(
+                positions, [(r[0], r[1], r[3]) for r in ledger], count
+            ),
+        }
+
+    # -----------------------------------------------------
+    # METRICS (VECTORIZED)
+    # -----------------------------------------------------
+    @staticmethod
+    def compute_metrics(
+            on_hand: np.ndarray,
+            sold: np.ndarray,
+            received: np.ndarray,
+            net_change: np.ndarray,
+            window_days: int,
+    ) -> dict:
+        """Metric arrays for aligned input columns; undefined ratios are NaN."""
+        opening = np.maximum(on_hand - net_change, 0)
+        available = opening + received
+        average = (opening + on_hand) / 2
+        daily = sold / window_days
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sell_through = np.where(available > 0, sold / available, np.nan)
+            turnover = np.where(average > 0, sold / average, np.nan)
+            cover = np.where(daily > 0, np.maximum(on_hand, 0) / daily, np.nan)
+
+        return {
+            "opening_units": opening,
+            "sell_through_rate": np.round(sell_through, 4),
+            "turnover": np.round(turnover, 4),
+            "daily_sales": np.round(daily, 4),
+            "days_of_cover": np.round(cover, 1),
+        }
+
+    # -----------------------------------------------------
+    # REBUILD SNAPSHOT
+    # -----------------------------------------------------
+    @staticmethod
+    def compute(
+            db: Session,
+            window_days: int = settings.STOCK_ANALYTICS_WINDOW_DAYS,
+            chunk_size: int = settings.STOCK_ANALYTICS_CHUNK_SIZE,
+    ) -> dict:
+        """
+        Replace the snapshot in one transaction. The window should stay within
+        INVENTORY_HOT_DAYS: archived ledger rows are not read.
+        """
+        now = utcnow()
+        since = now - timedelta(days=window_days)
+
+        db.execute(delete(StockAnalytics))
+
+        rows_written = 0
+        last_id = 0
+        while True:
+            product_ids = db.scalars(
+                select(Product.id).where(Product.id > last_id).order_by(Product.id).limit(chunk_size)
+            ).all()
+            if not product_ids:
+                break
+            last_id = product_ids[-1]
+
+            chunk = StockAnalyticsService._load_chunk(db, product_ids, since)
+            if chunk is None:
+                continue
+
+            metrics = StockAnalyticsService.compute_metrics(
+                chunk["on_hand"], chunk["sold"], chunk["received"], chunk["net_change"], window_days
+            )
+
+            columns = {
+                "on_hand": chunk["on_hand"].astype(np.int64).tolist(),
+                "opening_units": metrics["opening_units"].astype(np.int64).tolist(),
+                "units_sold": chunk["sold"].astype(np.int64).tolist(),
+                "units_received": chunk["received"].astype(np.int64).tolist(),
+                "daily_sales": metrics["daily_sales"].tolist(),
+                # NaN (undefined ratio) → NULL
+                **{
+                    name: np.where(np.isnan(metrics[name]), None, metrics[name]).tolist()
+                    for name in ("sell_through_rate", "turnover", "days_of_cover")
+                },
+            }
+
+            db.execute(insert(StockAnalytics), [
+                {
+                    "product_id": product_id,
+                    "size": size,
+                    "window_days": window_days,
+                    **{name: values[i] for name, values in columns.items()},
+                    "computed_at": now,
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i, (product_id, size) in enumerate(chunk["keys"])
+            ])
+            rows_written += len(chunk["keys"])
+
+        db.commit()
+        return {"computed_at": now, "window_days": window_days, "rows": rows_written}
+
+    # -----------------------------------------------------
+    # READ SNAPSHOT
+    # -----------------------------------------------------
+    @staticmethod
+    def get_snapshot(
+            db: Session,
+            product_id: Optional[int] = None,
+            limit: int = 100,
+            offset: int = 0,
+    ) -> dict:
+        """Snapshot rows, soonest to run out first (sizes without sales last)."""
+        query = (
+            select(
+                StockAnalytics.product_id,
+                StockAnalytics.size,
+                StockAnalytics.on_hand,
+                StockAnalytics.opening_units,
+                StockAnalytics.units_sold,
+                StockAnalytics.units_received,
+                StockAnalytics.sell_through_rate,
+                StockAnalytics.turnover,
+                StockAnalytics.daily_sales,
+                StockAnalytics.days_of_cover,
+                Product.name.label("product_name"),
+                Product.sku.label("product_sku"),
+            )
+            .join(Product, Product.id == StockAnalytics.product_id)
+        )
+        if product_id is not None:
+            query = query.where(StockAnalytics.product_id == product_id)
+
+        rows = db.execute(
+            query.order_by(
+                StockAnalytics.days_of_cover.is_(None),
+                StockAnalytics.days_of_cover.asc(),
+                StockAnalytics.id.asc(),
+            )
+            .offset(offset)
+            .limit(limit)
+        ).all()
+
+        freshness = db.execute(
+            select(func.max(StockAnalytics.computed_at), func.max(StockAnalytics.window_days))
+        ).one()
+        computed_at = freshness[0]
+        if computed_at is not None and computed_at.tzinfo is None:
+            # SQLite hands back naive datetimes (stored as UTC)
+            computed_at = computed_at.replace(tzinfo=timezone.utc)
+
+        return {
+            "computed_at": computed_at,
+            "age_seconds": int((utcnow() - computed_at).total_seconds()) if computed_at else None,
+            "window_days": freshness[1],
+            "items": [row._asdict() for row in rows],
+        }
@@ -0,0 +1,479 @@
+# app/services/stock_service.py
+
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, bindparam, case, delete, func, insert, literal, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import CATALOG_CHANGED, STOCK_RESTOCKED, publish_after_commit
+from app.models.catalog import Product, ProductSizeStock
+from app.models.inventory import Inventory
+from app.models.notification import RestockEvent
+from app.models.stock import LowStockEvent, ProductStockSummary, StockReservation
+from app.utils.common import utcnow
+
+
+class StockService:
+    """
+    Single entry point for per-size stock (product_size_stock).
+
+    Every write is a relative UPDATE on one (product_id, size) row, logged to
+    the inventory ledger, followed by ``after_change`` for the products touched.
+    """
+
+    # -----------------------------------------------------
+    # READ
+    # -----------------------------------------------------
+    @staticmethod
+    def get_quantity(db: Session, product_id: int, size: str) -> Optional[int]:
+        """Units in stock, or None when the product has no such size."""
+        return db.execute(
+            select(ProductSizeStock.quantity).where(
+                ProductSizeStock.product_id == product_id,
+                ProductSizeStock.size == size,
+            )
+        ).scalar()
+
+    @staticmethod
+    def get_quantities(db: Session, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], int]:
+        """Stock for many (product_id, size) pairs in one query; missing sizes are absent."""
+        keys = list(set(keys))
+        if not keys:
+            return {}
+
+        rows = db.execute(
+            select(
+                ProductSizeStock.product_id,
+                ProductSizeStock.size,
+                ProductSizeStock.quantity,
+            ).where(tuple_(ProductSizeStock.product_id, ProductSizeStock.size).in_(keys))
+        ).all()
+        return {(r.product_id, r.size): r.quantity for r in rows}
+
+    # -----------------------------------------------------
+    # RESERVATIONS / AVAILABLE-TO-SELL
+    # -----------------------------------------------------
+    @staticmethod
+    def _held_by_others(product_id, size, exclude_cart_id: Optional[int]):
+        """Units held by unexpired reservations of other carts (scalar subquery)."""
+        conditions = [
+            StockReservation.product_id == product_id,
+            StockReservation.size == size,
+            StockReservation.expires_at > utcnow(),
+        ]
+        if exclude_cart_id is not None:
+            conditions.append(StockReservation.cart_id != exclude_cart_id)
+
+        return (
+            select(func.coalesce(func.sum(StockReservation.quantity), 0))
+            .where(*conditions)
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def available_to_sell(
+            db: Session,
+            keys: Iterable[Tuple[int, str]],
+            exclude_cart_id: Optional[int] = None,
+    ) -> Dict[Tuple[int, str], int]:
+        """
+        Stock minus active holds for many (product_id, size) pairs in one
+        query. ``exclude_cart_id`` ignores that cart's own holds.
+        """
+        keys = list(set(keys))
+        if not keys:
+            return {}
+
+        held = StockService._held_by_others(
+            ProductSizeStock.product_id, ProductSizeStock.size, exclude_cart_id
+        )
+        rows = db.execute(
+            select(
+                ProductSizeStock.product_id,
+                ProductSizeStock.size,
+                (ProductSizeStock.quantity - held).label("available"),
+            ).where(tuple_(ProductSizeStock.product_id, ProductSizeStock.size).in_(keys))
+        ).all()
+        return {(r.product_id, r.size): max(r.available, 0) for r in rows}
+
+    @staticmethod
+    def reserve(db: Session, cart_id: int, product_id: int, size: str, quantity: int) -> bool:
+        """
+        Hold ``quantity`` units for a cart (replacing its previous hold on that
+        size) only if that many are available to sell. One conditional
+        INSERT ... SELECT, so two carts cannot both take the last unit.
+        """
+        StockService.release(db, cart_id, product_id, size)
+
+        now = utcnow()
+        available = ProductSizeStock.quantity - StockService._held_by_others(
+            product_id, size, cart_id
+        )
+        source = select(
+            literal(cart_id),
+            literal(product_id),
+            literal(size),
+            literal(quantity),
+            literal(now + timedelta(seconds=settings.STOCK_RESERVATION_TTL_SECONDS), DateTime(timezone=True)),
+            literal(True),
+            literal(now, DateTime(timezone=True)),
+            literal(now, DateTime(timezone=True)),
+        ).where(
+            ProductSizeStock.product_id == product_id,
+            ProductSizeStock.size == size,
+            available >= quantity,
+        )
+        result = db.execute(
+            insert(StockReservation).from_select(
+                [
+                    "cart_id",
+                    "product_id",
+                    "size",
+                    "quantity",
+                    "expires_at",
+                    "is_active",
+                    "created_at",
+                    "updated_at",
+                ],
+                source,
+            )
+        )
+        return bool(result.rowcount)
+
+    @staticmethod
+    def release(
+            db: Session,
+            cart_id: int,
+            product_id: Optional[int] = None,
+            size: Optional[str] = None,
+    ) -> None:
+        """Drop a cart's hold on one size, or every hold of the cart."""
+        conditions = [StockReservation.cart_id == cart_id]
+        if product_id is not None:
+            conditions += [StockReservation.product_id == product_id, StockReservation.size == size]
+        db.execute(delete(StockReservation).where(*conditions))
+
+    @staticmethod
+    def sweep_expired(db: Session, batch_size: int = settings.STOCK_RESERVATION_SWEEP_BATCH) -> int:
+        """Delete expired holds in batches (each batch its own short transaction)."""
+        removed = 0
+        while True:
+            expired_ids = (
+                select(StockReservation.id)
+                .where(StockReservation.expires_at <= utcnow())
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = db.execute(delete(StockReservation).where(StockReservation.id.in_(expired_ids)))
+            db.commit()
+            removed += result.rowcount or 0
+            if (result.rowcount or 0) < batch_size:
+                return removed
+
+    # -----------------------------------------------------
+    # WRITE
+    # -----------------------------------------------------
+    @staticmethod
+    def adjust(
+            db: Session,
+            product_id: int,
+            size: str,
+            change: int,
+            reason: str,
+            performed_by_id: Optional[int] = None,
+            note: Optional[str] = None,
+    ) -> Inventory:
+        """Apply ``change`` to one size and append the ledger row."""
+        row = db.execute(
+            update(ProductSizeStock)
+            .where(
+                ProductSizeStock.product_id == product_id,
+                ProductSizeStock.size == size,
+            )
+            .values(quantity=ProductSizeStock.quantity + change)
+            .returning(ProductSizeStock.quantity, ProductSizeStock.reorder_point)
+            .execution_options(synchronize_session=False)
+        ).first()
+
+        if row is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Size '{size}' not found for product {product_id}",
+            )
+
+        new_qty = row.quantity
+        StockService.record_crossings(db, [(product_id, size, new_qty - change, new_qty, row.reorder_point)])
+
+        movement = Inventory(
+            product_id=product_id,
+            size=size,
+            previous_quantity=new_qty - change,
+            change=change,
+            new_quantity=new_qty,
+            reason=reason,
+            note=note,
+            performed_by_id=performed_by_id,
+        )
+        db.add(movement)
+        return movement
+
+    @staticmethod
+    def decrement_if_available(
+            db: Session,
+            product_id: int,
+            size: str,
+            quantity: int,
+            reason: str,
+            performed_by_id: Optional[int] = None,
+            note: Optional[str] = None,
+            cart_id: Optional[int] = None,
+    ) -> Optional[Inventory]:
+        """
+        Take ``quantity`` units only if that many are in stock and not held
+        by other carts' reservations, as a single conditional UPDATE. Returns
+        None (nothing changed) when the size is missing or short; the caller
+        must then roll back its transaction.
+        """
+        held = StockService._held_by_others(product_id, size, cart_id)
+        row = db.execute(
+            update(ProductSizeStock)
+            .where(
+                ProductSizeStock.product_id == product_id,
+                ProductSizeStock.size == size,
+                ProductSizeStock.quantity - held >= quantity,
+            )
+            .values(quantity=ProductSizeStock.quantity - quantity)
+            .returning(ProductSizeStock.quantity, ProductSizeStock.reorder_point)
+            .execution_options(synchronize_session=False)
+        ).first()
+
+        if row is None:
+            return None
+
+        new_qty = row.quantity
+        StockService.record_crossings(db, [(product_id, size, new_qty + quantity, new_qty, row.reorder_point)])
+
+        movement = Inventory(
+            product_id=product_id,
+            size=size,
+            previous_quantity=new_qty + quantity,
+            change=-quantity,
+            new_quantity=new_qty,
+            reason=reason,
+            note=note,
+            performed_by_id=performed_by_id,
+        )
+        db.add(movement)
+        return movement
+
+    # -----------------------------------------------------
+    # LOW-STOCK DETECTION (WRITE TIME)
+    # -----------------------------------------------------
+    @staticmethod
+    def reorder_level():
+        """SQL expression: the size's reorder point, or the global threshold."""
+        return func.coalesce(ProductSizeStock.reorder_point, settings.LOW_STOCK_THRESHOLD)
+
+    @staticmethod
+    def _stock_level(quantity: int, reorder_point: int) -> int:
+        """0 = healthy, 1 = low, 2 = out of stock."""
+        if quantity <= 0:
+            return 2
+        return 1 if quantity < reorder_point else 0
+
+    @staticmethod
+    def record_crossings(db: Session, changes: Iterable[tuple]) -> int:
+        """
+        Log a LowStockEvent for every (product_id, size, previous, new,
+        reorder_point) change that moved a size to a worse level. Only the
+        values the write already returned are used, nothing is scanned.
+        ``previous`` is None for a size the write created (counted as healthy).
+        """
+        events = []
+        for product_id, size, previous, new, reorder_point in changes:
+            if reorder_point is None:
+                reorder_point = settings.LOW_STOCK_THRESHOLD
+
+            level = StockService._stock_level(new, reorder_point)
+            previous_level = 0 if previous is None else StockService._stock_level(previous, reorder_point)
+            if level > previous_level:
+                events.append({
+                    "product_id": product_id,
+                    "size": size,
+                    "kind": "out" if level == 2 else "low",
+                    "previous_quantity": previous or 0,
+                    "new_quantity": new,
+                    "reorder_point": reorder_point,
+                    "is_active": True,
+                    "created_at": utcnow(),
+                    "updated_at": utcnow(),
+                })
+
+        if events:
+            db.execute(insert(LowStockEvent), events)
+        return len(events)
+
+    @staticmethod
+    def set_reorder_points(db: Session, points: List[dict]) -> int:
+        """Bulk-set reorder points ({product_id, size, reorder_point}); None resets to the default."""
+        if not points:
+            return 0
+
+        table = ProductSizeStock.__table__
+        result = db.execute(
+            update(table)
+            .where(table.c.product_id == bindparam("b_product_id"), table.c.size == bindparam("b_size"))
+            .values(reorder_point=bindparam("b_reorder_point")),
+            [
+                {"b_product_id": p["product_id"], "b_size": p["size"], "b_reorder_point": p["reorder_point"]}
+                for p in points
+            ],
+        )
+        StockService.refresh_summaries(db, [p["product_id"] for p in points])
+        return result.rowcount or 0
+
+    # -----------------------------------------------------
+    # STOCK SUMMARY (MATERIALIZED)
+    # -----------------------------------------------------
+    @staticmethod
+    def refresh_summaries(db: Session, product_ids: Optional[List[int]] = None) -> None:
+        """
+        Recompute product_stock_summary rows from product_size_stock: for the
+        given products, or for the whole catalog when ``product_ids`` is None.
+        """
+        if product_ids is not None:
+            product_ids = sorted(set(product_ids))
+            if not product_ids:
+                return
+
+        threshold = settings.LOW_STOCK_THRESHOLD
+        qty = ProductSizeStock.quantity
+        total = func.coalesce(func.sum(qty), 0)
+        now = utcnow()
+
+        source = (
+            select(
+                Product.id,
+                total,
+                func.count(ProductSizeStock.id),
+                func.min(qty),
+                func.coalesce(
+                    func.sum(case(((qty > 0) & (qty < StockService.reorder_level()), 1), else_=0)), 0
+                ),
+                func.coalesce(func.sum(case((qty <= 0, 1), else_=0)), 0),
+                (total > 0) & (total < threshold),
+                literal(True),
+                literal(now, DateTime(timezone=True)),
+                literal(now, DateTime(timezone=True)),
+            )
+            .select_from(Product)
+            .outerjoin(ProductSizeStock, ProductSizeStock.product_id == Product.id)
+            .group_by(Product.id)
+        )
+
+        stale = delete(ProductStockSummary)
+        if product_ids is not None:
+            source = source.where(Product.id.in_(product_ids))
+            stale = stale.where(ProductStockSummary.product_id.in_(product_ids))
+
+        db.execute(stale)
+        db.execute(
+            insert(ProductStockSummary).from_select(
+                [
+                    "product_id",
+                    "total_units",
+                    "size_count",
+                    "min_size_quantity",
+                    "low_stock_size_count",
+                    "out_of_stock_size_count",
+                    "is_low_stock",
+                    "is_active",
+                    "created_at",
+                    "updated_at",
+                ],
+                source,
+            )
+        )
+
+    @staticmethod
+    def after_change(db: Session, product_ids: List[int]) -> None:
+        """
+        Hook run after stock writes (before commit): refreshes the stock
+        summaries, keeps stock-based smart collections current, records
+        products that came back in stock and invalidates catalog caches on
+        commit.
+        """
+        from app.services.catalog_service import CollectionService
+
+        totals = select(ProductStockSummary.product_id, ProductStockSummary.total_units).where(
+            ProductStockSummary.product_id.in_(product_ids)
+        )
+        before = dict(db.execute(totals).all())
+
+        StockService.refresh_summaries(db, product_ids)
+        CollectionService.sync_products(db, product_ids)
+        publish_after_commit(db, CATALOG_CHANGED)
+
+        # Sold out → in stock: record it with this write for the wishlist fan-out
+        restocked = [
+            product_id
+            for product_id, units in db.execute(totals).all()
+            if units > 0 and product_id in before and before[product_id] <= 0
+        ]
+        if restocked:
+            db.execute(insert(RestockEvent), [
+                {"product_id": product_id, "is_active": True, "created_at": utcnow(), "updated_at": utcnow()}
+                for product_id in restocked
+            ])
+            publish_after_commit(db, STOCK_RESTOCKED)
+
+
+# =====================================================================
+#                     EXPIRED RESERVATION SWEEPER
+# =====================================================================
+
+
+class ReservationSweeper:
+    """Background thread that periodically deletes expired cart holds."""
+
+    def __init__(self, interval: float = settings.STOCK_RESERVATION_SWEEP_SECONDS):
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sweep(self) -> int:
+        from app.db.session import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return StockService.sweep_expired(db)
+        except Exception:
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.sweep()
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="reservation-sweeper", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+reservation_sweeper = ReservationSweeper()
@@ -1,6 +1,10 @@
 # app/utils/common.py
 
+import base64
+import binascii
+import json
 from datetime import datetime, timezone
+from typing import Optional
 from slugify import slugify
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -24,3 +28,32 @@ def generate_unique_slug(session: Session, model, name: str) -> str:
 def utcnow() -> datetime:
     """Return timezone-aware UTC datetime."""
     return datetime.now(timezone.utc)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header value matches ``etag`` (or is ``*``)."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset-pagination cursor (URL-safe base64 JSON)."""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Inverse of ``encode_cursor``; raises ValueError on malformed input."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if not isinstance(values, list):
+        raise ValueError("Malformed cursor")
+    return values
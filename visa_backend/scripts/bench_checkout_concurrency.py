@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for checkout stock deduction.
+
+Fires N parallel checkouts (one shopper per thread, each buying --quantity
+units of the same SKU/size) against a throwaway SQLite database and checks
+that stock is never oversold:
+
+- successful orders == floor(stock / quantity) when demand exceeds stock
+- final stock == initial stock - units sold, and never negative
+
+Reports wall time and checkout throughput. Exit code 1 on any oversell.
+
+Usage:
+    python scripts/bench_checkout_concurrency.py [--shoppers 50] [--stock 10]
+                                                 [--quantity 1] [--db PATH]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+# Ensure project root is in sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Base
+from app.models.cart import Cart, CartItem
+from app.models.catalog import Product, ProductSizeStock
+from app.models.order import Order
+from app.models.user import User
+from app.schemas.order import OrderCreate
+from app.services.order_service import OrderService
+
+ADDRESS = {
+    "name": "Bench Shopper",
+    "street": "1 Load Test Ave",
+    "city": "Toronto",
+    "state": "ON",
+    "zip": "M5V 0A1",
+    "country": "CA",
+}
+
+
+def setup(SessionLocal, shoppers: int, stock: int, quantity: int) -> list:
+    with SessionLocal() as db:
+        product = Product(
+            sku="BENCH-RING",
+            name="Bench Ring",
+            slug="bench-ring",
+            price=1999.0,
+            currency="CAD",
+            category="Rings",
+            sizes={"7": stock},
+        )
+        db.add(product)
+        db.flush()
+
+        user_ids = []
+        for i in range(shoppers):
+            user = User(email=f"shopper{i}@bench.local", hashed_password="x", full_name=f"Shopper {i}")
+            db.add(user)
+            db.flush()
+            cart = Cart(user_id=user.id)
+            db.add(cart)
+            db.flush()
+            db.add(CartItem(cart_id=cart.id, product_id=product.id, size="7", quantity=quantity))
+            user_ids.append(user.id)
+
+        db.commit()
+        return user_ids
+
+
+def run(shoppers: int, stock: int, quantity: int, db_path: str) -> bool:
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        # Writers queue on SQLite's database lock instead of failing fast
+        connect_args={"check_same_thread": False, "timeout": 60},
+        pool_size=shoppers,
+        max_overflow=0,
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+    user_ids = setup(SessionLocal, shoppers, stock, quantity)
+    payload = OrderCreate(shipping_address=ADDRESS, billing_address=ADDRESS)
+
+    outcomes = Counter()
+    lock = threading.Lock()
+    start_gate = threading.Barrier(shoppers)
+
+    def checkout(user_id: int) -> None:
+        start_gate.wait()
+        with SessionLocal() as db:
+            try:
+                OrderService.create_order_from_cart(db, payload, user_id=user_id)
+                result = "ordered"
+            except HTTPException:
+                result = "out_of_stock"
+            except OperationalError:
+                db.rollback()
+                result = "db_error"
+        with lock:
+            outcomes[result] += 1
+
+    threads = [threading.Thread(target=checkout, args=(uid,)) for uid in user_ids]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    with SessionLocal() as db:
+        final_stock = db.execute(select(ProductSizeStock.quantity)).scalar()
+        orders = db.execute(select(func.count(Order.id))).scalar()
+
+    expected_orders = min(shoppers, stock // quantity)
+    sold = orders * quantity
+
+    print(f"🛒 {shoppers} shoppers × {quantity} unit(s), initial stock {stock}")
+    print(f"   ordered={outcomes['ordered']}  out_of_stock={outcomes['out_of_stock']}  db_error={outcomes['db_error']}")
+    print(f"   orders in DB={orders}  units sold={sold}  final stock={final_stock}")
+    print(f"⏱  {elapsed:.3f}s total, {shoppers / elapsed:.1f} checkouts/s")
+
+    ok = (
+        final_stock >= 0
+        and final_stock == stock - sold
+        and orders == outcomes["ordered"]
+        and (outcomes["db_error"] > 0 or orders == expected_orders)
+    )
+    if ok:
+        print("✅ No oversell")
+    else:
+        print(f"❌ Oversell / inconsistency detected (expected {expected_orders} orders)")
+    return ok
+
+
+# ------------------------------------------------
+# ENTRYPOINT
+# ------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel checkout oversell benchmark")
+    parser.add_argument("--shoppers", type=int, default=50)
+    parser.add_argument("--stock", type=int, default=10)
+    parser.add_argument("--quantity", type=int, default=1)
+    parser.add_argument("--db", help="SQLite file to use (default: a temp file)")
+    args = parser.parse_args()
+
+    if args.db:
+        path = args.db
+    else:
+        fd, path = tempfile.mkstemp(suffix=".db", prefix="bench_checkout_")
+        os.close(fd)
+
+    try:
+        success = run(args.shoppers, args.stock, args.quantity, path)
+    finally:
+        if not args.db:
+            os.remove(path)
+
+    sys.exit(0 if success else 1)
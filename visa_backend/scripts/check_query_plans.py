@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for the hot service queries.
+
+Runs each service call against a throwaway in-memory SQLite database (or
+a copy of an existing one, to check an upgraded deployment's indexes),
+captures the SQL it emits and runs EXPLAIN QUERY PLAN on every statement.
+Fails (exit code 1) when a hot table is read with a full scan, when the
+expected index is not used, or when an index-ordered query falls back to
+a temp B-tree sort.
+
+Usage:
+    python scripts/check_query_plans.py [--database path/to/app.db]
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+# Ensure project root is in sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Base
+from app.models.cart import Cart
+from app.models.case import SupportCase, CaseMessage
+from app.models.catalog import Product, Collection, product_collection_table
+from app.models.notification import RestockEvent
+from app.models.order import Order, OrderItem
+from app.models.user import User
+from app.schemas.cart import CartItemCreate
+from app.services.cart_service import CartService
+from app.services.case_service import SupportCaseService
+from app.services.catalog_service import ProductService, CollectionService
+from app.services.dashboard_service import DashboardService
+from app.services.inventory_service import InventoryService
+from app.services.notification_service import BackInStockService
+from app.services.stock_service import StockService
+from app.services.order_service import OrderService
+from app.services.reconciliation_service import ReconciliationService
+from app.utils.common import encode_cursor, utcnow
+
+PLAN_TABLE_RE = re.compile(r"^(SCAN|SEARCH) (\w+)(?: AS \w+)?(.*)$")
+
+
+@dataclass
+class Scenario:
+    name: str
+    run: Callable[[Session, dict], object]
+    table: str
+    expect_index: Optional[str] = None
+    # Ordering must come from the index, not a temp B-tree sort
+    ordered: bool = False
+    plans: List[str] = field(default_factory=list)
+
+
+SCENARIOS = [
+    Scenario(
+        "orders by status, newest id first",
+        lambda db, ids: OrderService.list_orders(db, status="paid"),
+        table="orders",
+        expect_index="ix_orders_status_id",
+        ordered=True,
+    ),
+    Scenario(
+        "pick list over unpicked pending / paid orders",
+        lambda db, ids: OrderService.get_pick_list(db, ["pending", "paid"], date_from=utcnow() - timedelta(days=7)),
+        table="orders",
+        expect_index="ix_orders_status_created_at",
+    ),
+    Scenario(
+        "dashboard recent pending orders",
+        lambda db, ids: DashboardService.get_recent_orders(db).all(),
+        table="orders",
+        expect_index="ix_orders_status_id",
+        ordered=True,
+    ),
+    Scenario(
+        "store products, newest first",
+        lambda db, ids: ProductService.list_store_products(db),
+        table="products",
+        expect_index="ix_products_active_created",
+        ordered=True,
+    ),
+    Scenario(
+        "store products by category, newest first",
+        lambda db, ids: ProductService.list_store_products(db, category="Rings"),
+        table="products",
+        expect_index="ix_products_active_category_created",
+        ordered=True,
+    ),
+    Scenario(
+        "store products by rating",
+        lambda db, ids: ProductService.list_store_products(db, sort="rating"),
+        table="products",
+        expect_index="ix_products_active_rating",
+        ordered=True,
+    ),
+    Scenario(
+        "store collection products page (merchandiser order)",
+        lambda db, ids: CollectionService.list_store_collection_products_page(db, "plan-collection"),
+        table="product_collection_link",
+        expect_index="ix_product_collection_link_collection_position",
+        ordered=True,
+    ),
+    Scenario(
+        "low-stock sizes report (custom threshold)",
+        lambda db, ids: InventoryService.get_low_stock_products(db, threshold=3),
+        table="product_size_stock",
+        expect_index="ix_product_size_stock_quantity",
+    ),
+    Scenario(
+        "low-stock products report (materialized summary)",
+        lambda db, ids: InventoryService.get_low_stock_products(db),
+        table="product_stock_summary",
+        expect_index="ix_product_stock_summary_low_sizes",
+    ),
+    Scenario(
+        "inventory metrics low / out-of-stock counts",
+        lambda db, ids: InventoryService.get_inventory_metrics(db),
+        table="product_stock_summary",
+        expect_index="ix_product_stock_summary_is_low_total",
+    ),
+    Scenario(
+        "inventory movements, latest first (hot tail)",
+        lambda db, ids: InventoryService.list_movements(db),
+        table="inventory",
+        expect_index="ix_inventory_created_at_id",
+        ordered=True,
+    ),
+    Scenario(
+        "inventory ledger by product, keyset latest first",
+        lambda db, ids: InventoryService.query_ledger(
+            db, product_id=ids["product_id"], cursor=encode_cursor(utcnow(), 10**9)
+        ),
+        table="inventory",
+        expect_index="ix_inventory_product_created_id",
+        ordered=True,
+    ),
+    Scenario(
+        "inventory ledger by reason",
+        lambda db, ids: InventoryService.query_ledger(db, reason="restock"),
+        table="inventory",
+        expect_index="ix_inventory_reason_created_id",
+        ordered=True,
+    ),
+    Scenario(
+        "inventory ledger by performer",
+        lambda db, ids: InventoryService.query_ledger(db, performed_by_id=ids["user_id"]),
+        table="inventory",
+        expect_index="ix_inventory_performer_created_id",
+        ordered=True,
+    ),
+    Scenario(
+        "reconciliation ledger replay (product, size, id order)",
+        lambda db, ids: ReconciliationService.reconcile_chunk(db, [ids["product_id"]]),
+        table="inventory",
+        expect_index="ix_inventory_product_size_id",
+        ordered=True,
+    ),
+    Scenario(
+        "back-in-stock subscribers by wishlisted product",
+        lambda db, ids: BackInStockService.fan_out(db, RestockEvent(id=0, product_id=ids["product_id"])),
+        table="wishlist_items",
+        expect_index="ix_wishlist_items_product_id",
+        ordered=True,
+    ),
+    Scenario(
+        "available-to-sell (stock minus active holds)",
+        lambda db, ids: StockService.available_to_sell(db, [(ids["product_id"], "7")]),
+        table="stock_reservations",
+        expect_index="ix_stock_reservations_product_size_expires",
+    ),
+    Scenario(
+        "cart line lookup (cart, product, size)",
+        lambda db, ids: CartService.add_item(
+            db, ids["user_id"], CartItemCreate(product_id=ids["product_id"], size="7", quantity=1)
+        ),
+        table="cart_items",
+        expect_index="ix_cart_items_cart_product_size",
+    ),
+    Scenario(
+        "compact cart (items joined to product columns)",
+        lambda db, ids: CartService.get_compact_cart(db, ids["user_id"]),
+        table="cart_items",
+        expect_index="ix_cart_items_cart_id",
+    ),
+    Scenario(
+        "first staff reply per support case",
+        lambda db, ids: SupportCaseService.get_support_metrics(db),
+        table="case_messages",
+        expect_index="ix_case_messages_case_sender_created",
+    ),
+]
+
+
+def seed(db: Session) -> dict:
+    user = User(email="plan@check.local", hashed_password="x", full_name="Plan Check")
+    staff = User(email="staff@check.local", hashed_password="x", full_name="Staff")
+    product = Product(
+        sku="PLAN-001",
+        name="Plan Ring",
+        slug="plan-ring",
+        price=10,
+        currency="CAD",
+        category="Rings",
+        sizes={"6": 3, "7": 2},
+    )
+    db.add_all([user, staff, product])
+    db.flush()
+
+    collection = Collection(name="Plan Collection", slug="plan-collection")
+    db.add(collection)
+    db.flush()
+    db.execute(
+        product_collection_table.insert().values(
+            product_id=product.id, collection_id=collection.id, position=0
+        )
+    )
+
+    cart = Cart(user_id=user.id)
+    order = Order(user_id=user.id, status="paid", shipping_address={}, billing_address={})
+    case = SupportCase(user_id=user.id, subject="Where is my ring?")
+    db.add_all([cart, order, case])
+    db.flush()
+
+    db.add_all([
+        OrderItem(order_id=order.id, product_id=product.id, size="6", quantity=1, price=10),
+        CaseMessage(case_id=case.id, sender_id=staff.id, message="On its way"),
+    ])
+    db.commit()
+
+    return {"user_id": user.id, "product_id": product.id}
+
+
+def explain(connection, statement: str, parameters) -> List[str]:
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[3] for row in rows]
+
+
+def check(scenario: Scenario, statements: list, connection) -> List[str]:
+    problems = []
+    touched = False
+    index_used = False
+
+    for statement, parameters in statements:
+        plan = explain(connection, statement, parameters)
+        hits = [PLAN_TABLE_RE.match(line) for line in plan]
+        hits = [m for m in hits if m and m.group(2) == scenario.table]
+        if not hits:
+            continue
+
+        touched = True
+        scenario.plans.extend(plan)
+
+        for m in hits:
+            detail = m.group(0)
+            if m.group(1) == "SCAN" and "INDEX" not in detail:
+                problems.append(f"full table scan: {detail}")
+            if scenario.expect_index and scenario.expect_index in detail:
+                index_used = True
+
+        if scenario.ordered and any("TEMP B-TREE" in line for line in plan):
+            problems.append("sort not served by an index (USE TEMP B-TREE)")
+
+    if not touched:
+        problems.append(f"no statement touched '{scenario.table}'")
+    elif scenario.expect_index and not index_used:
+        problems.append(f"expected index '{scenario.expect_index}' was not used")
+
+    return problems
+
+
+def run_checks(database: Optional[str] = None) -> bool:
+    if database:
+        # Scenarios seed and write rows, so they run on a copy
+        copy = os.path.join(tempfile.mkdtemp(prefix="plan-check-"), "app.db")
+        shutil.copyfile(database, copy)
+        engine = create_engine(f"sqlite:///{copy}", connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    # Same as app startup: only creates missing tables
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as db:
+        ids = seed(db)
+
+    all_ok = True
+
+    for scenario in SCENARIOS:
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                statements.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            with Session(engine) as db:
+                scenario.run(db, ids)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        with engine.connect() as connection:
+            problems = check(scenario, statements, connection)
+
+        if problems:
+            all_ok = False
+            print(f"❌ {scenario.name}")
+            for problem in problems:
+                print(f"     - {problem}")
+            for line in scenario.plans:
+                print(f"       plan: {line}")
+        else:
+            print(f"✅ {scenario.name}")
+
+    return all_ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database", help="Existing SQLite database to check (a copy is used)")
+    args = parser.parse_args()
+
+    sys.exit(0 if run_checks(args.database) else 1)
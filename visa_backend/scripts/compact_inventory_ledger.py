@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Archive old inventory ledger rows.
+
+Every movement older than the cutoff is folded into inventory_checkpoints
+(one row per product / size) and moved to inventory_archive, so the hot
+``inventory`` table only holds recent history. Safe to run repeatedly,
+e.g. nightly from cron.
+
+Usage:
+    python scripts/compact_inventory_ledger.py [--days 90] [--batch-size 1000] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+
+from sqlalchemy.orm import Session
+
+# Ensure project root is in sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db import engine
+from app.models.inventory import InventoryArchive, InventoryCheckpoint
+from app.services.inventory_service import InventoryService
+
+
+def compact_inventory_ledger(days: int, batch_size: int, dry_run: bool) -> None:
+    InventoryCheckpoint.__table__.create(bind=engine, checkfirst=True)
+    InventoryArchive.__table__.create(bind=engine, checkfirst=True)
+
+    with Session(engine) as db:
+        result = InventoryService.compact_ledger(
+            db,
+            older_than_days=days,
+            batch_size=batch_size,
+            dry_run=dry_run,
+        )
+
+    verb = "Would archive" if dry_run else "Archived"
+    print(
+        f"✅ {verb} {result['archived']} ledger rows older than {result['cutoff']:%Y-%m-%d} "
+        f"({result['checkpoints']} product/size checkpoints)"
+    )
+
+
+# ------------------------------------------------
+# ENTRYPOINT
+# ------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old inventory ledger rows")
+    parser.add_argument("--days", type=int, default=settings.INVENTORY_HOT_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.INVENTORY_ARCHIVE_BATCH)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    compact_inventory_ledger(args.days, args.batch_size, args.dry_run)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Rebuild the stock_analytics snapshot (sell-through, turnover and
+days-of-cover per product and size over the trailing window).
+
+Run periodically (e.g. nightly from cron); the admin inventory endpoints
+serve the latest snapshot with its computed_at timestamp.
+
+Usage:
+    python scripts/compute_stock_analytics.py [--days 30] [--chunk-size 500]
+"""
+
+import argparse
+import os
+import sys
+
+from sqlalchemy.orm import Session
+
+# Ensure project root is in sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db import engine
+from app.models.stock import StockAnalytics
+from app.services.stock_analytics_service import StockAnalyticsService
+
+
+def compute_stock_analytics(days: int, chunk_size: int) -> None:
+    StockAnalytics.__table__.create(bind=engine, checkfirst=True)
+
+    with Session(engine) as db:
+        result = StockAnalyticsService.compute(db, window_days=days, chunk_size=chunk_size)
+
+    print(f"✅ Stock analytics for {result['rows']} sizes over the last {days} days")
+
+
+# ------------------------------------------------
+# ENTRYPOINT
+# ------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the stock analytics snapshot")
+    parser.add_argument("--days", type=int, default=settings.STOCK_ANALYTICS_WINDOW_DAYS)
+    parser.add_argument("--chunk-size", type=int, default=settings.STOCK_ANALYTICS_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    compute_stock_analytics(args.days, args.chunk_size)
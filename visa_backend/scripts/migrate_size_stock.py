@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Upgrade an existing database to the current models, then move per-size
+stock out of the products.sizes JSON column into product_size_stock.
+
+- create_all only creates missing tables, so every column added to an
+  existing table is listed in ADDED_COLUMNS and added here when missing,
+  then every index the models declare is created on existing tables and
+  the indexes they replaced (OBSOLETE_INDEXES) are dropped
+- collections.product_count is recomputed from the link table (one UPDATE)
+- only products without any product_size_stock rows are migrated, so the
+  script is safe to run multiple times
+- products are read in batches of --batch-size
+
+Usage:
+    python scripts/migrate_size_stock.py [--dry-run] [--batch-size 500]
+"""
+
+import argparse
+import os
+import sys
+
+from sqlalchemy import inspect, insert, select, text
+from sqlalchemy.orm import Session
+
+# Ensure project root is in sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import engine
+from app.models import Base
+from app.models.catalog import Product, ProductSizeStock
+from app.services.catalog_service import CollectionService
+from scripts.rebuild_stock_summary import rebuild_stock_summary
+
+
+# (table, column, DDL) for columns added to tables that already existed
+ADDED_COLUMNS = [
+    # Review rating aggregates
+    ("products", "rating_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("products", "rating_sum", "INTEGER NOT NULL DEFAULT 0"),
+    ("products", "rating_1_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("products", "rating_2_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("products", "rating_3_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("products", "rating_4_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("products", "rating_5_count", "INTEGER NOT NULL DEFAULT 0"),
+    # Collection ordering and cached counts
+    ("product_collection_link", "position", "INTEGER NOT NULL DEFAULT 0"),
+    ("collections", "product_count", "INTEGER NOT NULL DEFAULT 0"),
+    # Smart collection rules (NULL = hand-curated)
+    ("collections", "rules", "JSON"),
+    ("inventory", "size", "VARCHAR(20)"),
+    ("product_size_stock", "reorder_point", "INTEGER"),
+    ("orders", "picked_at", "DATETIME"),
+    ("carts", "version", "INTEGER NOT NULL DEFAULT 1"),
+    # Back-in-stock fan-out retries
+    ("restock_events", "attempts", "INTEGER NOT NULL DEFAULT 0"),
+    ("restock_events", "last_error", "VARCHAR(500)"),
+]
+
+# Run in the same transaction as the ALTER, only when the column was just added
+COLUMN_BACKFILLS = {
+    # Existing links keep their product_id order as explicit positions 0..n-1
+    ("product_collection_link", "position"): """
+        UPDATE product_collection_link SET position = (
+            SELECT COUNT(*) FROM product_collection_link AS other
+            WHERE other.collection_id = product_collection_link.collection_id
+              AND other.product_id < product_collection_link.product_id
+        )
+    """,
+}
+
+# (table, index) superseded by a composite index; dropped so the planner cannot pick them
+OBSOLETE_INDEXES = [
+    ("orders", "ix_orders_status"),  # → ix_orders_status_id
+    ("inventory", "ix_inventory_product_id"),  # → ix_inventory_product_created_id / _product_size_id
+]
+
+
+def ensure_indexes() -> None:
+    """Create declared indexes missing from tables that already existed."""
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue  # created complete by create_all at startup
+
+        existing = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if index.name not in existing:
+                index.create(bind=engine, checkfirst=True)
+                print(f"🛠  Created index {index.name} on {table.name}")
+
+    for table, name in OBSOLETE_INDEXES:
+        if inspector.has_table(table) and name in {i["name"] for i in inspector.get_indexes(table)}:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP INDEX {name}"))
+            print(f"🛠  Dropped index {name} on {table}")
+
+
+def ensure_schema() -> None:
+    ProductSizeStock.__table__.create(bind=engine, checkfirst=True)
+
+    for table, column, ddl in ADDED_COLUMNS:
+        if not inspect(engine).has_table(table):
+            continue  # created complete by create_all at startup
+        columns = {c["name"] for c in inspect(engine).get_columns(table)}
+        if column not in columns:
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+                if (table, column) in COLUMN_BACKFILLS:
+                    conn.execute(text(COLUMN_BACKFILLS[(table, column)]))
+            print(f"🛠  Added {table}.{column} column")
+
+    # After the columns: several indexes cover added columns (e.g. the
+    # collection page index on product_collection_link.position)
+    ensure_indexes()
+
+
+def parse_sizes(raw) -> dict:
+    if not isinstance(raw, dict):
+        return {}
+
+    sizes = {}
+    for size, qty in raw.items():
+        try:
+            sizes[str(size)] = int(qty or 0)
+        except (TypeError, ValueError):
+            print(f"   ⚠️ Ignoring invalid quantity {qty!r} for size {size!r}")
+    return sizes
+
+
+def migrate(dry_run: bool = False, batch_size: int = 500) -> None:
+    ensure_schema()
+
+    migrated_products = 0
+    migrated_rows = 0
+    last_id = 0
+
+    with Session(engine) as db:
+        already = select(ProductSizeStock.product_id).distinct()
+
+        while True:
+            batch = db.execute(
+                select(Product.id, Product.sku, Product.legacy_sizes)
+                .where(Product.id > last_id, Product.id.not_in(already))
+                .order_by(Product.id)
+                .limit(batch_size)
+            ).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            rows = []
+            for product_id, sku, raw in batch:
+                sizes = parse_sizes(raw)
+                if not sizes:
+                    continue
+                migrated_products += 1
+                rows.extend(
+                    {"product_id": product_id, "size": size, "quantity": qty}
+                    for size, qty in sizes.items()
+                )
+
+            if rows and not dry_run:
+                db.execute(insert(ProductSizeStock), rows)
+                db.commit()
+            migrated_rows += len(rows)
+
+    prefix = "🔎 [dry run] Would migrate" if dry_run else "✅ Migrated"
+    print(f"{prefix} {migrated_rows} size rows for {migrated_products} products")
+
+    if not dry_run:
+        rebuild_stock_summary()
+
+        # Upgraded collections start at product_count 0; counts are maintained
+        # incrementally from here on
+        with Session(engine) as db:
+            CollectionService.refresh_product_counts(db)
+            db.commit()
+        print("✅ Refreshed collection product counts")
+
+
+# ------------------------------------------------
+# ENTRYPOINT
+# ------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be migrated")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    migrate(dry_run=args.dry_run, batch_size=args.batch_size)
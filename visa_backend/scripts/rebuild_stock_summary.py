@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Rebuild product_stock_summary for the whole catalog from product_size_stock.
+
+StockService keeps the summaries current on every stock write; run this
+once after creating the table on an existing database, or after editing
+stock rows by hand.
+
+Usage:
+    python scripts/rebuild_stock_summary.py
+"""
+
+import os
+import sys
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+# Ensure project root is in sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import engine
+from app.models.stock import ProductStockSummary
+from app.services.stock_service import StockService
+
+
+def rebuild_stock_summary() -> None:
+    ProductStockSummary.__table__.create(bind=engine, checkfirst=True)
+
+    with Session(engine) as db:
+        StockService.refresh_summaries(db)
+        db.commit()
+
+        total = db.execute(select(func.count(ProductStockSummary.id))).scalar()
+        low = db.execute(
+            select(func.count(ProductStockSummary.id)).where(ProductStockSummary.is_low_stock == True)
+        ).scalar()
+
+    print(f"✅ Rebuilt stock summary for {total} products ({low} low on stock)")
+
+
+# ------------------------------------------------
+# ENTRYPOINT
+# ------------------------------------------------
+if __name__ == "__main__":
+    rebuild_stock_summary()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Reconcile per-size stock against the inventory ledger.
+
+Replays ledger movements (on top of the archive checkpoints) per product
+and size, chunk by chunk, and reports sizes whose stock differs from the
+replayed quantity. With --fix, a system_adjust movement is appended so the
+ledger matches stock. An interrupted run resumes from its last chunk.
+
+Usage:
+    python scripts/reconcile_inventory.py [--fix] [--restart] [--chunk-size 200]
+"""
+
+import argparse
+import os
+import sys
+
+# Ensure project root is in sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.reconciliation_service import ReconciliationService
+
+
+def reconcile_inventory(fix: bool, restart: bool, chunk_size: int) -> None:
+    db = SessionLocal()
+    try:
+        state = ReconciliationService.run(db, fix=fix, restart=restart, chunk_size=chunk_size)
+    finally:
+        db.close()
+
+    report = os.path.join(settings.RECONCILIATION_DIR, state["report"])
+    verb = "corrected" if fix else "found"
+    print(
+        f"✅ Checked {state['products_checked']} products, "
+        f"{state['discrepancies']} discrepancies {verb}"
+    )
+    if state["discrepancies"]:
+        print(f"📄 Report: {report}")
+
+
+# ------------------------------------------------
+# ENTRYPOINT
+# ------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile stock against the inventory ledger")
+    parser.add_argument("--fix", action="store_true", help="append system_adjust rows for mismatches")
+    parser.add_argument("--restart", action="store_true", help="ignore an unfinished run's checkpoint")
+    parser.add_argument("--chunk-size", type=int, default=settings.RECONCILIATION_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    reconcile_inventory(args.fix, args.restart, args.chunk_size)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Write a digest of pending low-stock events to the outbox directory
+(LOW_STOCK_OUTBOX_DIR) and mark them sent.
+
+The API process does this every LOW_STOCK_DIGEST_SECONDS; use this script
+from cron when the background digester is not running.
+
+Usage:
+    python scripts/send_low_stock_digest.py
+"""
+
+import os
+import sys
+
+from sqlalchemy.orm import Session
+
+# Ensure project root is in sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import engine
+from app.models.stock import LowStockEvent
+from app.services.low_stock_service import LowStockAlertService
+
+
+def send_low_stock_digest() -> None:
+    LowStockEvent.__table__.create(bind=engine, checkfirst=True)
+
+    with Session(engine) as db:
+        digest = LowStockAlertService.build_digest(db)
+
+    if digest is None:
+        print("✅ No pending low-stock events")
+        return
+
+    print(
+        f"✅ Digest with {digest['out_of_stock']} out-of-stock and {digest['low_stock']} low sizes "
+        f"({digest['events']} events) → {digest['file']}"
+    )
+
+
+# ------------------------------------------------
+# ENTRYPOINT
+# ------------------------------------------------
+if __name__ == "__main__":
+    send_low_stock_digest()